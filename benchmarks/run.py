@@ -0,0 +1,312 @@
+"""
+Service-layer benchmarks against seeded SQLite databases.
+
+Usage:
+    python -m benchmarks.run [--volumes 10000 100000 1000000] [--repeat 5]
+                             [--output benchmarks/results/latest.json]
+                             [--baseline benchmarks/results/baseline.json] [--save-baseline]
+                             [--fail-on-regression] [--reseed]
+
+Each volume gets its own SQLite file in --db-dir (seeded once, reused afterwards).
+Results are written as JSON and compared against the baseline when one exists.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import sqlalchemy
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from core.get_table_name import Base
+from core.model_registry import ModelRegistry
+from core.workflows import RULE_WORKFLOW
+from list_values import DECISION_ENGINE_LIST, EFFORT_LIST, LINE_OF_BUSINESS_LIST, SUB_ORGANIZATION_LIST, TEAM_LIST
+# Every model is imported so create_all and the model registry see the full schema.
+from models.comment import Comment
+from models.performance_metric import PerformanceMetric
+from models.request import RmsRequest
+from models.request_current_status import RmsRequestCurrentStatus
+from models.request_status import RmsRequestStatus
+from models.requests.person import Person
+from models.requests.rule_config_request import RuleConfigRequest
+from models.requests.rule_request import RuleRequest
+from models.search_document import SearchDocument
+from models.user import User
+from models.user_preference import UserPreference
+from benchmarks.seed import SEED_PREFIX, seed_database, seeded_request_count
+from services.database_service import DatabaseService
+from services.bulk_import_service import BulkImportService
+from services.import_validation_service import ImportValidationService
+from services.workflow_service import WorkflowService
+
+DEFAULT_VOLUMES = [10000, 100000, 1000000]
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+DEFAULT_BASELINE = os.path.join("benchmarks", "results", "baseline.json")
+
+# A case is a regression when its median is this much slower than the baseline median.
+REGRESSION_THRESHOLD = 0.2
+
+# Rows per status update and bulk import run.
+STATUS_UPDATE_SIZE = 100
+BULK_IMPORT_SIZE = 1000
+
+BENCHMARK_USER = SimpleNamespace(user_name="BENCHMARK", roles="Admin")
+
+
+class Case:
+    """One timed operation. `prepare` runs untimed before each run and returns the argument for `run`."""
+
+    def __init__(self, name, run, prepare=None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare or (lambda session, context: None)
+
+
+def _column_index(model, column_name: str) -> int:
+    return [column.name for column in model.__table__.columns].index(column_name)
+
+
+def _fetch_rows(model, **kwargs):
+    def run(session, _):
+        return DatabaseService.fetch_model_rows(
+            model_name=model.__tablename__, session=session, model=model, **kwargs
+        )
+    return run
+
+
+def _cold_counts(session, context):
+    DatabaseService.invalidate_count_cache()
+
+
+def _first_keyset_cursor(session, context):
+    DatabaseService.invalidate_count_cache()
+    _, _, next_cursor, _ = DatabaseService.fetch_model_rows_keyset(
+        model_name=RmsRequest.__tablename__, session=session, model=RmsRequest,
+        sort_column_index=_column_index(RmsRequest, "request_received_timestamp"),
+        sort_order="desc", length=25,
+    )
+    return next_cursor
+
+
+def _keyset_next_page(session, cursor):
+    return DatabaseService.fetch_model_rows_keyset(
+        model_name=RmsRequest.__tablename__, session=session, model=RmsRequest,
+        sort_column_index=_column_index(RmsRequest, "request_received_timestamp"),
+        sort_order="desc", cursor=cursor, length=25,
+    )
+
+
+def _clear_metadata(session, context):
+    DatabaseService.clear_model_metadata_cache()
+
+
+def _gather_metadata(session, _):
+    return DatabaseService.gather_model_metadata(RuleRequest, session, "create-new")
+
+
+def _pending_approval_refs(session, context):
+    return session.execute(
+        select(RmsRequestCurrentStatus.unique_ref)
+        .where(RmsRequestCurrentStatus.status == "PENDING APPROVAL")
+        .where(RmsRequestCurrentStatus.unique_ref >= SEED_PREFIX)
+        .limit(STATUS_UPDATE_SIZE)
+    ).scalars().all()
+
+
+def _update_status(session, ids):
+    return WorkflowService.update_request_status(
+        ids, "PENDING APPROVAL", "PENDING GOVERNANCE", BENCHMARK_USER, session, RULE_WORKFLOW
+    )
+
+
+def _import_file_rows(session, context):
+    context["imports"] = context.get("imports", 0) + 1
+    batch = context["imports"]
+    return [
+        {
+            "request_type": "RULE_DEPLOYMENT",
+            "rule_name": f"import_{batch}_{i}",
+            "rule_id": f"IMP{batch:03d}{i:06d}",
+            "rule_version": "1",
+            "organization": "FRM",
+            "sub_organization": SUB_ORGANIZATION_LIST[i % len(SUB_ORGANIZATION_LIST)],
+            "line_of_business": LINE_OF_BUSINESS_LIST[i % len(LINE_OF_BUSINESS_LIST)],
+            "team": TEAM_LIST[i % len(TEAM_LIST)],
+            "decision_engine": DECISION_ENGINE_LIST[i % len(DECISION_ENGINE_LIST)],
+            "effort": EFFORT_LIST[i % len(EFFORT_LIST)],
+        }
+        for i in range(BULK_IMPORT_SIZE)
+    ]
+
+
+def _validate_import(session, rows):
+    headers = list(rows[0])
+    return ImportValidationService.summarize(ImportValidationService.validate_rows(RuleRequest, rows, headers, True))
+
+
+def _bulk_import(session, rows):
+    return BulkImportService.import_rows(session, RuleRequest, rows, BENCHMARK_USER, True)
+
+
+def build_cases(volume: int):
+    """Read-only cases first, then the cases that write, so reads always see the seeded data."""
+    received_index = _column_index(RmsRequest, "request_received_timestamp")
+    return [
+        Case("fetch_rows_first_page", _fetch_rows(RmsRequest, length=25), _cold_counts),
+        Case("fetch_rows_filtered", _fetch_rows(
+            RuleRequest, filters={"team": "IMPL", "line_of_business": "CREDIT", "status": "PENDING GOVERNANCE"}, length=25,
+        ), _cold_counts),
+        Case("fetch_rows_search", _fetch_rows(RuleRequest, search_value="velocity IMPL", length=25), _cold_counts),
+        Case("fetch_rows_sorted", _fetch_rows(
+            RmsRequest, sort_column_index=received_index, sort_order="desc", length=25,
+        ), _cold_counts),
+        Case("fetch_rows_deep_page", _fetch_rows(
+            RmsRequest, sort_column_index=received_index, sort_order="desc", start=max(0, volume - 100), length=25,
+        ), _cold_counts),
+        Case("fetch_rows_keyset_next_page", _keyset_next_page, _first_keyset_cursor),
+        Case("gather_model_metadata_cold", _gather_metadata, _clear_metadata),
+        Case("gather_model_metadata_cached", _gather_metadata),
+        Case(f"validate_import_{BULK_IMPORT_SIZE}", _validate_import, _import_file_rows),
+        Case(f"update_request_status_{STATUS_UPDATE_SIZE}", _update_status, _pending_approval_refs),
+        Case(f"bulk_import_{BULK_IMPORT_SIZE}", _bulk_import, _import_file_rows),
+    ]
+
+
+def open_database(db_dir: str, volume: int, reseed: bool):
+    """Return (sessionmaker, seed_seconds) for the volume's database, seeding it when needed."""
+    path = os.path.join(db_dir, f"rms_benchmark_{volume}.db")
+    if reseed and os.path.exists(path):
+        os.remove(path)
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as session:
+        existing = seeded_request_count(session)
+        if existing == volume:
+            return Session, None
+
+    if existing:
+        engine.dispose()
+        os.remove(path)
+        return open_database(db_dir, volume, reseed=False)
+
+    print(f"Seeding {volume} requests into {path} ...")
+    start = time.perf_counter()
+    with Session() as session:
+        counts = seed_database(session, volume)
+        session.execute(text("ANALYZE"))
+        session.commit()
+    seed_seconds = time.perf_counter() - start
+    print(f"Seeded in {seed_seconds:.1f}s: {counts}")
+    return Session, seed_seconds
+
+
+def run_case(Session, case: Case, repeat: int, context: dict) -> dict:
+    """Time `repeat` runs of a case, each in a fresh session. A failing case is reported, not raised."""
+    timings = []
+    for _ in range(repeat):
+        with Session() as session:
+            try:
+                argument = case.prepare(session, context)
+                # Some service code prints debugging output; keep it out of the report.
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    case.run(session, argument)
+                    timings.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                session.rollback()
+                return {"runs": len(timings), "error": f"{type(e).__name__}: {str(e).splitlines()[0]}"}
+    return {
+        "runs": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """Print each case's median against the baseline. Returns the regressed (volume, case) pairs."""
+    regressions = []
+    for volume, volume_results in results["volumes"].items():
+        baseline_cases = baseline.get("volumes", {}).get(volume, {}).get("cases", {})
+        for name, stats in volume_results["cases"].items():
+            before = baseline_cases.get(name)
+            if not before or "error" in before or "error" in stats:
+                continue
+            ratio = stats["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((volume, name))
+            print(f"{volume:>8} {name:<32} {before['median_ms']:>10.2f} -> {stats['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RMS service-layer benchmarks")
+    parser.add_argument("--volumes", type=int, nargs="+", default=DEFAULT_VOLUMES, help="Request counts to benchmark.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument("--cases", nargs="+", help="Only run these case names.")
+    parser.add_argument("--db-dir", default=tempfile.gettempdir(), help="Directory for the seeded SQLite files.")
+    parser.add_argument("--reseed", action="store_true", help="Rebuild the databases even if they exist.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Results file to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results as the new baseline.")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions.")
+    args = parser.parse_args()
+
+    ModelRegistry.build()
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "volumes": {},
+    }
+
+    for volume in args.volumes:
+        Session, seed_seconds = open_database(args.db_dir, volume, args.reseed)
+        volume_results = {"seed_seconds": round(seed_seconds, 1) if seed_seconds else None, "cases": {}}
+        context = {}
+        for case in build_cases(volume):
+            if args.cases and case.name not in args.cases:
+                continue
+            stats = run_case(Session, case, args.repeat, context)
+            volume_results["cases"][case.name] = stats
+            if "error" in stats:
+                print(f"{volume:>8} {case.name:<32} failed after {stats['runs']} runs: {stats['error']}")
+                continue
+            print(f"{volume:>8} {case.name:<32} median {stats['median_ms']:>10.2f} ms  (min {stats['min_ms']:.2f}, max {stats['max_ms']:.2f})")
+        results["volumes"][str(volume)] = volume_results
+
+    for path in [args.output] + ([args.baseline] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline} ({baseline.get('created_at')}):")
+        regressions = compare(results, baseline)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
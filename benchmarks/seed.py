@@ -0,0 +1,232 @@
+"""
+Synthetic data for the benchmarks: requests with status history, comments, rule and person
+requests (with relatives) and performance metrics, drawn from the real list_values options.
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from list_values import (
+    DECISION_ENGINE_LIST,
+    EFFORT_LIST,
+    LINE_OF_BUSINESS_LIST,
+    ORGANIZATIONS_LIST,
+    SUB_ORGANIZATION_LIST,
+    TEAM_LIST,
+)
+from models.comment import Comment
+from models.performance_metric import PerformanceMetric
+from models.request import Group, RmsRequest
+from models.request_current_status import RmsRequestCurrentStatus
+from models.request_status import RmsRequestStatus
+from models.requests.person import Person, Relative
+from models.requests.rule_request import RuleRequest
+from services.search_service import SearchService
+
+# Rows per INSERT statement while seeding.
+SEED_BATCH_SIZE = 10000
+
+# Seeded primary keys start with this prefix so a reused database can be recognised.
+SEED_PREFIX = "BENCH-"
+
+# Share of requests that are rule requests; the rest are person requests.
+RULE_REQUEST_SHARE = 0.6
+
+# Requests per group (one bulk import or create-new submission).
+REQUESTS_PER_GROUP = 10
+
+# Status path followed by seeded requests; each request stops somewhere along it.
+STATUS_PATH = ["PENDING APPROVAL", "PENDING GOVERNANCE", "PENDING UAT TABLE DETAIL", "COMPLETED"]
+STATUS_PATH_WEIGHTS = [4, 3, 2, 1]
+
+USER_NAMES = [f"USER{i:02d}" for i in range(40)]
+RULE_WORDS = ["velocity", "geo", "device", "mismatch", "amount", "merchant", "card", "login", "payee", "burst"]
+FIRST_NAMES = ["Ana", "Pablo", "Maria", "John", "Li", "Fatima", "Ivan", "Grace", "Omar", "Sofia"]
+LAST_NAMES = ["Garcia", "Smith", "Chen", "Khan", "Novak", "Okafor", "Rossi", "Silva", "Kim", "Lopez"]
+GENDERS = ["Male", "Female", "Other"]
+RELATION_TYPES = ["Parent", "Sibling", "Child", "Spouse"]
+
+
+def seeded_ref(prefix: str, index: int) -> str:
+    return f"{SEED_PREFIX}{prefix}{index:08d}"
+
+
+def seeded_request_count(session: Session) -> int:
+    """Number of seeded (not benchmark-created) requests in the database."""
+    return session.execute(
+        select(func.count()).where(
+            RmsRequest.unique_ref >= SEED_PREFIX,
+            RmsRequest.unique_ref < SEED_PREFIX[:-1] + chr(ord(SEED_PREFIX[-1]) + 1),
+        )
+    ).scalar_one()
+
+
+def _insert_batched(session: Session, model, rows) -> int:
+    """Insert an iterable of row dicts in SEED_BATCH_SIZE chunks. Returns the number of rows."""
+    batch, inserted = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= SEED_BATCH_SIZE:
+            session.execute(insert(model), batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        session.execute(insert(model), batch)
+        inserted += len(batch)
+    return inserted
+
+
+def seed_database(session: Session, volume: int, seed: int = 0) -> dict:
+    """
+    Seed `volume` requests with their dependent rows.
+
+    Args:
+        session (Session): Session bound to an empty benchmark database.
+        volume (int): Number of RmsRequest rows.
+        seed (int): Random seed, so runs at the same volume see the same data.
+
+    Returns:
+        dict: Number of rows inserted per table.
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    group_count = max(1, volume // REQUESTS_PER_GROUP)
+    rule_count = int(volume * RULE_REQUEST_SHARE)
+
+    # Plan each request once so every table is generated from the same choices.
+    plans = []
+    for i in range(volume):
+        received = now - timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        steps = rng.choices(range(1, len(STATUS_PATH) + 1), weights=STATUS_PATH_WEIGHTS)[0]
+        plans.append((received, steps, rng.choice(USER_NAMES)))
+
+    def groups():
+        for g in range(group_count):
+            yield {"group_id": seeded_ref("G", g)}
+
+    def requests():
+        for i, (received, steps, requester) in enumerate(plans):
+            status = STATUS_PATH[steps - 1]
+            yield {
+                "unique_ref": seeded_ref("R", i),
+                "group_id": seeded_ref("G", i % group_count),
+                "request_type": "RULE_DEPLOYMENT" if i < rule_count else "PERSON_REQUEST",
+                "request_status": status,
+                "requester": requester,
+                "request_received_timestamp": received,
+                "effort": rng.choice(EFFORT_LIST),
+                "approval_timestamp": received + timedelta(days=1) if steps > 1 else None,
+                "approved": "Y" if steps > 1 else "N",
+                "approver": rng.choice(USER_NAMES) if steps > 1 else "",
+                "governed_timestamp": received + timedelta(days=2) if steps > 2 else None,
+                "governed": "Y" if steps > 2 else "N",
+                "governed_by": rng.choice(USER_NAMES) if steps > 2 else "",
+                "deployment_timestamp": received + timedelta(days=3) if steps > 3 else None,
+                "deployed": "Y" if steps > 3 else "N",
+                "organization": rng.choice(ORGANIZATIONS_LIST),
+                "sub_organization": rng.choice(SUB_ORGANIZATION_LIST),
+                "line_of_business": rng.choice(LINE_OF_BUSINESS_LIST),
+                "team": rng.choice(TEAM_LIST),
+                "decision_engine": rng.choice(DECISION_ENGINE_LIST),
+            }
+
+    def status_history():
+        s = 0
+        for i, (received, steps, requester) in enumerate(plans):
+            for step in range(steps):
+                s += 1
+                yield {
+                    "status_id": seeded_ref("S", s),
+                    "unique_ref": seeded_ref("R", i),
+                    "status": STATUS_PATH[step],
+                    "user_name": requester if step == 0 else rng.choice(USER_NAMES),
+                    "timestamp": received + timedelta(days=step),
+                }
+
+    def current_statuses():
+        for i, (received, steps, requester) in enumerate(plans):
+            yield {
+                "unique_ref": seeded_ref("R", i),
+                "status": STATUS_PATH[steps - 1],
+                "user_name": requester,
+                "timestamp": received + timedelta(days=steps - 1),
+            }
+
+    def comments():
+        for c in range(volume // 2):
+            i = rng.randrange(volume)
+            yield {
+                "comment_id": seeded_ref("C", c),
+                "unique_ref": seeded_ref("R", i),
+                "comment": f"{rng.choice(RULE_WORDS)} check {rng.choice(['done', 'pending', 'needs review'])}",
+                "user_name": rng.choice(USER_NAMES),
+                "comment_timestamp": plans[i][0] + timedelta(hours=rng.randrange(1, 72)),
+            }
+
+    def rule_requests():
+        for i in range(rule_count):
+            yield {
+                "request_id": seeded_ref("RR", i),
+                "request_type": rng.choice(RuleRequest.request_type.info["options"]),
+                "rule_name": f"{rng.choice(RULE_WORDS)}_{rng.choice(RULE_WORDS)}_{i}",
+                "rule_id": f"RID{i:07d}",
+                "estimation_id": f"EST{rng.randrange(100000):05d}",
+                "rule_version": rng.randrange(1, 10),
+                "unique_ref": seeded_ref("R", i),
+            }
+
+    def persons():
+        for i in range(rule_count, volume):
+            yield {
+                "request_id": seeded_ref("P", i),
+                "request_type": "PERSON_REQUEST",
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "age": rng.randrange(18, 90),
+                "gender": rng.choice(GENDERS),
+                "unique_ref": seeded_ref("R", i),
+            }
+
+    def relatives():
+        r = 0
+        for i in range(rule_count, volume):
+            for _ in range(rng.randrange(3)):
+                yield {
+                    "unique_ref": seeded_ref("RL", r),
+                    "person_id": seeded_ref("R", i),
+                    "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "relation_type": rng.choice(RELATION_TYPES),
+                    "gender": rng.choice(GENDERS),
+                }
+                r += 1
+
+    def performance_metrics():
+        for g in range(0, group_count, 2):
+            yield {
+                "id": seeded_ref("M", g),
+                "group_id": seeded_ref("G", g),
+                "metrics": json.dumps({
+                    "hit_rate": round(rng.random(), 4),
+                    "false_positive_rate": round(rng.random(), 4),
+                    "alerts": rng.randrange(10000),
+                }),
+            }
+
+    counts = {
+        Group.__tablename__: _insert_batched(session, Group, groups()),
+        RmsRequest.__tablename__: _insert_batched(session, RmsRequest, requests()),
+        RmsRequestStatus.__tablename__: _insert_batched(session, RmsRequestStatus, status_history()),
+        RmsRequestCurrentStatus.__tablename__: _insert_batched(session, RmsRequestCurrentStatus, current_statuses()),
+        Comment.__tablename__: _insert_batched(session, Comment, comments()),
+        RuleRequest.__tablename__: _insert_batched(session, RuleRequest, rule_requests()),
+        Person.__tablename__: _insert_batched(session, Person, persons()),
+        Relative.__tablename__: _insert_batched(session, Relative, relatives()),
+        PerformanceMetric.__tablename__: _insert_batched(session, PerformanceMetric, performance_metrics()),
+    }
+    session.commit()
+
+    for model in (RmsRequest, RuleRequest, Person):
+        SearchService.reindex_model(session, model)
+    return counts
@@ -0,0 +1,8 @@
+from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import AsyncSessionLocal
+
+# Async session dependency for async endpoints; database I/O no longer blocks the event loop.
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -1,5 +1,4 @@
 from datetime import timedelta
-import json
 import os
 from fastapi import Depends, HTTPException
 from sqlalchemy import and_, func
@@ -9,18 +8,32 @@ from core.current_timestamp import get_current_timestamp
 from database import logger
 from sqlalchemy.orm import Session
 
+from core.user_context import UserContext, UserContextCache
 from models.user import User
-from models.user_preference import UserPreference
+from services.preference_service import PreferenceService
 
 
-def get_current_user(session: Session = Depends(get_db_session)) -> User:
-    logger.debug("get_current_user is being called.")
-    
+def get_current_user(session: Session = Depends(get_db_session)) -> UserContext:
+    """
+    Resolve the logged-in user, creating it with default roles and preferences on first use.
+
+    The result is cached per user name for USER_CACHE_TTL seconds (see core.user_context), so the
+    page, preferences and data requests of one page load query the users table at most once;
+    within a request FastAPI already shares it between dependencies. Changes to User rows
+    invalidate the cache.
+
+    Returns:
+        UserContext: Read-only snapshot of the user with parsed role and scope sets.
+    """
     try:
         # Get the current user's name
-        user_name = os.getlogin().upper()
-        logger.debug(f"Retrieved user_name: {user_name}")
+        user_name = current_user_name()
+
+        context = UserContextCache.get(user_name)
+        if context is not None:
+            return context
 
+        logger.debug(f"Loading user {user_name}.")
         # Query to find the most recent non-expired user entry
         user = (
             session.query(User)
@@ -61,13 +74,26 @@ def get_current_user(session: Session = Depends(get_db_session)) -> User:
 
             logger.info(f"New user created: {user_name}")
 
+        context = UserContext.from_user(user)
+        UserContextCache.put(context)
         logger.debug(f"Authenticated user: {user.user_name}, Last Update: {user.last_update_timestamp}")
-        return user
+        return context
     except Exception as e:
         logger.error(f"Error in get_current_user: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error authenticating user.")
 
 
+_current_user_name = None
+
+
+def current_user_name() -> str:
+    """The OS login the app runs under, upper-cased; looked up once per process."""
+    global _current_user_name
+    if _current_user_name is None:
+        _current_user_name = os.getlogin().upper()
+    return _current_user_name
+
+
 DEFAULT_USER_PREFERENCES = {
     "datatable_columns_test_requests": ["request_status", "approval_timestamp", "approved", "approver", "governed_timestamp", "governed_by", "governed", "deployment_request_timestamp", "deployment_timestamp", "deployed", "tool_version", "checked_out_by", "email_from", "email_to", "email_cc", "email_sent", "approval_sent", "expected_deployment_timestamp"],  
     "theme": "dark",  # Saved as a string
@@ -75,30 +101,14 @@ DEFAULT_USER_PREFERENCES = {
 
 def add_default_preferences(user_name: str, session):
     """
-    Adds default preferences for a new user. Converts dictionary values to JSON strings 
-    and lists to comma-separated strings before saving.
+    Adds default preferences for a new user, stored typed like saved preferences
+    (lists and dicts as JSON), with one upsert.
     """
     try:
-        for key, value in DEFAULT_USER_PREFERENCES.items():
-            if isinstance(value, dict):
-                # Convert dictionaries to JSON strings
-                preference_value = json.dumps(value)
-            elif isinstance(value, list):
-                # Convert lists to comma-separated strings
-                preference_value = ",".join(value)
-            else:
-                # Save other types as-is
-                preference_value = value
-
-            preference = UserPreference(
-                user_name=user_name,
-                preference_key=key,
-                preference_value=preference_value
-            )
-            session.add(preference)
-
+        PreferenceService.upsert(session, {user_name: DEFAULT_USER_PREFERENCES})
         session.commit()
+        PreferenceService.invalidate(user_name)
     except Exception as e:
         session.rollback()
         logger.error(f"Error adding default preferences for user {user_name}: {e}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
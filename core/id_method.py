@@ -1,8 +1,112 @@
+import getpass
 import os
-from time import strftime
-import random
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
 
+# Crockford base32: no I, L, O or U, so ids stay unambiguous when read aloud or retyped.
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
 
-def id_method():
-    unique_ref = str(os.getlogin()).upper() + "-" + strftime("%Y%m%d%H%M%S") + str(random.randint(10000, 99999))
-    return unique_ref
\ No newline at end of file
+# Two-character strings for every 10-bit value, so encoding takes five lookups.
+_CROCKFORD_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]
+
+# Random characters after the millisecond timestamp (5 bits each).
+RANDOM_CHARS = 10
+_RANDOM_BITS = RANDOM_CHARS * 5
+_RANDOM_LIMIT = 1 << _RANDOM_BITS
+
+
+def _default_prefix() -> str:
+    try:
+        return os.getlogin().upper()
+    except OSError:  # No controlling terminal (services, containers)
+        return getpass.getuser().upper()
+
+
+# Looked up once instead of on every id.
+ID_PREFIX = _default_prefix()
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+_time_text_cache = (0, "")
+
+
+def _reserve(count: int):
+    """Reserve `count` consecutive random values in the current millisecond. Returns (ms, first value)."""
+    global _last_ms, _last_random
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _last_ms:
+            # New millisecond: random start with the top bit clear, leaving room to count up
+            _last_ms = now
+            _last_random = secrets.randbits(_RANDOM_BITS - 1)
+        elif _last_random + count >= _RANDOM_LIMIT:
+            # Counter exhausted (or the clock went back): borrow the next millisecond
+            _last_ms += 1
+            _last_random = secrets.randbits(_RANDOM_BITS - 1)
+        first = _last_random + 1
+        _last_random += count
+        return _last_ms, first
+
+
+def _time_text(ms: int) -> str:
+    """UTC yyyymmddHHMMSS + milliseconds, the readable (and sortable) head of an id."""
+    global _time_text_cache
+    cached_ms, text = _time_text_cache
+    if cached_ms != ms:
+        seconds, millis = divmod(ms, 1000)
+        text = datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y%m%d%H%M%S") + f"{millis:03d}"
+        _time_text_cache = (ms, text)
+    return text
+
+
+def _encode(value: int) -> str:
+    pairs = _CROCKFORD_PAIRS
+    return (
+        pairs[value >> 40 & 1023] + pairs[value >> 30 & 1023] + pairs[value >> 20 & 1023]
+        + pairs[value >> 10 & 1023] + pairs[value & 1023]
+    )
+
+
+def _format(prefix: Optional[str], ms: int, value: int) -> str:
+    prefix = ID_PREFIX if prefix is None else prefix
+    body = _time_text(ms) + _encode(value)
+    return f"{prefix}-{body}" if prefix else body
+
+
+def id_method(*, prefix: Optional[str] = None) -> str:
+    """
+    Generate a unique, time-ordered id: PREFIX-yyyymmddHHMMSSmmm + 10 Crockford base32 characters.
+
+    Like a ULID, the head is the UTC time in milliseconds and the tail is random, counting up
+    within a millisecond so ids from one process are strictly increasing. Ids sort after the
+    older PREFIX-yyyymmddHHMMSS + 5 digit ids, which remain valid.
+
+    Args:
+        prefix (str, optional): Readable prefix; defaults to the OS login, "" for none.
+
+    Returns:
+        str: The new id.
+    """
+    ms, value = _reserve(1)
+    return _format(prefix, ms, value)
+
+
+def id_batch(count: int, prefix: Optional[str] = None) -> List[str]:
+    """
+    Generate `count` increasing ids at once (one lock acquisition), e.g. for a bulk insert.
+
+    Args:
+        count (int): Number of ids.
+        prefix (str, optional): As for id_method.
+
+    Returns:
+        list: The new ids, in increasing order.
+    """
+    if count <= 0:
+        return []
+    ms, first = _reserve(count)
+    return [_format(prefix, ms, value) for value in range(first, first + count)]
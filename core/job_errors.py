@@ -0,0 +1,6 @@
+class JobCancelled(Exception):
+    """Raised inside a job when a cancellation was requested."""
+
+
+class JobFailed(Exception):
+    """Raised by a job handler that has already recorded its errors on the context."""
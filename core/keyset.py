@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict
+from sqlalchemy import Date, DateTime, String, type_coerce
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Pack a keyset position into an opaque, URL-safe cursor string (dates as ISO text)."""
+    payload = {key: value.isoformat() if isinstance(value, (datetime, date)) else value for key, value in payload.items()}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Unpack a cursor made by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is not one.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid pagination cursor.")
+    return payload
+
+
+def sort_key(column, dialect_name: str):
+    """
+    The column as the database orders it, for keyset comparisons. SQLite stores dates and
+    datetimes as text, and rows filled by current_timestamp lack the microseconds a bound
+    datetime is written with, so equal times would not compare equal; there the stored text
+    itself is the key (type_coerce changes no SQL, only how values are bound and read).
+    """
+    if dialect_name == "sqlite" and isinstance(column.type, (Date, DateTime)):
+        return type_coerce(column, String)
+    return column
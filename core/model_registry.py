@@ -0,0 +1,89 @@
+import threading
+from typing import Dict, List, Optional
+from sqlalchemy.ext.declarative import DeclarativeMeta
+from core.get_table_name import Base
+
+
+class ModelRegistry:
+    """
+    Lookup tables for the mapped models, built once after every model module is imported.
+
+    Replaces scanning Base.registry.mappers on each request with dictionary lookups:
+    tablename -> model, request_type -> model, and the sidebar model list.
+    """
+    _models_by_tablename: Optional[Dict[str, type]] = None
+    _models_by_request_type: Dict[str, type] = {}
+    _sidebar_models: List[dict] = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build():
+        """
+        (Re)build the lookup tables from the declarative registry.
+
+        Raises:
+            ValueError: If two request models claim the same request_type option.
+        """
+        models_by_tablename = {}
+        models_by_request_type = {}
+        sidebar_models = []
+
+        for mapper in Base.registry.mappers:  # Loop through all registered mappers
+            cls = mapper.class_
+            if not isinstance(cls, DeclarativeMeta):  # Ensure it's a valid SQLAlchemy model
+                continue
+
+            models_by_tablename[cls.__tablename__.lower()] = cls
+            sidebar_models.append({
+                "name": cls.__tablename__.replace("_", " ").capitalize(),
+                "url": f"/{cls.__tablename__}",
+                "model_name": cls.__tablename__,
+                "is_request": getattr(cls, "is_request", False),
+                "request_menu_category": getattr(cls, "request_menu_category", ""),
+                "frontend_table_name": getattr(cls, "frontend_table_name", ""),
+            })
+
+            # RmsRequest lists every request type; only the request models own them
+            if cls.__name__ == "RmsRequest":
+                continue
+            request_type_col = getattr(cls, "request_type", None)
+            if request_type_col is None:
+                continue
+            for request_type in getattr(request_type_col, "info", {}).get("options", []):
+                owner = models_by_request_type.get(request_type)
+                if owner is not None and owner is not cls:
+                    raise ValueError(
+                        f"Request type '{request_type}' is declared by both "
+                        f"{owner.__name__} and {cls.__name__}."
+                    )
+                models_by_request_type[request_type] = cls
+
+        with ModelRegistry._lock:
+            ModelRegistry._models_by_request_type = models_by_request_type
+            ModelRegistry._sidebar_models = sidebar_models
+            ModelRegistry._models_by_tablename = models_by_tablename
+
+    @staticmethod
+    def _ensure_built():
+        if ModelRegistry._models_by_tablename is None:
+            ModelRegistry.build()
+
+    @staticmethod
+    def get_model_by_tablename(table_name: str):
+        ModelRegistry._ensure_built()
+        return ModelRegistry._models_by_tablename.get(table_name.lower())
+
+    @staticmethod
+    def get_model_by_request_type(request_type: str):
+        ModelRegistry._ensure_built()
+        return ModelRegistry._models_by_request_type.get(request_type)
+
+    @staticmethod
+    def get_all_models() -> List[dict]:
+        ModelRegistry._ensure_built()
+        return list(ModelRegistry._sidebar_models)
+
+    @staticmethod
+    def get_all_models_as_dict() -> Dict[str, type]:
+        ModelRegistry._ensure_built()
+        return dict(ModelRegistry._models_by_tablename)
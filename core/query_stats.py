@@ -0,0 +1,152 @@
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database import logger
+
+# Statement shapes repeated this many times in one request are reported as N+1 candidates.
+N_PLUS_ONE_THRESHOLD = 5
+
+# Slowest statements kept per request.
+SLOWEST_STATEMENTS = 5
+
+# Finished requests kept for /debug/perf.
+RECENT_REQUESTS = 500
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%\([^)]*\)s|\$\d+|:\w+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so the same query with differently sized IN lists counts as one shape."""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+class RequestQueryStats:
+    """SQL statements issued while serving one HTTP request."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.status_code: Optional[int] = None
+        self.statement_count = 0
+        self.db_time = 0.0
+        self.slowest: List[tuple] = []  # (duration, statement), slowest first
+        self.shapes: Dict[str, list] = {}  # shape -> [count, total duration]
+        self._lock = threading.Lock()  # Sync dependencies record from the threadpool
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.statement_count += 1
+            self.db_time += duration
+            totals = self.shapes.setdefault(shape, [0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+            if len(self.slowest) < SLOWEST_STATEMENTS or duration > self.slowest[-1][0]:
+                self.slowest.append((duration, shape))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[SLOWEST_STATEMENTS:]
+
+    def n_plus_one_candidates(self) -> List[dict]:
+        return [
+            {"statement": shape, "count": count, "total_ms": round(total * 1000, 2)}
+            for shape, (count, total) in sorted(self.shapes.items(), key=lambda item: -item[1][0])
+            if count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.statement_count} queries", '
+            f"app;dur={self.duration * 1000:.1f}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "statement_count": self.statement_count,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "slowest_statements": [
+                {"statement": statement, "duration_ms": round(duration * 1000, 2)}
+                for duration, statement in self.slowest
+            ],
+            "n_plus_one_candidates": self.n_plus_one_candidates(),
+        }
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+_recent_requests = deque(maxlen=RECENT_REQUESTS)
+_recent_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """Collect the SQL issued by each request and report it in a Server-Timing header."""
+    stats = RequestQueryStats(request.method, request.url.path)
+    token = _current_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        stats.duration = time.perf_counter() - start
+        _current_stats.reset(token)
+
+    stats.status_code = response.status_code
+    response.headers["Server-Timing"] = stats.server_timing()
+    with _recent_lock:
+        _recent_requests.append(stats)
+
+    candidates = stats.n_plus_one_candidates()
+    if candidates:
+        logger.warning(
+            f"Possible N+1 queries in {stats.method} {stats.path}: "
+            f"{candidates[0]['count']}x {candidates[0]['statement'][:200]}"
+        )
+    return response
+
+
+def get_recent_requests(sort_by: str = "db_time", limit: int = 20) -> List[dict]:
+    """
+    Return the worst recent requests.
+
+    Args:
+        sort_by (str): "db_time", "statement_count" or "duration".
+        limit (int): Maximum number of requests returned.
+
+    Returns:
+        list: Request summaries, worst first.
+    """
+    if sort_by not in ("db_time", "statement_count", "duration"):
+        raise ValueError(f"Unsupported sort key: {sort_by}")
+    with _recent_lock:
+        recent = list(_recent_requests)
+    recent.sort(key=lambda stats: getattr(stats, sort_by), reverse=True)
+    return [stats.to_dict() for stats in recent[:limit]]
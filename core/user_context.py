@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Seconds a resolved user is reused before the users table is read again.
+USER_CACHE_TTL = 60
+
+# user_name -> (expires_at on the monotonic clock, context)
+_user_cache: Dict[str, Tuple[float, "UserContext"]] = {}
+_user_cache_lock = threading.Lock()
+
+# RmsRequest scope column -> UserContext attribute holding the values the user may act on.
+SCOPE_COLUMNS = {
+    "organization": "organization_set",
+    "sub_organization": "sub_organization_set",
+    "line_of_business": "line_of_business_set",
+    "team": "team_set",
+    "decision_engine": "decision_engine_set",
+}
+
+
+def _split(value: Optional[str]) -> FrozenSet[str]:
+    return frozenset(item.strip() for item in value.split(",") if item.strip()) if value else frozenset()
+
+
+@dataclass(frozen=True)
+class UserContext:
+    """
+    Read-only snapshot of the current user, safe to share between requests and threads.
+
+    Keeps the User column values (comma-separated strings, as the templates and forms use them)
+    and adds the roles and scope lists parsed once into frozensets for membership checks.
+    """
+    user_id: str
+    user_name: str
+    email_from: str
+    email_to: str
+    email_cc: str
+    last_update_timestamp: Optional[datetime]
+    user_role_expire_timestamp: Optional[datetime]
+    roles: str
+    organizations: str
+    sub_organizations: str
+    line_of_businesses: str
+    teams: str
+    decision_engines: str
+    role_set: FrozenSet[str]
+    organization_set: FrozenSet[str]
+    sub_organization_set: FrozenSet[str]
+    line_of_business_set: FrozenSet[str]
+    team_set: FrozenSet[str]
+    decision_engine_set: FrozenSet[str]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserContext":
+        return cls(
+            user_id=user.user_id,
+            user_name=user.user_name,
+            email_from=user.email_from,
+            email_to=user.email_to,
+            email_cc=user.email_cc,
+            last_update_timestamp=user.last_update_timestamp,
+            user_role_expire_timestamp=user.user_role_expire_timestamp,
+            roles=user.roles,
+            organizations=user.organizations,
+            sub_organizations=user.sub_organizations,
+            line_of_businesses=user.line_of_businesses,
+            teams=user.teams,
+            decision_engines=user.decision_engines,
+            role_set=_split(user.roles),
+            organization_set=_split(user.organizations),
+            sub_organization_set=_split(user.sub_organizations),
+            line_of_business_set=_split(user.line_of_businesses),
+            team_set=_split(user.teams),
+            decision_engine_set=_split(user.decision_engines),
+        )
+
+    @property
+    def scope(self) -> Dict[str, FrozenSet[str]]:
+        """
+        The user's scope values per RmsRequest column, e.g. for the "my scope" table filter, plus
+        the user as "requester": their own requests are in scope whatever the other columns hold.
+        """
+        scope = {column: getattr(self, attribute) for column, attribute in SCOPE_COLUMNS.items()}
+        scope["requester"] = frozenset({self.user_name})
+        return scope
+
+
+class UserContextCache:
+    @staticmethod
+    def get(user_name: str) -> Optional[UserContext]:
+        """The cached context of `user_name`, or None if it is missing or expired."""
+        entry = _user_cache.get(user_name)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    @staticmethod
+    def put(context: UserContext) -> None:
+        """
+        Cache a context for USER_CACHE_TTL seconds, or only until its roles expire if that is sooner,
+        so an expired user is looked up (and re-created) again on time.
+        """
+        ttl = USER_CACHE_TTL
+        if context.user_role_expire_timestamp is not None:
+            ttl = min(ttl, (context.user_role_expire_timestamp - datetime.now()).total_seconds())
+        if ttl <= 0:
+            return
+        with _user_cache_lock:
+            _user_cache[context.user_name] = (time.monotonic() + ttl, context)
+
+    @staticmethod
+    def invalidate(user_name: Optional[str] = None) -> None:
+        """Drop one user's cached context, or every cached context."""
+        with _user_cache_lock:
+            if user_name is None:
+                _user_cache.clear()
+            else:
+                _user_cache.pop(user_name.upper(), None)
+
+
+# --- Invalidation when User rows change ---
+# On flush, so the next lookup in this process reads the database again, and once more after
+# the commit, in case a concurrent request cached the old row between the flush and the commit.
+
+def _user_changed(mapper, connection, target: User) -> None:
+    UserContextCache.invalidate(target.user_name)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_names", set()).add(target.user_name)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(User, _event_name, _user_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    if session.info.pop("users_bulk_changed", False):
+        UserContextCache.invalidate()
+    for user_name in session.info.pop("changed_user_names", ()):
+        UserContextCache.invalidate(user_name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_users(orm_execute_state) -> None:
+    # UPDATE / DELETE statements skip the mapper events and do not say which rows they change
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is inspect(User):
+        logger.debug("Bulk change to users; clearing the user context cache.")
+        UserContextCache.invalidate()
+        orm_execute_state.session.info["users_bulk_changed"] = True
@@ -0,0 +1,126 @@
+import threading
+from functools import lru_cache, partial
+from typing import Dict, Iterable, Optional, Tuple
+
+# Role a requester needs on a next status to move their own request there.
+REQUESTER_ROLE = "FS_Analyst"
+
+
+class CompiledWorkflow:
+    """
+    A request_status_config (e.g. core.workflows.RULE_WORKFLOW) compiled into a transition table:
+    statuses become integer ids, role lists become bitmasks over the workflow's roles and
+    Status_Type lists become bit flags. Per-status answers are precomputed, and the role mask
+    of each distinct frozenset of roles is memoized per workflow.
+
+    Roles not named anywhere in the workflow get no bit; they can never grant a transition.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.statuses: Tuple[str, ...] = tuple(config)
+        self.status_ids: Dict[str, int] = {status: index for index, status in enumerate(self.statuses)}
+
+        role_names = sorted({role for spec in config.values() for role in (spec.get("Roles") or [])})
+        self.role_bits: Dict[str, int] = {role: 1 << index for index, role in enumerate(role_names)}
+        type_names = sorted({name for spec in config.values() for name in (spec.get("Status_Type") or [])})
+        self.type_bits: Dict[str, int] = {name: 1 << index for index, name in enumerate(type_names)}
+
+        self.allowed_roles: Tuple[int, ...] = tuple(self.role_mask(spec.get("Roles") or []) for spec in config.values())
+        self.type_flags: Tuple[int, ...] = tuple(
+            self._mask(self.type_bits, spec.get("Status_Type") or []) for spec in config.values()
+        )
+        # Next statuses in configured order; unknown names are kept so errors can list them as configured
+        self.next_names: Tuple[Tuple[str, ...], ...] = tuple(tuple(spec.get("Next") or []) for spec in config.values())
+        self.next_masks: Tuple[int, ...] = tuple(
+            self._mask({status: 1 << index for status, index in self.status_ids.items()}, names) for names in self.next_names
+        )
+        # Union of the roles of every next status: a requester with any of them may act
+        self.next_roles: Tuple[int, ...] = tuple(
+            self._mask_of_statuses(self.allowed_roles, names) for names in self.next_names
+        )
+        requester_bit = self.role_bits.get(REQUESTER_ROLE, 0)
+        self.requester_next: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(name for name in names if name in self.status_ids and self.allowed_roles[self.status_ids[name]] & requester_bit)
+            for names in self.next_names
+        )
+
+        # Per instance (and not holding self), so each workflow has its own memo that goes with it
+        self._frozen_role_mask = lru_cache(maxsize=1024)(partial(self._mask, self.role_bits))
+
+    @staticmethod
+    def _mask(bits: Dict[str, int], names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= bits.get(name, 0)
+        return mask
+
+    def _mask_of_statuses(self, masks: Tuple[int, ...], names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            if name in self.status_ids:
+                mask |= masks[self.status_ids[name]]
+        return mask
+
+    def status_id(self, status: str) -> Optional[int]:
+        return self.status_ids.get(status)
+
+    def role_mask(self, roles: Iterable[str]) -> int:
+        """Bitmask of the given role names; pass a frozenset (e.g. UserContext.role_set) to hit the memo."""
+        if isinstance(roles, frozenset):
+            return self._frozen_role_mask(roles)
+        return self._mask(self.role_bits, roles)
+
+    def has_type(self, status: str, status_type: str) -> bool:
+        status_id = self.status_ids.get(status)
+        return status_id is not None and bool(self.type_flags[status_id] & self.type_bits.get(status_type, 0))
+
+    def is_valid_next(self, status: str, next_status: str) -> bool:
+        status_id, next_id = self.status_ids.get(status), self.status_ids.get(next_status)
+        if status_id is None:
+            return False
+        if next_id is None:
+            return next_status in self.next_names[status_id]  # Named in Next without a config entry of its own
+        return bool(self.next_masks[status_id] >> next_id & 1)
+
+    def can_act(self, status: str, role_mask: int, is_requester: bool = False) -> bool:
+        """Whether a user may move a request out of `status` (requesters also through the roles of a next status)."""
+        status_id = self.status_ids.get(status)
+        if status_id is None:
+            return False
+        if is_requester and self.next_roles[status_id] & role_mask:
+            return True
+        return bool(self.allowed_roles[status_id] & role_mask)
+
+    def requester_can_transition(self, status: str) -> bool:
+        """Whether some next status of `status` lets a requester move their own request there."""
+        status_id = self.status_ids.get(status)
+        return status_id is not None and bool(self.requester_next[status_id])
+
+    def allowed_transitions(self, status: str, is_requester: bool = False) -> Tuple[str, ...]:
+        """
+        Next statuses offered from `status`: requesters only get the statuses open to REQUESTER_ROLE,
+        others every configured next status (can_act decides whether the user may act at all).
+        """
+        status_id = self.status_ids.get(status)
+        if status_id is None:
+            return ()
+        return self.requester_next[status_id] if is_requester else self.next_names[status_id]
+
+
+# id(config) -> (config, compiled); the config is kept so its id cannot be reused while cached
+_compiled_workflows: Dict[int, Tuple[dict, CompiledWorkflow]] = {}
+_compile_lock = threading.Lock()
+
+
+def compile_workflow(config: dict) -> CompiledWorkflow:
+    """The compiled form of a request_status_config, compiled on first use (or at startup by warm-up)."""
+    entry = _compiled_workflows.get(id(config))
+    if entry is not None and entry[0] is config:
+        return entry[1]
+    with _compile_lock:
+        entry = _compiled_workflows.get(id(config))
+        if entry is None or entry[0] is not config:
+            entry = (config, CompiledWorkflow(config))
+            _compiled_workflows[id(config)] = entry
+        return entry[1]
@@ -1,7 +1,8 @@
 from datetime import timedelta
 import logging
 import sys
-from sqlalchemy import create_engine
+from sqlalchemy import DDL, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 import urllib
 from core.id_method import id_method
@@ -29,6 +30,15 @@ engine = create_engine(DATABASE_URL, pool_size=10, max_overflow=20)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database for async endpoints: asyncpg for PostgreSQL, aiosqlite locally.
+if engine.url.get_backend_name() == "postgresql":
+    async_engine = create_async_engine(engine.url.set(drivername="postgresql+asyncpg"), pool_size=10, max_overflow=20)
+else:
+    async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+
+# expire_on_commit=False: attributes are not reloaded lazily (which async sessions cannot do) after commit.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 
 
@@ -38,14 +48,24 @@ from models.user_preference import UserPreference
 from models.comment import Comment
 from models.request import RmsRequest
 from models.request_status import RmsRequestStatus
+from models.request_current_status import RmsRequestCurrentStatus
 from models.requests.person import Person
 from models.requests.rule_config_request import RuleConfigRequest
 from models.requests.rule_request import RuleRequest
 from models.performance_metric import PerformanceMetric
+from models.search_document import SearchDocument
+from models.job import Job
+from models.import_record import ImportRecord
+from core.model_registry import ModelRegistry
 
+# Build the model lookups now that every model is imported (fails fast on duplicate request types)
+ModelRegistry.build()
 
 
 
+# Trigram operator classes used by the autocomplete indexes (PostgreSQL only)
+TRIGRAM_EXTENSION_DDL = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+event.listen(Base.metadata, "before_create", TRIGRAM_EXTENSION_DDL)
 
 Base.metadata.create_all(engine)
 
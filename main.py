@@ -1,5 +1,10 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from core.query_stats import query_stats_middleware
+from core.workflow_engine import compile_workflow
+from database import SessionLocal, logger
 # Import routers
 from routers.bulk_import import router as bulk_import_router
 from routers.bulk_import_template import router as bulk_import_template
@@ -18,8 +23,53 @@ from routers.search_request import router as search_request_router
 from routers.check_estimation_log import router as check_estimation_log_router
 from routers.table_rows import router as table_rows_router
 from routers.performance_metric import router as performance_metric_router
+from routers.model_metadata import router as model_metadata_router
+from routers.debug_perf import router as debug_perf_router
+from routers.jobs import router as jobs_router
+from routers.timeline import router as timeline_router
+from services.autocomplete_service import AutocompleteService
+from services.database_service import DatabaseService
+from services.job_service import JobService
+from services.preference_service import PreferenceService
 
-app = FastAPI()
+
+def warm_up_caches():
+    """Load in-memory lookup structures before the first request needs them."""
+    session = SessionLocal()
+    try:
+        models = DatabaseService.get_all_models_as_dict().values()
+        DatabaseService.warm_model_metadata(models)
+        for model in models:
+            if hasattr(model, "request_status_config"):
+                compile_workflow(model.request_status_config)
+        AutocompleteService.warm_up(session, models)
+    except Exception as e:
+        logger.error(f"Error warming up caches: {e}", exc_info=True)
+    finally:
+        session.close()
+
+
+def fail_interrupted_jobs():
+    """Jobs still queued or running belong to a previous process whose workers are gone."""
+    session = SessionLocal()
+    try:
+        JobService.fail_interrupted_jobs(session)
+    except Exception as e:
+        logger.error(f"Error failing interrupted jobs: {e}", exc_info=True)
+    finally:
+        session.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(warm_up_caches)
+    await run_in_threadpool(fail_interrupted_jobs)
+    yield
+    JobService.shutdown()
+    PreferenceService.flush()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://127.0.0.1:8000"],  # Adjust as needed
@@ -27,9 +77,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(query_stats_middleware)
 
 # Register routers
 app.include_router(performance_metric_router)
+app.include_router(model_metadata_router)
+app.include_router(debug_perf_router)
+app.include_router(jobs_router)
+app.include_router(timeline_router)
 app.include_router(table_rows_router)
 app.include_router(check_estimation_log_router)
 app.include_router(search_request_router)
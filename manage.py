@@ -0,0 +1,145 @@
+"""
+Maintenance commands for the RMS database.
+
+Usage:
+    python manage.py backfill-current-status
+    python manage.py reindex-search [--model MODEL_NAME]
+    python manage.py create-indexes
+    python manage.py add-missing-columns
+    python manage.py dedupe-preferences
+"""
+import argparse
+
+from sqlalchemy import inspect, text
+
+from database import TRIGRAM_EXTENSION_DDL, Base, SessionLocal, engine, logger
+from services.current_status_service import CurrentStatusService
+from services.database_service import DatabaseService
+from services.preference_service import PreferenceService
+from services.search_service import SearchService
+
+
+def backfill_current_status(args):
+    """Rebuild the current status projection from the request status history."""
+    session = SessionLocal()
+    try:
+        projected = CurrentStatusService.backfill(session)
+        print(f"Current status backfilled for {projected} requests.")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error backfilling current status: {e}", exc_info=True)
+        raise
+    finally:
+        session.close()
+
+
+def reindex_search(args):
+    """Rebuild the full-text search documents of one model, or of every indexed model."""
+    session = SessionLocal()
+    try:
+        if args.model:
+            model = DatabaseService.get_model_by_tablename(args.model)
+            if not model:
+                raise SystemExit(f"Model '{args.model}' not found.")
+            models = [model]
+        else:
+            models = list(DatabaseService.get_all_models_as_dict().values())
+
+        for model in models:
+            if SearchService.is_indexed(model):
+                indexed = SearchService.reindex_model(session, model)
+                print(f"Indexed {indexed} rows of {model.__tablename__}.")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error rebuilding the search index: {e}", exc_info=True)
+        raise
+    finally:
+        session.close()
+
+
+def create_indexes(args):
+    """Create indexes declared on the models that are missing from tables created before they were added."""
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(TRIGRAM_EXTENSION_DDL)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+                print(f"Index {index.name} on {table.name} is in place.")
+
+
+def add_missing_columns(args):
+    """Add model columns missing from tables created before they were added (e.g. request_current_status.version)."""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        ddl_compiler = connection.dialect.ddl_compiler(connection.dialect, None)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    print(f"Skipped {table.name}.{column.name}: NOT NULL without a server default.")
+                    continue
+                # Name, type, server default and NULL-ability as CREATE TABLE would write them
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl_compiler.get_column_specification(column)}"))
+                print(f"Added column {column.name} to {table.name}.")
+
+
+def dedupe_preferences(args):
+    """Keep the newest row per user preference, so the unique (user_name, preference_key) index can be created."""
+    session = SessionLocal()
+    try:
+        deleted = PreferenceService.remove_duplicates(session)
+        print(f"Removed {deleted} duplicate user preferences.")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error removing duplicate preferences: {e}", exc_info=True)
+        raise
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RMS maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = subparsers.add_parser(
+        "backfill-current-status",
+        help="Rebuild the current status table from the status history.",
+    )
+    backfill_parser.set_defaults(func=backfill_current_status)
+
+    reindex_parser = subparsers.add_parser(
+        "reindex-search",
+        help="Rebuild the full-text search index.",
+    )
+    reindex_parser.add_argument("--model", help="Table name of a single model to reindex.")
+    reindex_parser.set_defaults(func=reindex_search)
+
+    indexes_parser = subparsers.add_parser(
+        "create-indexes",
+        help="Create model indexes missing from existing tables.",
+    )
+    indexes_parser.set_defaults(func=create_indexes)
+
+    columns_parser = subparsers.add_parser(
+        "add-missing-columns",
+        help="Add model columns missing from existing tables.",
+    )
+    columns_parser.set_defaults(func=add_missing_columns)
+
+    dedupe_parser = subparsers.add_parser(
+        "dedupe-preferences",
+        help="Remove duplicate user preferences before creating their unique index.",
+    )
+    dedupe_parser.set_defaults(func=dedupe_preferences)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
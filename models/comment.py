@@ -1,4 +1,4 @@
-from sqlalchemy import Column,String,ForeignKey, func
+from sqlalchemy import Column,String,ForeignKey, Index, func
 from sqlalchemy import Column,String, ForeignKey, Text, DateTime
 from sqlalchemy.orm import relationship
 from core.id_method import id_method
@@ -16,4 +16,9 @@ class Comment(Base):
     user_name = Column(String(50), nullable=False)
     comment_timestamp = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     request = relationship("RmsRequest", back_populates="comments")
+
+    # Serves the request timeline (newest first per request)
+    __table_args__ = (
+        Index(f"ix_{get_table_name('comments')}_ref_timestamp", "unique_ref", "comment_timestamp"),
+    )
     
\ No newline at end of file
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+from core.id_method import id_method
+from core.get_table_name import Base, get_table_name
+
+IMPORT_STATUS_IN_PROGRESS = "IN_PROGRESS"
+IMPORT_STATUS_COMPLETED = "COMPLETED"
+IMPORT_STATUS_FAILED = "FAILED"
+# A chunked import that failed after committing some batches; a re-upload resumes after them.
+IMPORT_STATUS_PARTIAL = "PARTIAL"
+
+
+class ImportRecord(Base):
+    """
+    One bulk import upload, identified by the SHA-256 of its bytes, and the group it created.
+    Re-uploading the same file into the same model returns the recorded result instead of
+    importing it again. While an import runs in "chunk" mode, group_id, row_count and skipped_rows
+    track the batches committed so far. Rows are maintained by services.import_dedup_service.ImportDedupService.
+    """
+    __tablename__ = get_table_name("import_records")
+    import_id = Column(String, primary_key=True, default=id_method)
+    model_name = Column(String(100), nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default=IMPORT_STATUS_IN_PROGRESS)
+    group_id = Column(String)
+    row_count = Column(Integer)
+    skipped_rows = Column(Integer)
+    user_name = Column(String(50), nullable=False)
+    file_name = Column(String)
+    started_timestamp = Column(DateTime, nullable=False)
+    completed_timestamp = Column(DateTime)
+
+    __table_args__ = (
+        UniqueConstraint("model_name", "content_hash", name=f"uq_{get_table_name('import_records')}_model_hash"),
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text, func
+from core.id_method import id_method
+from core.get_table_name import Base, get_table_name
+
+JOB_STATUS_QUEUED = "QUEUED"
+JOB_STATUS_RUNNING = "RUNNING"
+JOB_STATUS_SUCCEEDED = "SUCCEEDED"
+JOB_STATUS_FAILED = "FAILED"
+JOB_STATUS_CANCELLED = "CANCELLED"
+JOB_ACTIVE_STATUSES = (JOB_STATUS_QUEUED, JOB_STATUS_RUNNING)
+
+
+class Job(Base):
+    """
+    A long-running operation (bulk import, metrics upload) executed by the background workers.
+    Rows are maintained by services.job_service.JobService; clients poll them through /jobs/{job_id}.
+    """
+    __tablename__ = get_table_name("jobs")
+    job_id = Column(String, primary_key=True, default=id_method)
+    job_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default=JOB_STATUS_QUEUED)
+    user_name = Column(String(50), nullable=False)
+    total_rows = Column(Integer)  # Estimated when the job is submitted; None when unknown
+    processed_rows = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(Text)  # JSON list of the first error messages
+    result = Column(Text)  # JSON returned by the job handler
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_timestamp = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
+    started_timestamp = Column(DateTime)
+    finished_timestamp = Column(DateTime)
+
+    __table_args__ = (
+        Index(f"ix_{get_table_name('jobs')}_user_created", "user_name", "created_timestamp"),
+        Index(f"ix_{get_table_name('jobs')}_status", "status"),
+    )
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import Column, ForeignKey, String, func
+from sqlalchemy import Column, ForeignKey, Index, String, func
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.orm import relationship, validates
 from core.id_method import id_method
@@ -59,9 +59,24 @@ class RmsRequest(Base):
         cascade="all, delete-orphan",
         primaryjoin="RmsRequest.unique_ref == RmsRequestStatus.unique_ref",
     )
+    current_status = relationship(
+        "RmsRequestCurrentStatus",
+        back_populates="request",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
     comments = relationship("Comment", back_populates="request", cascade="all, delete-orphan")
     group = relationship("Group", back_populates="requests")
 
+    # Serve the "my scope" table filter (IN lists on every scope column, or the user's own requests)
+    __table_args__ = (
+        Index(
+            f"ix_{get_table_name('requests')}_scope",
+            "organization", "sub_organization", "line_of_business", "team", "decision_engine",
+        ),
+        Index(f"ix_{get_table_name('requests')}_requester", "requester"),
+    )
+
 
     @validates("effort")
     def validate_effort(self, key, value):
@@ -0,0 +1,25 @@
+import os
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy.orm import relationship
+from core.get_table_name import Base, get_table_name
+
+class RmsRequestCurrentStatus(Base):
+    """
+    Latest status of each request, keyed by unique_ref.
+
+    Maintained alongside RmsRequestStatus (which keeps the full history) so the
+    table endpoints can read the current status with a plain primary-key join.
+    `version` goes up on every status change; transitions compare-and-set on
+    (status, version) so concurrent approvers cannot both move the same request.
+    """
+    __tablename__ = get_table_name("request_current_status")
+    unique_ref = Column(
+        String,
+        ForeignKey(f"{get_table_name('requests')}.unique_ref", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status = Column(String, nullable=False, index=True)
+    user_name = Column(String(50), default=os.getlogin().upper())
+    timestamp = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    request = relationship("RmsRequest", back_populates="current_status")
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import Column, String,ForeignKey, func
+from sqlalchemy import Column, String,ForeignKey, Index, func
 from sqlalchemy import Column, String, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from core.id_method import id_method
@@ -17,3 +17,8 @@ class RmsRequestStatus(Base):
     user_name = Column(String(50), default=os.getlogin().upper())
     timestamp = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     request = relationship("RmsRequest", back_populates="status")
+
+    # Serves the request timeline (newest first per request)
+    __table_args__ = (
+        Index(f"ix_{get_table_name('request_status')}_ref_timestamp", "unique_ref", "timestamp"),
+    )
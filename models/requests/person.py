@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String,ForeignKey
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from core.id_method import id_method
 from core.get_table_name import Base, get_table_name
@@ -7,6 +7,11 @@ from core.workflows import RULE_WORKFLOW
 
 class Person(Base):
     __tablename__ = get_table_name("persons")
+    __table_args__ = (
+        # Trigram index for contains-match autocomplete on PostgreSQL
+        Index(f"ix_{get_table_name('persons')}_name_trgm", "name",
+              postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     frontend_table_name = "Person"
     request_id = Column(String, primary_key=True, default=id_method)
     request_type = Column(String, default="PERSON_REQUEST", info={"options": ["PERSON_REQUEST"], "forms": {"create-new": {"enabled": True}, "view-existing": {"enabled": False}}})
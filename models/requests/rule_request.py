@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String,ForeignKey
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from core.id_method import id_method
 from core.get_table_name import Base, get_table_name
@@ -15,6 +15,11 @@ from models.request import RmsRequest
 
 class RuleRequest(Base):
     __tablename__ = get_table_name("rule_request")
+    __table_args__ = (
+        # Trigram index for contains-match autocomplete on PostgreSQL
+        Index(f"ix_{get_table_name('rule_request')}_rule_name_trgm", "rule_name",
+              postgresql_using="gin", postgresql_ops={"rule_name": "gin_trgm_ops"}),
+    )
     frontend_table_name = "Rule Requests"
     request_id = Column(String, primary_key=True, default=id_method)
     request_type = Column(String, info={"options": ["RULE_DEPLOYMENT","RULE_DEACTIVATION"],"required":True,"forms":{"create-new": {"enabled":True},"view-existing":{"enabled":False}}})
@@ -28,6 +33,7 @@ class RuleRequest(Base):
     is_request = True
     request_menu_category = "SASFM"
     request_status_config = RULE_WORKFLOW
+    import_natural_key = ("rule_id", "rule_version")  # Bulk import skips rows already stored under this key
     check_list = {
             "inputs": [
         {"label": "Enter Data", "endpoint": "/check-estimation-log"},
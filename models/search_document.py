@@ -0,0 +1,49 @@
+from sqlalchemy import DDL, Column, DateTime, String, Text, event, func
+from core.get_table_name import Base, get_table_name
+
+class SearchDocument(Base):
+    """
+    Flattened, full-text indexed copy of the searchable columns of one row.
+
+    PostgreSQL indexes `document` with a GIN index on to_tsvector('simple', document).
+    SQLite (local/desktop mode) keeps an FTS5 table in sync through triggers.
+    Rows are maintained by services.search_service.SearchService.
+    """
+    __tablename__ = get_table_name("search_documents")
+    model_name = Column(String(100), primary_key=True)
+    row_id = Column(String, primary_key=True)
+    document = Column(Text, nullable=False, default="")
+    last_updated = Column(DateTime, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+
+SEARCH_TABLE = SearchDocument.__tablename__
+SEARCH_FTS_TABLE = f"{SEARCH_TABLE}_fts"
+
+# PostgreSQL: GIN index over the tsvector expression used by SearchService.
+event.listen(
+    SearchDocument.__table__,
+    "after_create",
+    DDL(
+        f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document_tsv ON {SEARCH_TABLE} "
+        f"USING gin (to_tsvector('simple'::regconfig, document))"
+    ).execute_if(dialect="postgresql"),
+)
+
+# SQLite: external-content FTS5 table plus triggers that mirror every write.
+for statement in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_FTS_TABLE} USING fts5(document, content='{SEARCH_TABLE}', content_rowid='rowid')",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {SEARCH_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_FTS_TABLE}(rowid, document) VALUES (new.rowid, new.document); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {SEARCH_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, document) VALUES ('delete', old.rowid, old.document); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE ON {SEARCH_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, document) VALUES ('delete', old.rowid, old.document); "
+    f"INSERT INTO {SEARCH_FTS_TABLE}(rowid, document) VALUES (new.rowid, new.document); END",
+):
+    event.listen(SearchDocument.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    SearchDocument.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
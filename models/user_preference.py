@@ -1,12 +1,17 @@
 from sqlalchemy import Column, String, func
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Boolean, Column, Index, String, Text, DateTime
 from core.id_method import id_method
 from core.get_table_name import Base, get_table_name
 
 class UserPreference(Base):
     __tablename__ = get_table_name("user_preferences")
+    __table_args__ = (
+        # One row per preference; also the conflict target of the preference upsert
+        Index(f"uq_{get_table_name('user_preferences')}_user_key", "user_name", "preference_key", unique=True),
+    )
     id = Column(String, primary_key=True, default=id_method)
     user_name = Column(String)
     preference_key = Column(String(100))
     preference_value = Column(Text)
+    is_json = Column(Boolean)  # preference_value holds JSON; NULL for rows saved before values were typed
     last_updated = Column(DateTime, server_default=func.current_timestamp(), onupdate=func.current_timestamp)
@@ -1,14 +1,18 @@
-import csv
-import io
 from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.get_db_session import get_db_session
 from core.get_current_user import get_current_user
+from core.user_context import UserContext
 from database import logger
-from models.user import User
 from services.database_service import DatabaseService
-from services.request_service import assign_group_id, create_rms_request, filter_and_clean_data, get_column_mappings, get_model
+from services.bulk_import_service import COMMIT_MODES, BulkImportService
+from services.file_reader_service import FileReaderService
+from services.import_dedup_service import ImportDedupService
+from services.import_validation_service import ImportValidationService
+from services.request_service import get_model
 
 router = APIRouter()
 
@@ -17,92 +21,90 @@ router = APIRouter()
 async def bulk_import(
     file: UploadFile,
     model_name: str = Form(...),
-    user: User = Depends(get_current_user),
+    commit_mode: str = Form("all"),  # "all" (one transaction) or "chunk" (commit per batch)
+    user: UserContext = Depends(get_current_user),
     session: Session = Depends(get_db_session),
 ):
     """
-    Bulk imports data from a CSV file into the specified model.
+    Bulk imports data from a file (CSV, gzip CSV, NDJSON, XLSX or Parquet) into the specified model.
+    The upload is streamed in batches, so memory use does not grow with the file size.
     """
     logger.info(f"Received bulk import request for model: {model_name}. File: {file.filename}")
 
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file uploaded")
 
-    if not file.filename.endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported.")
+    file_format = FileReaderService.detect_format(file.filename)
+
+    if commit_mode not in COMMIT_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid commit_mode '{commit_mode}'. Use one of: {', '.join(COMMIT_MODES)}")
 
     try:
         model = get_model(model_name)  # ✅ Reuses get_model()
 
-        # Read CSV content
-        content = await file.read()
-        csv_reader = csv.DictReader(io.StringIO(content.decode("utf-8")))
-
-        # Get expected headers from model metadata
-        metadata = DatabaseService.gather_model_metadata(model, session=session, form_name="create-new")
-
-        # Prepare expected headers
-        expected_headers = []
-
-        # Include visible fields from the model
-        for column in metadata["form_fields"]:
-            expected_headers.append(column["name"])
-
-        # Add related fields if `is_request` is true
-        if metadata.get("is_request"):
-            expected_headers.extend([
-                "organization",
-                "sub_organization",
-                "line_of_business",
-                "team",
-                "decision_engine",
-                "effort"
-            ])
-
-
-        # Validate CSV headers
-        file_headers = csv_reader.fieldnames
-        if not file_headers or not all(header in file_headers for header in expected_headers):
+        # Re-uploads of an imported file (e.g. a retry after a timeout) return the original result
+        content_hash = await run_in_threadpool(ImportDedupService.hash_file, file.file)
+        previous = ImportDedupService.find_completed(session, model, content_hash)
+        if previous is not None:
+            logger.info(f"{file.filename} was already imported as group {previous.group_id}; skipping")
+            return {"message": "This file was already imported; returning the original result.", **ImportDedupService.to_result(previous)}
+
+        # Check headers and validate every row column by column before inserting anything
+        expected_headers = BulkImportService.expected_headers(model, session)
+        validation = await run_in_threadpool(BulkImportService.validate_file, model, file.file, file_format, expected_headers)
+        if validation["error_count"]:
+            logger.info(f"Bulk import rejected: {validation['error_count']} validation errors")
             raise HTTPException(
-                status_code=400,
-                detail=f"Invalid CSV headers. Expected headers: {', '.join(expected_headers)}, but received: {', '.join(file_headers)}",
+                status_code=422,
+                detail={
+                    "message": f"{validation['error_count']} validation errors; nothing was imported. "
+                               f"POST the file to /bulk-import/validate for the full report.",
+                    **validation,
+                },
+            )
+
+        # Stream the rows from the spooled upload
+        reader = await run_in_threadpool(FileReaderService.open, file.file, file_format)
+
+        # Process rows batch by batch off the event loop
+        result = await run_in_threadpool(
+            BulkImportService.import_upload, session, model, reader, user, commit_mode, content_hash, file.filename
         )
 
-        logger.debug(f"CSV headers found in uploaded file: {file_headers}")
-
-
-        # Process rows
-        objects_to_add = []
-        group_id = assign_group_id({})  # ✅ Generates group_id
-        row_count = 0
-
-        for row in csv_reader:
-            row_count += 1
-            logger.debug(f"Processing row {row_count}: {row}")
-
-            # ✅ Create RmsRequest if the model is a request type
-            if metadata["is_request"]:
-                new_request, new_status = create_rms_request(model, row, group_id, user)
-                objects_to_add.extend([new_request, new_status])
-
-            # ✅ Process model-specific data
-            column_mappings, allowed_keys, required_columns = get_column_mappings(model)
-            logger.debug(f"Column mappings: {column_mappings}, Allowed keys: {allowed_keys}, Required columns: {required_columns}")
-            row_data = filter_and_clean_data(row, allowed_keys, required_columns, column_mappings, model)
-            row_data["unique_ref"] = new_request.unique_ref if metadata["is_request"] else None
-
-            # ✅ Create the main object
-            instance = model(**row_data)
-            objects_to_add.append(instance)
-
-        # ✅ Add all objects in bulk
-        session.add_all(objects_to_add)
-        session.commit()
-
-        logger.info(f"Bulk import completed successfully. Total rows processed: {row_count}")
-        return {"message": "Bulk import completed successfully!", "group_id": group_id}
-
+        logger.info(f"Bulk import completed successfully. Total rows processed: {result['row_count']}")
+        return {
+            "message": "Bulk import completed successfully!",
+            "group_id": result["group_id"],
+            "row_count": result["row_count"],
+            "skipped_rows": result["skipped_rows"],
+            "duplicate": result["duplicate"],
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         session.rollback()
         logger.error(f"Error processing bulk import: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+
+@router.post("/bulk-import/validate")
+async def validate_bulk_import(
+    file: UploadFile,
+    model_name: str = Form(...),
+    user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_db_session),
+):
+    """
+    Validate a bulk import file without importing it.
+    Returns a CSV report with one line per invalid cell (row, column, value, error); only the header line if the file is valid.
+    """
+    file_format = FileReaderService.detect_format(file.filename)
+    model = get_model(model_name)
+    errors = BulkImportService.file_errors(model, file.file, file_format, BulkImportService.expected_headers(model, session))
+    report_name = file.filename[:-len(file_format)] + "_errors.csv"
+    return StreamingResponse(
+        iterate_in_threadpool(ImportValidationService.report_csv(errors)),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{report_name}"'},
+    )
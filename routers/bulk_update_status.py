@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
 from core.get_db_session import get_db_session
 from core.get_current_user import get_current_user
-from models.user import User
+from core.user_context import UserContext
 from services.workflow_service import WorkflowService
 
 router = APIRouter()
@@ -15,9 +15,14 @@ def bulk_update_status(
     selected_rows: List[Dict] = Body(...),  # ✅ Ensure this is a list of dictionaries
     request_type: str = Body(...),
     next_status: str = Body(...),
-    user: User = Depends(get_current_user),
+    user: UserContext = Depends(get_current_user),
     session: Session = Depends(get_db_session),
 ):
+    """
+    Move the selected requests to `next_status`. Rows are grouped by the status the client saw,
+    and every group is applied in one transaction: either all groups are committed or none.
+    Rows changed by someone else since they were loaded are reported as "stale" and left as they are.
+    """
     logger = logging.getLogger("bulk_update_status")
     try:
         logger.info("Bulk status update request received.")
@@ -31,42 +36,71 @@ def bulk_update_status(
         request_status_config = WorkflowService.get_request_status_config(request_type)
         logger.debug(f"Request status configuration: {request_status_config}")
 
-        # Extract unique IDs and current statuses from selected rows
-        ids = [row.get("unique_ref") for row in selected_rows]
-        current_statuses = {row.get("unique_ref"): row.get("status") for row in selected_rows}  # ✅ Use `STATUS` column
+        # Group the selected rows by the status the client saw; each group is a compare-and-set from that status
+        ids_by_status = {}
+        versions = {}
+        for row in selected_rows:
+            unique_ref, current_status = row.get("unique_ref"), row.get("status")
+            if not unique_ref:
+                raise HTTPException(status_code=400, detail="No valid requests provided.")
+            if current_status is None:
+                logger.error(f"Missing STATUS for request {unique_ref}")
+                raise HTTPException(status_code=400, detail=f"Missing STATUS for request {unique_ref}")
+            ids_by_status.setdefault(current_status, []).append(unique_ref)
+            if row.get("status_version") not in (None, ""):
+                try:
+                    versions[unique_ref] = int(row["status_version"])
+                except (TypeError, ValueError):
+                    raise HTTPException(
+                        status_code=400, detail=f"Invalid status_version for request {unique_ref}: {row['status_version']!r}"
+                    )
 
-        logger.debug(f"Extracted IDs: {ids}")
-        logger.debug(f"Extracted Current Statuses: {current_statuses}")
+        logger.debug(f"Requests by current status: {ids_by_status}")
 
-        if not ids:
+        if not ids_by_status:
             raise HTTPException(status_code=400, detail="No valid requests provided.")
 
         # Determine if the user is the requester for all selected requests
         is_requester = all(row.get("requester") == user.user_name for row in selected_rows)
         logger.debug(f"Is requester: {is_requester}")
 
-        # Validate user roles for each request based on `STATUS`
-        for unique_ref, current_status in current_statuses.items():
-            if current_status is None:
-                logger.error(f"Missing STATUS for request {unique_ref}")
-                raise HTTPException(status_code=400, detail=f"Missing STATUS for request {unique_ref}")
-
-            WorkflowService.validate_user_roles(current_status, user.roles.split(","), request_status_config, is_requester)
-
-        # Validate that `next_status` is a valid transition for each request
-        for unique_ref, current_status in current_statuses.items():
+        # Validate user roles and the transition for each current status
+        for current_status in ids_by_status:
+            WorkflowService.validate_user_roles(current_status, user.role_set, request_status_config, is_requester)
             WorkflowService.validate_next_status(current_status, next_status, request_status_config)
 
-        # Perform the update
-        updated_count = WorkflowService.update_request_status(ids, current_status, next_status, user, session, request_status_config)
+        # Perform the update in one transaction; rows changed by someone else since they were loaded come back as "stale"
+        results = {}
+        for current_status, ids in ids_by_status.items():
+            results.update(WorkflowService.update_request_status(
+                ids, current_status, next_status, user, session, request_status_config, versions, commit=False
+            ))
+        session.commit()
+        updated_count = sum(1 for result in results.values() if result == "updated")
+        stale = [unique_ref for unique_ref, result in results.items() if result == "stale"]
+        not_found = [unique_ref for unique_ref, result in results.items() if result == "not_found"]
         logger.info(f"Bulk update completed. {updated_count} rows updated successfully.")
+        if stale:
+            logger.warning(f"Requests changed concurrently, not updated: {stale}")
+        if not_found:
+            logger.warning(f"Requests not found during bulk update: {not_found}")
 
+        message = f"{updated_count} rows updated successfully."
+        if stale:
+            message += f" {len(stale)} rows were changed by someone else and were not updated; refresh and retry."
         return {
             "success": True,
             "updated_count": updated_count,
-            "message": f"{updated_count} rows updated successfully.",
+            "stale": stale,
+            "not_found": not_found,
+            "results": results,
+            "message": message,
         }
 
+    except HTTPException:
+        session.rollback()
+        raise
     except Exception as e:
+        session.rollback()
         logger.error(f"Error during bulk status update: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -7,8 +7,8 @@ import re
 from core import templates
 from core.get_db_session import get_db_session
 from core.get_current_user import get_current_user  # For log parsing
+from core.user_context import UserContext
 from database import logger
-from models.user import User
 
 router = APIRouter()
 
@@ -52,7 +52,7 @@ async def automate_checks(
     request: Request,
     automation_data: str = Form(...),
     session: Session = Depends(get_db_session),
-    user: User = Depends(get_current_user)
+    user: UserContext = Depends(get_current_user)
 ):
     """
     This endpoint automates checklist updates based on the provided automation data.
@@ -1,34 +1,36 @@
 from fastapi import APIRouter, Depends, Form, HTTPException
 from fastapi.responses import HTMLResponse
-from core.get_db_session import get_db_session
+from core.get_async_db_session import get_async_db_session
 from core.templates import templates
 from core.get_current_user import get_current_user
+from core.user_context import UserContext
 from database import logger
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.comment import Comment
 from models.request import RmsRequest
-from models.user import User
 
 router = APIRouter()
 
 
 from fastapi import Request  # Import Request for context
 
-def fetch_and_serialize_comments(
+async def fetch_and_serialize_comments(
         unique_ref: str,
-        session: Session = Depends(get_db_session),  # Injected session dependency
+        session: AsyncSession,
     ):
     """
     Fetch and serialize comments for a given unique_ref.
 
     Args:
-        session (Session): SQLAlchemy session.
+        session (AsyncSession): SQLAlchemy async session.
         unique_ref (str): The unique reference of the RmsRequest.
 
     Returns:
         list: Serialized comments.
     """
-    comments = session.query(Comment).filter(Comment.unique_ref == unique_ref).all()
+    result = await session.execute(select(Comment).where(Comment.unique_ref == unique_ref))
+    comments = result.scalars().all()
     return [
         {
             "comment": comment.comment,
@@ -44,8 +46,8 @@ async def add_comment(
     request: Request,  # Add Request as a parameter
     unique_ref: str,
     comment_text: str = Form(...),
-    user: User = Depends(get_current_user),
-    session: Session = Depends(get_db_session),  # Injected session dependency
+    user: UserContext = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db_session),  # Injected session dependency
 ):
     logger.debug(f"Starting add_comment endpoint for unique_ref: {unique_ref}")
     try:
@@ -53,8 +55,8 @@ async def add_comment(
         logger.info(f"User {user.user_name} is attempting to add a comment to unique_ref: {unique_ref}")
 
         # Check if the request exists
-        rms_request = session.query(RmsRequest).filter(RmsRequest.unique_ref == unique_ref).one_or_none()
-        if not rms_request:
+        result = await session.execute(select(RmsRequest.unique_ref).where(RmsRequest.unique_ref == unique_ref))
+        if result.scalar_one_or_none() is None:
             logger.warning(f"Request with unique_ref {unique_ref} not found")
             raise HTTPException(status_code=404, detail=f"Request with unique_ref {unique_ref} does not exist")
 
@@ -68,7 +70,8 @@ async def add_comment(
             user_name=user.user_name,
         )
         session.add(new_comment)
-        session.commit()
+        await session.commit()
+        await session.refresh(new_comment)  # Load the server-side comment_timestamp for the template
 
         # Log successful creation
         logger.info(f"Comment added successfully by {user.user_name} for unique_ref: {unique_ref}")
@@ -88,7 +91,7 @@ async def add_comment(
         raise http_exc
     except Exception as e:
         logger.error(f"Failed to add comment for unique_ref {unique_ref}: {str(e)}", exc_info=True)
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail="Failed to add comment")
 
 
@@ -96,14 +99,14 @@ async def add_comment(
 @router.get("/requests/{unique_ref}/comments")
 async def get_comments(
     unique_ref: str,
-    session: Session = Depends(get_db_session),  # Injected session dependency
+    session: AsyncSession = Depends(get_async_db_session),  # Injected session dependency
     ):
     """
     Fetch all comments for a specific RmsRequest identified by unique_ref.
     """
     try:
         logger.debug(f"Fetching comments for unique_ref: {unique_ref}")
-        serialized_comments = fetch_and_serialize_comments(unique_ref,session)
+        serialized_comments = await fetch_and_serialize_comments(unique_ref, session)
         logger.debug(f"Fetched and serialized comments: {serialized_comments}")
         return serialized_comments
     except Exception as e:
@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.get_db_session import get_db_session
+from core.get_async_db_session import get_async_db_session
 from core.get_current_user import get_current_user
+from core.user_context import UserContext
 
-from models.user import User
 from database import logger
+from services.database_service import DatabaseService
 from services.request_service import assign_group_id, create_main_object, create_rms_request, extract_form_object, extract_relationships, filter_and_clean_data, get_column_mappings, get_model, handle_relationships, process_form_data
+from services.autocomplete_service import AutocompleteService
+from services.batch_create_service import BatchCreateService
+from services.import_validation_service import ImportValidationService
+from services.search_service import SearchService
 
 router = APIRouter()
 
@@ -15,8 +20,8 @@ router = APIRouter()
 async def create_new(
         model_name: str,
         request: Request,
-        user: User = Depends(get_current_user),
-        session: Session = Depends(get_db_session),
+        user: UserContext = Depends(get_current_user),
+        session: AsyncSession = Depends(get_async_db_session),
     ):
     """
     Creates a new entry for the specified model, including relationship data.
@@ -49,7 +54,10 @@ async def create_new(
 
         # Add all objects at once
         session.add_all(objects_to_add)
-        session.commit()
+        await session.run_sync(SearchService.index_objects, objects_to_add)
+        AutocompleteService.record_objects(session, objects_to_add)
+        await session.commit()
+        DatabaseService.invalidate_counts_after_create()
 
         logger.info(f"[create_new] Successfully created '{model_name}' entry and relationships.")
         return {"message": f"Entry created successfully for model '{model_name}'."}
@@ -59,3 +67,48 @@ async def create_new(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/create-new/{model_name}/batch")
+async def create_new_batch(
+        model_name: str,
+        request: Request,
+        user: UserContext = Depends(get_current_user),
+        session: AsyncSession = Depends(get_async_db_session),
+    ):
+    """
+    Creates many entries for the specified model in one call and one transaction, sharing one group.
+
+    The body is a JSON list of records (or {"records": [...]}) keyed by column or form field name,
+    each with optional nested "relationships": {name: [related records]}. Every record is validated
+    first; if any is invalid nothing is created and a 422 lists all errors by record index.
+    Returns the group_id and, per record in input order, its id, unique_ref and related ids.
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    records = body.get("records") if isinstance(body, dict) else body
+
+    model = get_model(model_name)
+    records = BatchCreateService.parse_records(model, records)
+    errors = BatchCreateService.validate_records(model, records)
+    if errors:
+        logger.warning(f"[create_new_batch] {len(errors)} validation errors for '{model_name}'")
+        summary = ImportValidationService.summarize(errors)
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "Validation failed; no records were created.", "error_count": summary["error_count"], "errors": summary["errors"]},
+        )
+
+    try:
+        result = await session.run_sync(BatchCreateService.create_records, model, records, user)
+        await session.commit()
+    except HTTPException:
+        await session.rollback()
+        raise
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"[create_new_batch] Error creating entries for model '{model_name}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    logger.info(f"[create_new_batch] Created {len(records)} '{model_name}' entries in group {result['group_id']}.")
+    return {"message": f"{len(records)} entries created successfully for model '{model_name}'.", **result}
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from core.get_current_user import get_current_user
+from core.user_context import UserContext
+from core.query_stats import get_recent_requests
+
+router = APIRouter()
+
+
+@router.get("/debug/perf", response_model=dict)
+async def get_debug_perf(
+    sort_by: str = Query("db_time", pattern="^(db_time|statement_count|duration)$"),
+    limit: int = Query(20, ge=1, le=500),
+    user: UserContext = Depends(get_current_user),
+):
+    """
+    List the worst recent requests with their SQL statement counts, DB time,
+    slowest statements and N+1 candidates. Admin only.
+    """
+    if "Admin" not in user.role_set:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Admin role required to view performance data. Your roles: {user.roles}",
+        )
+    return {"sort_by": sort_by, "requests": get_recent_requests(sort_by, limit)}
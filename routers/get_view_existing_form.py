@@ -1,23 +1,23 @@
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from sqlalchemy import inspect
-from core.get_db_session import get_db_session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from core.get_async_db_session import get_async_db_session
 from core.get_current_user import get_current_user
 from models.user import User
 from models.request import RmsRequest
-from models.comment import Comment
-from models.request_status import RmsRequestStatus
 from services.database_service import DatabaseService
+from services.timeline_service import TimelineService
 from core.templates import templates
 from database import logger
-from sqlalchemy.orm import Session
 
 router = APIRouter()
 
 @router.post("/get-view-existing-form", response_class=HTMLResponse)
 async def get_view_existing_form(
     request: Request,  
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ):
     try:
         body = await request.json()  # ✅ Parse JSON request
@@ -31,7 +31,9 @@ async def get_view_existing_form(
             raise HTTPException(status_code=400, detail="unique_ref is required")
 
         # Fetch RmsRequest
-        rms_request = session.query(RmsRequest).filter_by(unique_ref=unique_ref).one_or_none()
+        rms_request = (
+            await session.execute(select(RmsRequest).where(RmsRequest.unique_ref == unique_ref))
+        ).scalar_one_or_none()
         if not rms_request:
             raise HTTPException(status_code=404, detail=f"Request not found: {unique_ref}")
 
@@ -43,14 +45,26 @@ async def get_view_existing_form(
         if not model:
             raise HTTPException(status_code=404, detail=f"Model '{model_name2}' not found")
 
+        # Relationships shown in the form (RmsRequest is skipped), loaded with the item
+        form_relationships = [
+            relationship for relationship in inspect(model).relationships
+            if relationship.mapper.class_ != RmsRequest
+        ]
+
         # Fetch the item
-        item = session.query(model).filter_by(unique_ref=unique_ref).one_or_none()
+        item = (
+            await session.execute(
+                select(model)
+                .where(model.unique_ref == unique_ref)
+                .options(*[selectinload(getattr(model, relationship.key)) for relationship in form_relationships])
+            )
+        ).scalar_one_or_none()
         if not item:
             raise HTTPException(status_code=404, detail="Item not found")
 
         # Gather metadata
-        metadata = DatabaseService.gather_model_metadata(model, session, "view-existing")
-        checklist_metadata = DatabaseService.gather_model_metadata(model, session, "check-list")
+        metadata = DatabaseService.gather_model_metadata(model, None, "view-existing")
+        checklist_metadata = DatabaseService.gather_model_metadata(model, None, "check-list")
 
         check_list = getattr(model, "check_list", {})
 
@@ -73,13 +87,8 @@ async def get_view_existing_form(
 
         # Fetch relationship data
         relationships_data = {}
-        for relationship in inspect(model).relationships:
+        for relationship in form_relationships:
             relationship_name = relationship.key
-
-            # Skip relationships to RmsRequest if necessary
-            if relationship.mapper.class_ == RmsRequest:
-                continue
-
             related_records = getattr(item, relationship_name, [])
             relationships_data[relationship_name] = [
                 {col.name: getattr(record, col.name, "") for col in relationship.mapper.class_.__table__.columns}
@@ -88,35 +97,14 @@ async def get_view_existing_form(
 
         logger.debug(f"Fetched relationships data: {relationships_data}")
 
-        # Fetch comments
-        comments = session.query(Comment).filter(Comment.unique_ref == unique_ref).all()
-        serialized_comments = [
-            {
-                "type": "comment",
-                "text": comment.comment,
-                "user_name": comment.user_name,
-                "timestamp": comment.comment_timestamp,
-            }
-            for comment in comments
-        ]
-
-        # Fetch statuses
-        statuses = session.query(RmsRequestStatus).filter(RmsRequestStatus.unique_ref == unique_ref).all()
-        serialized_statuses = [
-            {
-                "type": "status",
-                "text": status.status,
-                "user_name": status.user_name,
-                "timestamp": status.timestamp,
-            }
-            for status in statuses
-        ]
-
-        # Combine and sort by timestamp
-        combined_entries = serialized_comments + serialized_statuses
-        combined_entries.sort(key=lambda x: x["timestamp"])  # Sort by timestamp
+        # Newest page of comments and status changes (one query); the modal loads older pages
+        # from /requests/{unique_ref}/timeline and shows entries oldest first.
+        entries, timeline_cursor = await session.run_sync(
+            lambda sync_session: TimelineService.fetch_page(sync_session, unique_ref)
+        )
+        combined_entries = entries[::-1]
 
-        logger.debug(f"Combined and sorted entries: {combined_entries}")
+        logger.debug(f"Timeline entries: {combined_entries}")
 
         # ✅ Return only the modal HTML (so it appends to <body>)
         return templates.TemplateResponse(
@@ -134,6 +122,7 @@ async def get_view_existing_form(
                 "is_request": metadata["is_request"],
                 "item_data": item_data,
                 "entries": combined_entries,
+                "timeline_cursor": timeline_cursor,
                 "model_name": model_name2,
                 "RmsRequest": RmsRequest,
                 "unique_ref": unique_ref,
@@ -0,0 +1,135 @@
+import os
+import tempfile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from core.get_current_user import get_current_user
+from core.user_context import UserContext
+from core.get_db_session import get_db_session
+from database import logger
+from services.bulk_import_service import COMMIT_MODES, BulkImportService
+from services.file_reader_service import FileReaderService
+from services.import_dedup_service import ImportDedupService
+from services.job_service import JobService
+from services.performance_metric_service import PerformanceMetricService
+from services.request_service import get_model
+
+router = APIRouter()
+
+
+def _save_upload(file: UploadFile, file_format: str):
+    """
+    Copy an upload to a temp file the job can read after the request has finished.
+
+    Returns:
+        tuple: (path, SHA-256 of the content), hashed while copying.
+    """
+    with tempfile.NamedTemporaryFile(prefix="job-", suffix=file_format, delete=False) as target:
+        return target.name, ImportDedupService.copy_and_hash(file.file, target)
+
+
+def _remove_file(path: str):
+    return lambda: os.remove(path)
+
+
+@router.post("/jobs/bulk-import", status_code=202)
+async def submit_bulk_import(
+    file: UploadFile,
+    model_name: str = Form(...),
+    commit_mode: str = Form("all"),
+    user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_db_session),
+):
+    """
+    Queue a bulk import (same form and file types as /bulk-import) and return its job id right away.
+    Headers are checked before the job is queued; poll /jobs/{job_id} for progress.
+    A file that was already imported is not queued again: its original result is returned with status 200.
+    """
+    file_format = FileReaderService.detect_format(file.filename)
+    if commit_mode not in COMMIT_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid commit_mode '{commit_mode}'. Use one of: {', '.join(COMMIT_MODES)}")
+
+    model = get_model(model_name)
+    path, content_hash = await run_in_threadpool(_save_upload, file, file_format)
+    previous = ImportDedupService.find_completed(session, model, content_hash)
+    if previous is not None:
+        # Already imported: no job, the original result is returned right away
+        os.remove(path)
+        return JSONResponse(
+            {"message": "This file was already imported; returning the original result.", **ImportDedupService.to_result(previous)}
+        )
+
+    try:
+        expected_headers = BulkImportService.expected_headers(model, session)
+        with open(path, "rb") as f:
+            # Unreadable files and missing headers are rejected with a 400 before anything is queued
+            await run_in_threadpool(BulkImportService.check_file_headers, f, file_format, expected_headers)
+        total_rows = await run_in_threadpool(FileReaderService.estimate_row_count, path, file_format)
+        job = JobService.submit(
+            session,
+            "bulk_import",
+            user.user_name,
+            BulkImportService.import_file_job,
+            model.__tablename__,
+            path,
+            file_format,
+            user.user_name,
+            commit_mode,
+            content_hash,
+            file.filename,
+            total_rows=total_rows,
+            cleanup=_remove_file(path),
+        )
+    except Exception:
+        os.remove(path)
+        raise
+
+    logger.info(f"Bulk import of {file.filename} into {model_name} queued as job {job.job_id}")
+    return JobService.to_dict(job)
+
+
+@router.post("/jobs/performance-metrics/upload/{group_id}", status_code=202)
+async def submit_performance_metrics_upload(
+    group_id: str,
+    file: UploadFile = File(...),
+    user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_db_session),
+):
+    """Queue a performance metrics upload for a group and return its job id right away."""
+    file_format = FileReaderService.detect_format(file.filename)
+    path, _ = await run_in_threadpool(_save_upload, file, file_format)
+    try:
+        total_rows = await run_in_threadpool(FileReaderService.estimate_row_count, path, file_format)
+        job = JobService.submit(
+            session,
+            "upload_performance_metrics",
+            user.user_name,
+            PerformanceMetricService.upload_file_job,
+            group_id,
+            path,
+            file_format,
+            total_rows=total_rows,
+            cleanup=_remove_file(path),
+        )
+    except Exception:
+        os.remove(path)
+        raise
+
+    logger.info(f"Performance metrics upload for group {group_id} queued as job {job.job_id}")
+    return JobService.to_dict(job)
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, user: UserContext = Depends(get_current_user), session: Session = Depends(get_db_session)):
+    """Job status and progress: rows processed, percent done, ETA, errors and the result once finished."""
+    return JobService.to_dict(JobService.get_job(session, job_id, user))
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str, user: UserContext = Depends(get_current_user), session: Session = Depends(get_db_session)):
+    """Cancel a queued job, or ask a running one to stop at its next progress report."""
+    job = JobService.cancel(session, job_id, user)
+    logger.info(f"Cancellation requested for job {job_id} by {user.user_name}")
+    return JobService.to_dict(job)
@@ -0,0 +1,30 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from core.get_current_user import get_current_user
+from core.user_context import UserContext
+from database import logger
+from services.database_service import DatabaseService
+
+router = APIRouter()
+
+
+@router.get("/metadata/{model_name}", response_model=dict)
+async def get_model_metadata(
+    model_name: str,
+    form_name: Optional[str] = None,
+    max_depth: int = Query(4, ge=0, le=10),
+    user: UserContext = Depends(get_current_user),
+):
+    """
+    Return the cached metadata of a model (columns, form fields, relationships)
+    exactly as the table and form pages receive it.
+    """
+    model = DatabaseService.get_model_by_tablename(model_name.lower())
+    if not model:
+        raise HTTPException(status_code=404, detail=f"Model '{model_name}' not found.")
+
+    try:
+        return DatabaseService.gather_model_metadata(model, None, form_name, max_depth=max_depth)
+    except Exception as e:
+        logger.error(f"Error fetching metadata for model '{model_name}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Unable to fetch model metadata.")
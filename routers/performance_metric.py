@@ -4,11 +4,12 @@ from core.templates import templates
 from core.get_db_session import get_db_session
 from models.performance_metric import PerformanceMetric
 from sqlalchemy.orm import Session
-import csv
-import io
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from database import logger
+from services.file_reader_service import FileReaderService
+from services.performance_metric_service import PerformanceMetricService
 
 router = APIRouter()
 
@@ -25,31 +26,11 @@ def get_performance_metrics(group_id: str, session: Session = Depends(get_db_ses
 @router.post("/performance-metrics/upload/{group_id}")
 async def upload_performance_metrics(group_id: str, file: UploadFile = File(...), Session: Session = Depends(get_db_session)):
     """
-    Upload and update performance metrics for a given group_id.
+    Upload and update performance metrics for a given group_id (CSV, gzip CSV, NDJSON, XLSX or Parquet).
+    Large files can be uploaded through /jobs/performance-metrics/upload/{group_id} instead.
     """
-    # Read CSV file content
-    content = await file.read()
-    data = io.StringIO(content.decode("utf-8"))
-    reader = csv.DictReader(data)
-
-    # Convert CSV data into dictionary format
-    metrics_data = [row for row in reader]
-
-    if not metrics_data:
-        raise HTTPException(status_code=400, detail="CSV file is empty or invalid")
-
-    # Check if performance metrics already exist
-    perf_metrics = Session.query(PerformanceMetric).filter(PerformanceMetric.group_id == group_id).first()
-
-    if perf_metrics:
-        # Update existing metrics
-        perf_metrics.metrics = metrics_data
-    else:
-        # Create new performance metrics entry
-        perf_metrics = PerformanceMetric(group_id=group_id, metrics=metrics_data)
-        Session.add(perf_metrics)
-
-    Session.commit()
+    reader = FileReaderService.open(file.file, FileReaderService.detect_format(file.filename))
+    await run_in_threadpool(PerformanceMetricService.save_metrics, Session, group_id, reader)
     return {"message": "Performance metrics uploaded successfully", "group_id": group_id}
 
 
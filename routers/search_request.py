@@ -1,13 +1,15 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import inspect
-from core.get_db_session import get_db_session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from core.get_async_db_session import get_async_db_session
 from core.get_current_user import get_current_user
-from models.user import User
+from core.user_context import UserContext
 from models.request import RmsRequest
 from database import logger
+from services.autocomplete_service import AutocompleteService
 from services.database_service import DatabaseService
-from sqlalchemy.orm import Session
 
 router = APIRouter()
 
@@ -16,8 +18,8 @@ async def search_field(
     model_name: str,
     field_name: str,
     search_value: str = Query(..., min_length=1),
-    user: Optional[User] = Depends(get_current_user),  # User object is optional
-    session: Session = Depends(get_db_session),  # Injected session dependency
+    user: Optional[UserContext] = Depends(get_current_user),  # User object is optional
+    session: AsyncSession = Depends(get_async_db_session),  # Injected session dependency
 
 ):
     """
@@ -42,17 +44,25 @@ async def search_field(
         # Fetch the field column
         field_column = getattr(model, field_name)
 
+        # Related records are loaded up front; async sessions cannot lazy-load them later.
+        related_relationships = [
+            relationship for relationship in inspect(model).relationships
+            if relationship.mapper.class_.__name__ != "RmsRequest"
+        ]
+
         # Build the query
         query = (
-            session.query(model)
+            select(model)
             .join(RmsRequest, model.unique_ref == RmsRequest.unique_ref)
-            .filter(field_column == search_value)
+            .where(field_column == search_value)
+            .options(*[selectinload(getattr(model, relationship.key)) for relationship in related_relationships])
         )
 
         if user:
-            query = query.filter(RmsRequest.requester == user.user_name)
+            query = query.where(RmsRequest.requester == user.user_name)
 
-        result = query.order_by(RmsRequest.request_received_timestamp.desc()).first()
+        query = query.order_by(RmsRequest.request_received_timestamp.desc()).limit(1)
+        result = (await session.execute(query)).scalars().first()
 
         if not result:
             raise HTTPException(status_code=404, detail="No matching request found.")
@@ -94,7 +104,7 @@ async def get_suggestions(
     field_name: str,
     query: str = Query(..., min_length=1),
     limit: int = Query(10),  # Limit the number of suggestions returned
-    session: Session = Depends(get_db_session),  # Injected session dependency
+    session: AsyncSession = Depends(get_async_db_session),  # Injected session dependency
 
 ):
     """
@@ -112,20 +122,8 @@ async def get_suggestions(
         if not hasattr(model, field_name):
             raise HTTPException(status_code=400, detail=f"Field '{field_name}' not found in model '{model_name}'.")
 
-        # Get the column object for the field
-        field_column = getattr(model, field_name)
-
-        # Query distinct values that match the query
-        suggestions = (
-            session.query(field_column)
-            .distinct()
-            .filter(field_column.ilike(f"%{query}%"))  # Case-insensitive match
-            .limit(limit)
-            .all()
-        )
-
-        # Extract suggestions into a flat list
-        suggestions_list = [value[0] for value in suggestions]
+        # Prefix/contains matches ranked by frequency, served from memory or the trigram index
+        suggestions_list = await session.run_sync(AutocompleteService.suggest, model, field_name, query, limit)
         logger.info(f"Suggestions found: {suggestions_list}")
 
         return {"suggestions": suggestions_list}
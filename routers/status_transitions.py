@@ -2,6 +2,7 @@ import json
 import logging
 from fastapi import APIRouter, Form, HTTPException
 from fastapi.responses import HTMLResponse
+from core.workflow_engine import compile_workflow
 from database import logger
 from services.workflow_service import WorkflowService
 
@@ -43,52 +44,55 @@ def get_status_transitions(
         if current_status not in request_status_config:
             raise HTTPException(status_code=400, detail=f"Invalid status: {current_status}.")
 
-        # Validate access for each row.
+        workflow = compile_workflow(request_status_config)
+        user_roles = frozenset(roles.split(","))
+        user_scope = {
+            "organization": frozenset(organizations.split(",")),
+            "sub_organization": frozenset(sub_organizations.split(",")),
+            "line_of_business": frozenset(line_of_businesses.split(",")),
+            "team": frozenset(teams.split(",")),
+            "decision_engine": frozenset(decision_engines.split(",")),
+        }
+
+        # Validate access for each row. All rows share one status, so the workflow answers are
+        # computed once; scope is checked once per distinct combination of scope values.
+        checked_scopes = set()
+        has_other_rows = False
         for row in parsed_rows:
             if row.get("requester") == user_name:
                 # For self-transitions, ensure at least one possible next status allows FS_Analyst.
-                possible_next_statuses = request_status_config.get(current_status, {}).get("Next", [])
-                fs_analyst_allowed = any(
-                    "FS_Analyst" in request_status_config.get(status, {}).get("Roles", [])
-                    for status in possible_next_statuses
-                )
-                logger.debug(f"Row {row.get('unique_ref')} possible_next_statuses: {possible_next_statuses}, fs_analyst_allowed: {fs_analyst_allowed}")
-                if not fs_analyst_allowed:
+                if not workflow.requester_can_transition(current_status):
                     raise HTTPException(
                         status_code=403,
                         detail=f"Requester '{user_name}' cannot transition their own request '{row.get('unique_ref')}'."
                     )
-            else:
-                # Validate additional criteria (organizations, teams, etc.)
-                denied_criteria = []
-                if row.get("organization") not in organizations.split(","):
-                    denied_criteria.append(f"organization ({row.get('organization')})")
-                if row.get("sub_organization") not in sub_organizations.split(","):
-                    denied_criteria.append(f"sub_organization ({row.get('sub_organization')})")
-                if row.get("line_of_business") not in line_of_businesses.split(","):
-                    denied_criteria.append(f"line_of_business ({row.get('line_of_business')})")
-                if row.get("team") not in teams.split(","):
-                    denied_criteria.append(f"team ({row.get('team')})")
-                if row.get("decision_engine") not in decision_engines.split(","):
-                    denied_criteria.append(f"decision_engine ({row.get('decision_engine')})")
-                if denied_criteria:
-                    raise HTTPException(
-                        status_code=403,
-                        detail=(f"User {user_id} does not have access to the following criteria for request "
-                                f"'{row.get('unique_ref')}': {', '.join(denied_criteria)}.")
-                    )
+                continue
+
+            has_other_rows = True
+            scope = tuple(row.get(field) for field in user_scope)
+            if scope in checked_scopes:
+                continue
+            # Validate additional criteria (organizations, teams, etc.)
+            denied_criteria = [
+                f"{field} ({value})" for (field, allowed), value in zip(user_scope.items(), scope) if value not in allowed
+            ]
+            if denied_criteria:
+                raise HTTPException(
+                    status_code=403,
+                    detail=(f"User {user_id} does not have access to the following criteria for request "
+                            f"'{row.get('unique_ref')}': {', '.join(denied_criteria)}.")
+                )
+            checked_scopes.add(scope)
 
         # For non-self transitions, validate user roles.
-        for row in parsed_rows:
-            if row.get("requester") != user_name:
-                WorkflowService.validate_user_roles(current_status, roles.split(","), request_status_config)
-                break  # Only need to validate once if at least one row is not self-transition
+        if has_other_rows:
+            WorkflowService.validate_user_roles(current_status, user_roles, request_status_config)
 
         # Get the valid transitions, filtering if the requester is self-transitioning.
         # (Assumes all rows are either self or not; adjust as needed if mixed.)
         is_requester = parsed_rows[0].get("requester") == user_name
         valid_transitions = WorkflowService.get_valid_transitions(
-            current_status, request_status_config, roles.split(","), is_requester
+            current_status, request_status_config, user_roles, is_requester
         )
 
         logger.debug(f"Valid transitions for status '{current_status}': {valid_transitions}")
@@ -109,6 +113,8 @@ def get_status_transitions(
         logger.debug(f"Generated HTML response: {response_html}")
         return HTMLResponse(content=response_html)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in status-transitions endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
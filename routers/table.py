@@ -2,10 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from core.get_db_session import get_db_session
 from core.templates import templates
 from services.database_service import DatabaseService
-from models.user import User
 from models.request import RmsRequest
 from models.request_status import RmsRequestStatus
 from core.get_current_user import get_current_user
+from core.user_context import UserContext
 from database import logger
 from fastapi import status
 from sqlalchemy.orm import Session
@@ -16,11 +16,11 @@ router = APIRouter()
 async def get_table(
     model_name: str,
     request: Request,
-    user: User = Depends(get_current_user),
+    user: UserContext = Depends(get_current_user),
     session: Session = Depends(get_db_session),
 ):
     # Restrict access for certain models
-    is_admin = "Admin" in user.roles
+    is_admin = "Admin" in user.role_set
     ADMIN_MODELS = {"users"}
     if model_name in ADMIN_MODELS and not is_admin:
         raise HTTPException(
@@ -1,16 +1,19 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
 
 # Import necessary database services
-from core.get_db_session import get_db_session
+from core.get_async_db_session import get_async_db_session
+from core.get_current_user import get_current_user
+from core.user_context import UserContext
 from list_values import REQUEST_EXTRA_COLUMNS
 from models.request import RmsRequest
 from models.request_status import RmsRequestStatus
 from services.database_service import DatabaseService
+from services.export_service import EXPORT_FORMATS, ExportService
 
 router = APIRouter()
 
@@ -25,9 +28,14 @@ def serialize_row(row: dict) -> Dict[str, Any]:
 async def get_table_data(
     model_name: str,
     request: Request,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
+    user: UserContext = Depends(get_current_user),
 ):
-    """Fetch paginated table data with filtering, ordering, and search."""
+    """
+    Fetch paginated table data with filtering, ordering, and search.
+    With "my_scope": true, request tables only return rows within the user's organizations,
+    teams, etc., or requested by the user (filtered in the database).
+    """
     try:
         body = await request.json()
         print(f"📥 Received JSON Payload: {body}")  # Debugging
@@ -39,6 +47,10 @@ async def get_table_data(
         order_column_index = body.get("order_column_index", 0)
         order_dir = body.get("order_dir", "desc")
         filters = body.get("filters", {})
+        pagination = body.get("pagination", "offset")  # "offset" (DataTables start/length) or "keyset"
+        cursor = body.get("cursor")  # Opaque cursor from a previous keyset page
+        count_strategy = body.get("count_strategy", "exact")  # "exact", "estimated" or "has_more"
+        scope = user.scope if body.get("my_scope") else None  # Only rows the user may act on
 
     except json.JSONDecodeError:
         return JSONResponse(status_code=400, content={"error": "Invalid JSON format received"})
@@ -48,32 +60,115 @@ async def get_table_data(
     if not model:
         return JSONResponse(status_code=404, content={"error": f"Model not found: {model_name}"})
 
+    if pagination == "keyset" or cursor:
+        try:
+            row_dicts, filtered_count, next_cursor, prev_cursor = await session.run_sync(
+                lambda sync_session: DatabaseService.fetch_model_rows_keyset(
+                    model_name=model_name,
+                    session=sync_session,
+                    model=model,
+                    filters=filters,
+                    search_value=search_value,
+                    sort_column_index=order_column_index,
+                    sort_order=order_dir,
+                    cursor=cursor,
+                    length=length,
+                    count_strategy=count_strategy,
+                    scope=scope
+                )
+            )
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+
+        json_safe_data = [serialize_row(row) for row in row_dicts]
+        return JSONResponse(content={
+            "draw": draw,
+            "recordsTotal": filtered_count,
+            "recordsFiltered": filtered_count,
+            "data": json_safe_data,
+            "count_strategy": count_strategy,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        })
+
     # Pass search_value along with filters and pagination settings
-    row_dicts, filtered_count = DatabaseService.fetch_model_rows(
-        model_name=model_name,
-        session=session,
-        model=model,
-        filters=filters,
-        search_value=search_value,  # <-- Key change: pass the search_value!
-        sort_column_index=order_column_index,
-        sort_order=order_dir,
-        start=start,
-        length=length
-    )
+    try:
+        # The shared sync query code runs on the async connection via run_sync.
+        row_dicts, filtered_count = await session.run_sync(
+            lambda sync_session: DatabaseService.fetch_model_rows(
+                model_name=model_name,
+                session=sync_session,
+                model=model,
+                filters=filters,
+                search_value=search_value,  # <-- Key change: pass the search_value!
+                sort_column_index=order_column_index,
+                sort_order=order_dir,
+                start=start,
+                length=length,
+                count_strategy=count_strategy,
+                scope=scope
+            )
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
     json_safe_data = [serialize_row(row) for row in row_dicts]
     return JSONResponse(content={
         "draw": draw,
         "recordsTotal": filtered_count,
         "recordsFiltered": filtered_count,
-        "data": json_safe_data
+        "data": json_safe_data,
+        "count_strategy": count_strategy,
     })
 
 
 
+@router.post("/table/{model_name}/export")
+async def export_table_data(model_name: str, request: Request, user: UserContext = Depends(get_current_user)):
+    """
+    Stream every row matching the table filters, search and sort as a CSV or NDJSON download.
+
+    Accepts the same body as `/table/{model_name}/data` (pagination fields are ignored) plus
+    "format" ("csv" or "ndjson", default "csv") and "gzip" (bool); "my_scope" applies as for the table. Rows are read through a
+    server-side cursor and sent as they are encoded, so exports of any size use the same memory.
+    """
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return JSONResponse(status_code=400, content={"error": "Invalid JSON format received"})
+
+    export_format = str(body.get("format", "csv")).lower()
+    compress = bool(body.get("gzip", False))
+    if export_format not in EXPORT_FORMATS:
+        return JSONResponse(
+            status_code=400, content={"error": f"Unknown export format '{export_format}'. Use one of: {', '.join(EXPORT_FORMATS)}"}
+        )
+
+    model = DatabaseService.get_model_by_tablename(model_name.lower())
+    if not model:
+        return JSONResponse(status_code=404, content={"error": f"Model not found: {model_name}"})
+
+    stream = ExportService.stream_export(
+        model,
+        export_format,
+        compress=compress,
+        filters=body.get("filters", {}),
+        search_value=body.get("search_value", ""),
+        sort_column_index=body.get("order_column_index", 0),
+        sort_order=body.get("order_dir", "desc"),
+        scope=user.scope if body.get("my_scope") else None,
+    )
+    file_name = ExportService.file_name(model.__tablename__, export_format, compress)
+    return StreamingResponse(
+        stream,
+        media_type=ExportService.media_type(export_format, compress),
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
+
+
 @router.post("/table/{model_name}/metadata")
 async def get_table_metadata(
     model_name: str,
-    session: Session = Depends(get_db_session),
 ):
     """Fetch table metadata like column headers and filter options."""
     
@@ -0,0 +1,46 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.get_async_db_session import get_async_db_session
+from database import logger
+from models.request import RmsRequest
+from services.timeline_service import TIMELINE_PAGE_SIZE, TimelineService
+
+router = APIRouter()
+
+
+@router.get("/requests/{unique_ref}/timeline")
+async def get_timeline(
+    unique_ref: str,
+    cursor: Optional[str] = None,
+    limit: int = TIMELINE_PAGE_SIZE,
+    session: AsyncSession = Depends(get_async_db_session),
+):
+    """
+    Comments and status changes of a request, newest first, one page at a time.
+    Pass `next_cursor` from the response as `cursor` to load older entries; it is null on the last page.
+    """
+    try:
+        entries, next_cursor = await session.run_sync(
+            lambda sync_session: TimelineService.fetch_page(sync_session, unique_ref, cursor, limit)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching timeline for unique_ref {unique_ref}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to fetch timeline")
+
+    if not entries and not cursor:
+        # An empty first page is either a request without history or an unknown request
+        exists = await session.execute(select(RmsRequest.unique_ref).where(RmsRequest.unique_ref == unique_ref))
+        if exists.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail=f"Request with unique_ref {unique_ref} does not exist")
+
+    return {
+        "entries": [
+            {**entry, "timestamp": entry["timestamp"].strftime('%Y-%m-%d %H:%M:%S') if entry["timestamp"] else None}
+            for entry in entries
+        ],
+        "next_cursor": next_cursor,
+    }
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from core.get_db_session import get_db_session
 import json
 from services.database_service import DatabaseService
+from services.search_service import SearchService
 
 router = APIRouter()
 
@@ -50,6 +51,7 @@ async def update_checklist(
         else:
             raise HTTPException(status_code=400, detail=f"{model_name} does not have a 'governance' field.")
 
+        SearchService.index_objects(session, [instance])
         session.commit()
 
         return {"message": f"Checklist for {model_name} updated successfully.", "governance": checklist_values}
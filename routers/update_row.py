@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from core.get_db_session import get_db_session
 from services.database_service import DatabaseService
+from services.search_service import SearchService
 from database import logger
 from sqlalchemy.orm import Session
 
@@ -60,6 +61,7 @@ async def update_row(
                     new_related_row = related_model(**related_object)
                     related_attribute.append(new_related_row)
 
+        SearchService.index_objects(session, [row])
         session.commit()
         logger.info(f"Successfully updated row with ID {row_id} in model '{model_name}'.")
         return {"message": "Row updated successfully"}
@@ -0,0 +1,248 @@
+import bisect
+import heapq
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from models.request import RmsRequest
+
+logger = logging.getLogger(__name__)
+
+# Fields with more distinct values than this are not cached and are served by the trigram index.
+AUTOCOMPLETE_MAX_VALUES = 50000
+
+# Contains-matches need at least this many characters for the trigram index to help
+# (and, in memory, to match few enough values to be worth scanning for).
+TRIGRAM_MIN_LENGTH = 3
+
+# Contains-matches ranked per lookup; the scan stops once this many are found.
+CONTAINS_MATCH_LIMIT = 500
+
+# session.info key of the values written in the session's transaction, merged after it commits.
+PENDING_VALUES_KEY = "autocomplete_pending_values"
+
+
+class FieldValueIndex:
+    """
+    Distinct values of one field, kept sorted by their lowercase form for prefix lookups.
+    Each value carries a frequency and a last-seen timestamp used for ranking.
+
+    Once the index is shared, `merge` replaces the key list instead of changing it in place,
+    so lookups can search the list they started with without holding the service lock.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.entries: Dict[str, list] = {}  # lowercase value -> [value, count, last_seen]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, value: str, count: int = 1, last_seen: float = 0.0):
+        """Add one value in place; only while the index is being built."""
+        key = value.lower()
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [value, count, last_seen]
+            bisect.insort(self.keys, key)
+        else:
+            entry[1] += count
+            entry[2] = max(entry[2], last_seen)
+
+    def merge(self, values: Iterable[str], last_seen: float) -> None:
+        """Count newly written values; new keys go into a new sorted list. Call with the service lock held."""
+        new_keys = {}
+        for value in values:
+            key = value.lower()
+            entry = self.entries.get(key) or new_keys.get(key)
+            if entry is None:
+                new_keys[key] = [value, 1, last_seen]
+            else:
+                entry[1] += 1
+                entry[2] = max(entry[2], last_seen)
+        if new_keys:
+            self.entries.update(new_keys)
+            self.keys = list(heapq.merge(self.keys, sorted(new_keys)))
+
+    def prefix_matches(self, prefix: str) -> List[list]:
+        keys = self.keys
+        prefix = prefix.lower()
+        matches = []
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            key = keys[i]
+            if not key.startswith(prefix):
+                break
+            matches.append(self.entries[key])
+        return matches
+
+    def contains_matches(self, text: str, max_matches: int = CONTAINS_MATCH_LIMIT) -> List[list]:
+        """Values containing `text` but not starting with it; stops after `max_matches`."""
+        text = text.lower()
+        matches = []
+        for key in self.keys:
+            if text in key and not key.startswith(text):
+                matches.append(self.entries[key])
+                if len(matches) >= max_matches:
+                    break
+        return matches
+
+
+def _rank(entries: List[list], limit: int) -> List[str]:
+    """Most frequent first, then most recently seen, then alphabetical."""
+    entries = sorted(entries, key=lambda entry: (-entry[1], -entry[2], entry[0].lower()))
+    return [entry[0] for entry in entries[:limit]]
+
+
+class AutocompleteService:
+    _indexes: Dict[Tuple[str, str], Optional[FieldValueIndex]] = {}  # None marks an uncacheable field
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_search_fields(models: Iterable) -> List[Tuple[object, str]]:
+        """(model, field_name) pairs flagged with info={"search": True}; these are warmed at startup."""
+        return [
+            (model, column.name)
+            for model in models
+            for column in model.__table__.columns
+            if column.info.get("search", False)
+        ]
+
+    @staticmethod
+    def warm_up(session: Session, models: Iterable) -> None:
+        """Load the distinct values of every searchable field of the given models."""
+        for model, field_name in AutocompleteService.get_search_fields(models):
+            try:
+                AutocompleteService._get_index(session, model, field_name)
+            except Exception as e:
+                logger.error(f"Error warming autocomplete for {model.__tablename__}.{field_name}: {e}", exc_info=True)
+
+    @staticmethod
+    def suggest(session: Session, model, field_name: str, query: str, limit: int = 10) -> List[str]:
+        """
+        Return up to `limit` values of `field_name` that start with (then contain) `query`,
+        ranked by frequency and recency. Contains-matches need TRIGRAM_MIN_LENGTH characters and
+        are ranked among the first CONTAINS_MATCH_LIMIT found.
+        """
+        index = AutocompleteService._get_index(session, model, field_name)
+        if index is not None:
+            # No lock: the index never changes the key list a lookup is reading (see FieldValueIndex)
+            suggestions = _rank(index.prefix_matches(query), limit)
+            if len(suggestions) < limit and len(query) >= TRIGRAM_MIN_LENGTH:
+                suggestions += _rank(index.contains_matches(query), limit - len(suggestions))
+            return suggestions
+
+        # Too many distinct values to cache: let the trigram index answer.
+        field_column = getattr(model, field_name)
+        if len(query) < TRIGRAM_MIN_LENGTH:
+            pattern = f"{_escape_like(query)}%"
+        else:
+            pattern = f"%{_escape_like(query)}%"
+        rows = session.execute(
+            select(field_column, func.count())
+            .where(field_column.ilike(pattern, escape="\\"))
+            .group_by(field_column)
+            .order_by(func.count().desc())
+            .limit(limit)
+        ).all()
+        return [value for value, _ in rows]
+
+    @staticmethod
+    def record_values(session: Session, model, rows: Iterable[dict]) -> None:
+        """
+        Add newly written values to the cached fields of `model` once `session` commits; they are
+        dropped if it rolls back. Other fields are left to load lazily.
+        """
+        table_name = model.__tablename__
+        with AutocompleteService._lock:
+            field_names = [
+                field_name for (cached_table, field_name), index in AutocompleteService._indexes.items()
+                if cached_table == table_name and index is not None
+            ]
+        if not field_names:
+            return
+        rows = list(rows)
+        pending = session.info.setdefault(PENDING_VALUES_KEY, [])
+        for field_name in field_names:
+            values = [row.get(field_name) for row in rows]
+            pending.append((table_name, field_name, [value for value in values if isinstance(value, str) and value]))
+
+    @staticmethod
+    def record_objects(session: Session, objects: Iterable) -> None:
+        """Record the field values of newly created ORM objects. Call before commit, while their attributes are loaded."""
+        for obj in objects:
+            AutocompleteService.record_values(session, type(obj), [vars(obj)])
+
+    @staticmethod
+    def _merge_committed(pending: Iterable[Tuple[str, str, List[str]]]) -> None:
+        now = time.time()
+        with AutocompleteService._lock:
+            for table_name, field_name, values in pending:
+                index = AutocompleteService._indexes.get((table_name, field_name))
+                if index is None:
+                    continue
+                index.merge(values, now)
+                if len(index) > AUTOCOMPLETE_MAX_VALUES:
+                    AutocompleteService._indexes[(table_name, field_name)] = None
+
+    @staticmethod
+    def _get_index(session: Session, model, field_name: str) -> Optional[FieldValueIndex]:
+        key = (model.__tablename__, field_name)
+        if key in AutocompleteService._indexes:
+            return AutocompleteService._indexes[key]
+
+        index = AutocompleteService._load_index(session, model, field_name)
+        with AutocompleteService._lock:
+            AutocompleteService._indexes.setdefault(key, index)
+            return AutocompleteService._indexes[key]
+
+    @staticmethod
+    def _load_index(session: Session, model, field_name: str) -> Optional[FieldValueIndex]:
+        """Build the in-memory index of a field with one GROUP BY, or None if it has too many values."""
+        field_column = getattr(model, field_name)
+        last_seen = None
+        stmt = select(field_column, func.count())
+        if getattr(model, "is_request", False) and hasattr(model, "rms_request"):
+            last_seen = func.max(RmsRequest.request_received_timestamp)
+            stmt = select(field_column, func.count(), last_seen).join(
+                RmsRequest, RmsRequest.unique_ref == model.__table__.c.unique_ref
+            )
+        stmt = (
+            stmt.where(field_column.isnot(None), field_column != "")
+            .group_by(field_column)
+            .limit(AUTOCOMPLETE_MAX_VALUES + 1)
+        )
+
+        rows = session.execute(stmt).all()
+        if len(rows) > AUTOCOMPLETE_MAX_VALUES:
+            logger.info(f"Autocomplete for {model.__tablename__}.{field_name} exceeds {AUTOCOMPLETE_MAX_VALUES} values; using the database.")
+            return None
+
+        index = FieldValueIndex()
+        for row in rows:
+            seen = row[2].timestamp() if last_seen is not None and row[2] is not None else 0.0
+            index.add(str(row[0]), row[1], seen)
+        logger.info(f"Autocomplete loaded {len(index)} values for {model.__tablename__}.{field_name}.")
+        return index
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# --- Recording written values once they are committed ---
+# record_values queues them on the session, so values of a rolled-back transaction never show up
+# as suggestions.
+
+@event.listens_for(Session, "after_commit")
+def _merge_committed_values(session: Session) -> None:
+    pending = session.info.pop(PENDING_VALUES_KEY, None)
+    if pending:
+        AutocompleteService._merge_committed(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_values(session: Session) -> None:
+    session.info.pop(PENDING_VALUES_KEY, None)
@@ -0,0 +1,225 @@
+import json
+import logging
+from typing import Any, Dict, List
+from fastapi import HTTPException
+from sqlalchemy import String, insert
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import RelationshipDirection, Session
+
+from core.id_method import id_batch
+from models.request import RmsRequest
+from models.request_current_status import RmsRequestCurrentStatus
+from models.request_status import RmsRequestStatus
+from services.autocomplete_service import AutocompleteService
+from services.database_service import DatabaseService
+from services.import_validation_service import REQUEST_COLUMNS, ImportValidationService
+from services.request_service import (
+    assign_group_id,
+    column_values,
+    create_rms_request_rows,
+    filter_and_clean_data,
+    get_column_mappings,
+)
+from services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+# Records accepted per batch call; larger sets go through bulk import.
+MAX_BATCH_RECORDS = 1000
+
+
+def _form_value(value: Any):
+    """A JSON value as the create-new form would send it: text, with multi-select lists comma-joined."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def _generated_key(model):
+    """The model's primary key column if it is a String with a default (filled with id_batch), else None."""
+    key_column = inspect(model).primary_key[0]
+    return key_column if isinstance(key_column.type, String) and key_column.default is not None else None
+
+
+def _insert_rows(session: Session, model, rows: List[dict]) -> List[Any]:
+    """Bulk insert rows and return their primary keys, in the order given."""
+    if not rows:
+        return []
+    key_column = inspect(model).primary_key[0]
+    generated_key = _generated_key(model)
+    if generated_key is not None:
+        for row, row_id in zip(rows, id_batch(len(rows))):
+            row.setdefault(generated_key.key, row_id)
+    row_ids = session.execute(insert(model).returning(key_column, sort_by_parameter_order=True), rows).scalars().all()
+    SearchService.index_rows(session, model, row_ids)
+    AutocompleteService.record_values(session, model, rows)
+    return row_ids
+
+
+class BatchCreateService:
+    @staticmethod
+    def parse_records(model, records: Any) -> List[Dict[str, Any]]:
+        """
+        Normalize a JSON batch into create-new form data: one dict per record keyed by column name,
+        values as text, with its nested "relationships" ({name: [related records]}) kept as is.
+
+        Raises:
+            HTTPException: 400 if the batch is not a non-empty list of objects, is too large,
+                or names a relationship the batch cannot create.
+        """
+        if not isinstance(records, list) or not records:
+            raise HTTPException(status_code=400, detail="Expected a non-empty list of records.")
+        if len(records) > MAX_BATCH_RECORDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_RECORDS} records per batch; use bulk import for more.")
+
+        relationships = inspect(model).relationships
+        # Form field names ("First and Last Name") are accepted for their columns ("name")
+        field_names = {column.info["field_name"]: column.name for column in inspect(model).columns if "field_name" in (column.info or {})}
+        parsed = []
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise HTTPException(status_code=400, detail=f"Record {index}: expected an object.")
+            data = {field_names.get(key, key): _form_value(value) for key, value in record.items() if key != "relationships"}
+            related = record.get("relationships") or {}
+            if isinstance(related, str):
+                try:
+                    related = json.loads(related or "{}")
+                except json.JSONDecodeError:
+                    raise HTTPException(status_code=400, detail=f"Record {index}: relationships is not valid JSON.")
+            if not isinstance(related, dict):
+                raise HTTPException(status_code=400, detail=f"Record {index}: relationships must be an object.")
+
+            for name, items in related.items():
+                if name not in relationships:
+                    raise HTTPException(status_code=400, detail=f"Record {index}: unknown relationship '{name}'.")
+                if relationships[name].direction is not RelationshipDirection.ONETOMANY:
+                    raise HTTPException(status_code=400, detail=f"Record {index}: relationship '{name}' cannot be created in a batch.")
+                if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                    raise HTTPException(status_code=400, detail=f"Record {index}: relationship '{name}' must be a list of objects.")
+            data["relationships"] = related
+            parsed.append(data)
+        return parsed
+
+    @staticmethod
+    def validate_records(model, records: List[Dict[str, Any]]) -> List[dict]:
+        """
+        Check every record (and its related records) with the bulk import column checks, so all
+        problems are reported at once and nothing is inserted if any record is invalid.
+
+        Returns:
+            list: Errors as {record, column, value, error}; `record` is the 0-based index in the batch.
+        """
+        is_request = getattr(model, "is_request", False)
+        errors = []
+
+        headers = {key for record in records for key in record if key != "relationships"}
+        columns = list(inspect(model).columns)
+        if is_request:
+            columns += [RmsRequest.__table__.columns[name] for name in REQUEST_COLUMNS]
+        for column in columns:
+            # Required columns are checked even if no record has them
+            if (column.info or {}).get("required"):
+                headers.add(column.name)
+
+        for error in ImportValidationService.validate_rows(model, records, sorted(headers), is_request):
+            errors.append({"record": error["row"] - 1, "column": error["column"], "value": error["value"], "error": error["error"]})
+
+        relationships = inspect(model).relationships
+        for index, record in enumerate(records):
+            for name, items in record["relationships"].items():
+                rel_model = relationships[name].mapper.class_
+                items = [{key: _form_value(value) for key, value in item.items()} for item in items]
+                item_headers = sorted({key for item in items for key in item})
+                for error in ImportValidationService.validate_rows(rel_model, items, item_headers, False):
+                    errors.append({
+                        "record": index,
+                        "column": f"{name}[{error['row'] - 1}].{error['column']}",
+                        "value": error["value"],
+                        "error": error["error"],
+                    })
+
+        errors.sort(key=lambda error: error["record"])
+        return errors
+
+    @staticmethod
+    def create_records(session: Session, model, records: List[Dict[str, Any]], user) -> Dict[str, Any]:
+        """
+        Create a batch of records (from `parse_records`) under one new group, with their RmsRequest,
+        status rows and related records, using one bulk INSERT per table. Nothing is committed:
+        the caller commits or rolls back the whole batch.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            model: Target SQLAlchemy model class.
+            records (List[dict]): Parsed records.
+            user: The creating user (only user_name is used).
+
+        Returns:
+            dict: group_id and, per record in input order, its index, id, unique_ref and the ids of
+                its related records by relationship name.
+
+        Raises:
+            HTTPException: 400 if a record fails a model validator.
+        """
+        is_request = getattr(model, "is_request", False)
+        group_id = assign_group_id({})
+        column_mappings, allowed_keys, required_columns = get_column_mappings(model)
+        relationships = inspect(model).relationships
+
+        request_rows, status_rows, current_status_rows, model_rows = [], [], [], []
+        for index, record in enumerate(records):
+            data = {key: value for key, value in record.items() if key != "relationships"}
+            try:
+                if is_request:
+                    request_row, status_row, current_status_row = create_rms_request_rows(model, data, group_id, user)
+                    request_rows.append(request_row)
+                    status_rows.append(status_row)
+                    current_status_rows.append(current_status_row)
+
+                data = filter_and_clean_data(data, allowed_keys, required_columns, column_mappings, model)
+                data["unique_ref"] = request_row["unique_ref"] if is_request else None
+                model_rows.append(column_values(model(**data)))
+            except (ValueError, TypeError) as e:
+                raise HTTPException(status_code=400, detail=f"Record {index}: {e}")
+
+        if request_rows:
+            for status_row, status_id in zip(status_rows, id_batch(len(status_rows))):
+                status_row.setdefault("status_id", status_id)
+            session.execute(insert(RmsRequest), request_rows)
+            session.execute(insert(RmsRequestStatus), status_rows)
+            session.execute(insert(RmsRequestCurrentStatus), current_status_rows)
+            SearchService.index_rows(session, RmsRequest, [row["unique_ref"] for row in request_rows])
+
+        row_ids = _insert_rows(session, model, model_rows)
+        results = [
+            {"index": index, "id": row_id, "unique_ref": row.get("unique_ref"), "relationships": {}}
+            for index, (row_id, row) in enumerate(zip(row_ids, model_rows))
+        ]
+
+        # Related records: one insert per relationship, foreign keys copied from the inserted parents
+        names = {name for record in records for name in record["relationships"]}
+        key_name = inspect(model).primary_key[0].key
+        for name in sorted(names):
+            prop = relationships[name]
+            rel_model = prop.mapper.class_
+            rel_columns = {column.name for column in inspect(rel_model).columns}
+            rel_rows, owners = [], []
+            for index, record in enumerate(records):
+                parent = {**model_rows[index], key_name: row_ids[index]}
+                for item in record["relationships"].get(name, []):
+                    rel_row = {key: value for key, value in item.items() if key in rel_columns}
+                    for local, remote in prop.local_remote_pairs:
+                        rel_row[remote.key] = parent.get(local.key)
+                    try:
+                        rel_rows.append(column_values(rel_model(**rel_row)))
+                    except (ValueError, TypeError) as e:
+                        raise HTTPException(status_code=400, detail=f"Record {index}, {name}: {e}")
+                    owners.append(index)
+            for owner, rel_id in zip(owners, _insert_rows(session, rel_model, rel_rows)):
+                results[owner]["relationships"].setdefault(name, []).append(rel_id)
+
+        DatabaseService.invalidate_counts_after_create()
+        logger.info(f"Created {len(records)} '{model.__tablename__}' records in group {group_id}")
+        return {"group_id": group_id, "records": results}
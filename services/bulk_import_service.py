@@ -0,0 +1,377 @@
+import logging
+from itertools import islice
+from types import SimpleNamespace
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import String, insert, select, tuple_
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import Session
+
+from core.id_method import id_batch
+from core.job_errors import JobFailed
+from models.request import RmsRequest
+from models.request_current_status import RmsRequestCurrentStatus
+from models.request_status import RmsRequestStatus
+from services.autocomplete_service import AutocompleteService
+from services.database_service import DatabaseService
+from services.file_reader_service import FileReaderService, RowReader
+from services.import_dedup_service import ImportDedupService
+from services.import_validation_service import ImportValidationService
+from services.request_service import (
+    assign_group_id,
+    column_values,
+    create_rms_request_rows,
+    filter_and_clean_data,
+    get_column_mappings,
+    get_model,
+)
+from services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+# Rows parsed, validated and inserted per batch.
+IMPORT_BATCH_SIZE = 1000
+
+# Request models also need these RmsRequest columns in the file.
+REQUEST_IMPORT_HEADERS = ["organization", "sub_organization", "line_of_business", "team", "decision_engine", "effort"]
+
+# "all": one transaction for the whole file. "chunk": commit after every batch.
+COMMIT_MODES = ("all", "chunk")
+
+
+def _row_key(row: dict, key_columns) -> tuple:
+    """Natural key of a file row, coerced to the column types so it compares with stored keys."""
+    values = []
+    for column in key_columns:
+        value = row.get(column.name, row.get((column.info or {}).get("field_name")))
+        if value in (None, ""):
+            value = None
+        else:
+            try:
+                value = column.type.python_type(value)
+            except (ValueError, TypeError, NotImplementedError):
+                pass  # Left as text; validation reports values that cannot be coerced
+        values.append(value)
+    return tuple(values)
+
+
+def _existing_keys(session: Session, key_columns, keys: set) -> set:
+    """Which of `keys` are already stored, in one query."""
+    if not keys:
+        return set()
+    if len(key_columns) == 1:
+        condition = key_columns[0].in_([key[0] for key in keys])
+    else:
+        condition = tuple_(*key_columns).in_(list(keys))
+    return {tuple(row) for row in session.execute(select(*key_columns).where(condition))}
+
+
+class BulkImportService:
+    @staticmethod
+    def file_errors(model, file: BinaryIO, file_format: str, expected_headers: List[str]) -> Iterator[dict]:
+        """
+        Check the headers of a seekable upload, then return an iterator over its validation
+        errors (see ImportValidationService.validate_rows). The file is rewound once the
+        iterator is exhausted or closed, ready for the import itself.
+
+        Raises:
+            HTTPException: 400 if the file is missing any expected header.
+        """
+        reader = FileReaderService.open(file, file_format)
+        try:
+            BulkImportService.check_headers(reader, expected_headers)
+        except Exception:
+            reader.close()
+            raise
+
+        def errors():
+            try:
+                yield from ImportValidationService.validate_rows(
+                    model, reader, reader.fieldnames, getattr(model, "is_request", False)
+                )
+            finally:
+                reader.close()
+                file.seek(0)
+
+        return errors()
+
+    @staticmethod
+    def validate_file(model, file: BinaryIO, file_format: str, expected_headers: List[str]) -> dict:
+        """
+        Validate a whole upload before importing it.
+
+        Returns:
+            dict: error_count and the first errors (empty when the file can be imported).
+        """
+        return ImportValidationService.summarize(BulkImportService.file_errors(model, file, file_format, expected_headers))
+
+    @staticmethod
+    def expected_headers(model, session: Session) -> List[str]:
+        """Columns a bulk import file for `model` must contain (the create-new form fields)."""
+        metadata = DatabaseService.gather_model_metadata(model, session=session, form_name="create-new")
+        headers = [column["name"] for column in metadata["form_fields"]]
+        if metadata.get("is_request"):
+            headers.extend(REQUEST_IMPORT_HEADERS)
+        return headers
+
+    @staticmethod
+    def check_headers(reader: RowReader, expected_headers: List[str]) -> None:
+        """
+        Raises:
+            HTTPException: 400 if the file is missing any expected header.
+        """
+        file_headers = reader.fieldnames
+        if not file_headers or not all(header in file_headers for header in expected_headers):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file headers. Expected headers: {', '.join(expected_headers)}, but received: {', '.join(file_headers or [])}",
+            )
+
+    @staticmethod
+    def check_file_headers(file: BinaryIO, file_format: str, expected_headers: List[str]) -> None:
+        """
+        Check the headers of a seekable upload without reading its rows. Reading the header may
+        decompress or parse part of the file, so call it off the event loop.
+
+        Raises:
+            HTTPException: 400 if the file cannot be read or is missing any expected header.
+        """
+        reader = FileReaderService.open(file, file_format)
+        try:
+            BulkImportService.check_headers(reader, expected_headers)
+        finally:
+            reader.close()
+
+    @staticmethod
+    def iter_batches(rows: Iterable[dict], batch_size: int = IMPORT_BATCH_SIZE) -> Iterator[List[dict]]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def import_rows(
+        session: Session,
+        model,
+        rows: Iterable[dict],
+        user,
+        is_request: bool,
+        commit_mode: str = "all",
+        batch_size: int = IMPORT_BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+        resume: Optional[Dict[str, object]] = None,
+        checkpoint: Optional[Callable[[dict], None]] = None,
+    ) -> Dict[str, object]:
+        """
+        Import rows into `model` (plus RmsRequest, its status history and current status when
+        `is_request`) under one new group, one batch at a time with bulk INSERT statements.
+        If the model declares `import_natural_key` (column names), rows whose key is already
+        stored or appeared earlier in the file are skipped.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            model: Target SQLAlchemy model class.
+            rows (Iterable[dict]): Rows keyed by column or form field name; consumed lazily.
+            user: The importing user (only user_name is used).
+            is_request (bool): Whether every row also creates an RmsRequest.
+            commit_mode (str): "all" commits once at the end (nothing is kept on error),
+                "chunk" commits after every batch (earlier batches are kept on error).
+            batch_size (int): Rows per batch.
+            progress (Callable, optional): Called with the number of rows processed after every
+                batch (after its commit in "chunk" mode); an exception raised by it aborts the import.
+            resume (dict, optional): group_id, row_count and skipped_rows committed by an earlier
+                attempt; its first row_count rows are skipped and the rest join its group.
+            checkpoint (Callable, optional): In "chunk" mode, called with the group_id, row_count
+                and skipped_rows so far before every batch commit, to record them in the same transaction.
+
+        Returns:
+            dict: group_id, row_count (rows read), skipped_rows and committed_batches.
+
+        Raises:
+            HTTPException: 400 if a row fails model validation.
+        """
+        if commit_mode not in COMMIT_MODES:
+            raise HTTPException(status_code=400, detail=f"Invalid commit_mode '{commit_mode}'. Use one of: {', '.join(COMMIT_MODES)}")
+
+        group_id = resume["group_id"] if resume else assign_group_id({})  # ✅ Generates group_id
+        column_mappings, allowed_keys, required_columns = get_column_mappings(model)
+        key_column = inspect(model).primary_key[0]
+        generated_key = isinstance(key_column.type, String) and key_column.default is not None
+        natural_key = [model.__table__.columns[name] for name in getattr(model, "import_natural_key", ())]
+        seen_keys = set()
+        row_count = resume["row_count"] if resume else 0
+        skipped_rows = resume["skipped_rows"] if resume else 0
+        committed_batches = 0
+        if row_count:
+            rows = islice(rows, row_count, None)
+            logger.info(f"Resuming import of group {group_id} after row {row_count}")
+
+        try:
+            for batch in BulkImportService.iter_batches(rows, batch_size):
+                request_rows, status_rows, current_status_rows, model_rows = [], [], [], []
+                if natural_key:
+                    batch_keys = [_row_key(row, natural_key) for row in batch]
+                    stored_keys = _existing_keys(
+                        session, natural_key, {key for key in batch_keys if None not in key} - seen_keys
+                    )
+                for index, row in enumerate(batch):
+                    row_count += 1
+                    if natural_key and None not in batch_keys[index]:
+                        key = batch_keys[index]
+                        if key in seen_keys or key in stored_keys:
+                            skipped_rows += 1
+                            continue
+                        seen_keys.add(key)
+                    try:
+                        # Transient objects run the model validators; only their values are kept.
+                        if is_request:
+                            request_row, status_row, current_status_row = create_rms_request_rows(model, row, group_id, user)
+                            request_rows.append(request_row)
+                            status_rows.append(status_row)
+                            current_status_rows.append(current_status_row)
+
+                        row_data = filter_and_clean_data(row, allowed_keys, required_columns, column_mappings, model)
+                        row_data["unique_ref"] = request_row["unique_ref"] if is_request else None
+                        model_rows.append(column_values(model(**row_data)))
+                    except (ValueError, TypeError) as e:
+                        raise HTTPException(status_code=400, detail=f"Row {row_count}: {e}")
+
+                # Allocate the batch's generated keys in one call instead of one column default per row
+                if request_rows:
+                    for status_row, status_id in zip(status_rows, id_batch(len(status_rows))):
+                        status_row.setdefault("status_id", status_id)
+                if generated_key:
+                    for model_row, row_id in zip(model_rows, id_batch(len(model_rows))):
+                        model_row.setdefault(key_column.key, row_id)
+
+                if request_rows:
+                    session.execute(insert(RmsRequest), request_rows)
+                    session.execute(insert(RmsRequestStatus), status_rows)
+                    session.execute(insert(RmsRequestCurrentStatus), current_status_rows)
+                    SearchService.index_rows(session, RmsRequest, [row["unique_ref"] for row in request_rows])
+
+                if model_rows:
+                    row_ids = session.execute(
+                        insert(model).returning(key_column, sort_by_parameter_order=True), model_rows
+                    ).scalars().all()
+                    SearchService.index_rows(session, model, row_ids)
+                    AutocompleteService.record_values(session, model, model_rows)
+
+                if commit_mode == "chunk":
+                    if checkpoint is not None:
+                        checkpoint({"group_id": group_id, "row_count": row_count, "skipped_rows": skipped_rows})
+                    session.commit()
+                    committed_batches += 1
+                    logger.debug(f"Committed import batch {committed_batches} ({row_count} rows so far)")
+
+                if progress is not None:
+                    progress(row_count)
+
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            if commit_mode == "chunk" and committed_batches:
+                kept = f"{committed_batches} batches of {batch_size} rows were committed before the error"
+                if isinstance(e, HTTPException):
+                    raise HTTPException(status_code=e.status_code, detail=f"{e.detail} ({kept})")
+                logger.error(f"Import of group {group_id} stopped: {kept}")
+            raise
+        finally:
+            DatabaseService.invalidate_counts_after_create()
+
+        if skipped_rows:
+            logger.info(f"Import of group {group_id} skipped {skipped_rows} rows already imported")
+        return {"group_id": group_id, "row_count": row_count, "skipped_rows": skipped_rows, "committed_batches": committed_batches}
+
+    @staticmethod
+    def import_upload(
+        session: Session,
+        model,
+        rows: Iterable[dict],
+        user,
+        commit_mode: str,
+        content_hash: str,
+        file_name: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, object]:
+        """
+        Import an uploaded file once: if the same bytes were already imported into `model`,
+        return the original result instead (see ImportDedupService). If an earlier "chunk" import
+        of them failed after committing batches, continue after those batches.
+
+        Args:
+            content_hash (str): SHA-256 of the upload.
+            file_name (str, optional): Original file name, kept on the import record.
+            Other arguments as for import_rows.
+
+        Returns:
+            dict: The import_rows result plus `duplicate` (True when nothing was imported).
+
+        Raises:
+            HTTPException: 409 if the same file is being imported right now.
+        """
+        record, completed = ImportDedupService.claim(session, model, content_hash, user.user_name, file_name)
+        if completed:
+            logger.info(f"{file_name or 'Upload'} was already imported into {model.__tablename__} as group {record.group_id}")
+            return ImportDedupService.to_result(record)
+
+        try:
+            result = BulkImportService.import_rows(
+                session, model, rows, user, getattr(model, "is_request", False), commit_mode, progress=progress,
+                resume=ImportDedupService.resume_point(record),
+                checkpoint=lambda done: ImportDedupService.checkpoint(record, done),
+            )
+        except Exception:
+            ImportDedupService.fail(session, record)
+            raise
+        ImportDedupService.complete(session, record, result)
+        return {**result, "duplicate": False}
+
+    @staticmethod
+    def import_file_job(
+        session: Session,
+        context,
+        model_name: str,
+        path: str,
+        file_format: str,
+        user_name: str,
+        commit_mode: str,
+        content_hash: str,
+        file_name: Optional[str] = None,
+    ) -> dict:
+        """
+        Background job handler (see JobService.submit): validate, then import an upload saved to `path`.
+        Validation errors are recorded on the job and nothing is imported.
+
+        Returns:
+            dict: As for import_upload.
+        """
+        model = get_model(model_name)
+        previous = ImportDedupService.find_completed(session, model, content_hash)
+        if previous is not None:
+            return ImportDedupService.to_result(previous)
+
+        with open(path, "rb") as f:
+            error_count = 0
+            for error in BulkImportService.file_errors(model, f, file_format, BulkImportService.expected_headers(model, session)):
+                error_count += 1
+                context.add_error(f"Row {error['row']}, {error['column']}: {error['error']}")
+            if error_count:
+                raise JobFailed(f"{error_count} validation errors; nothing was imported")
+
+            result = BulkImportService.import_upload(
+                session,
+                model,
+                FileReaderService.open(f, file_format),
+                SimpleNamespace(user_name=user_name),
+                commit_mode,
+                content_hash,
+                file_name,
+                progress=context.progress,
+            )
+        context.progress(result["row_count"], force=True)
+        return result
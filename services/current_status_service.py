@@ -0,0 +1,91 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from models.request_current_status import RmsRequestCurrentStatus
+from models.request_status import RmsRequestStatus
+
+logger = logging.getLogger(__name__)
+
+
+class CurrentStatusService:
+    @staticmethod
+    def compare_and_set(
+        session: Session,
+        unique_refs: Iterable[str],
+        expected_status: str,
+        status: str,
+        user_name: str,
+        versions: Optional[Dict[str, int]] = None,
+    ) -> List[str]:
+        """
+        Move the requests that are still in `expected_status` to `status`, bumping their version,
+        with one conditional UPDATE ... RETURNING. Refs listed in `versions` must also still be at
+        that version, which catches a request that left and came back to the same status.
+
+        Only the matched rows are locked, and a concurrent transition of the same request waits for
+        this one and then no longer matches, so exactly one of two racing approvers wins.
+
+        Returns:
+            list: The refs that were moved. The others were changed by someone else first
+            (or have no current status row).
+        """
+        versions = versions or {}
+        unique_refs = list(unique_refs)
+        unversioned = [unique_ref for unique_ref in unique_refs if unique_ref not in versions]
+        versioned = [(unique_ref, versions[unique_ref]) for unique_ref in unique_refs if unique_ref in versions]
+
+        key_filters = []
+        if unversioned:
+            key_filters.append(RmsRequestCurrentStatus.unique_ref.in_(unversioned))
+        if versioned:
+            key_filters.append(tuple_(RmsRequestCurrentStatus.unique_ref, RmsRequestCurrentStatus.version).in_(versioned))
+        if not key_filters:
+            return []
+
+        return session.execute(
+            update(RmsRequestCurrentStatus)
+            .where(RmsRequestCurrentStatus.status == expected_status, or_(*key_filters))
+            .values(
+                status=status,
+                user_name=user_name,
+                timestamp=func.current_timestamp(),
+                version=RmsRequestCurrentStatus.version + 1,
+            )
+            .returning(RmsRequestCurrentStatus.unique_ref),
+            execution_options={"synchronize_session": False},
+        ).scalars().all()
+
+    @staticmethod
+    def backfill(session: Session) -> int:
+        """
+        Rebuild the current-status projection from the full status history.
+
+        Keeps the newest RmsRequestStatus row per unique_ref (ties broken by
+        status_id). Returns the number of projected requests.
+        """
+        ranked = select(
+            RmsRequestStatus.unique_ref,
+            RmsRequestStatus.status,
+            RmsRequestStatus.user_name,
+            RmsRequestStatus.timestamp,
+            func.row_number().over(
+                partition_by=RmsRequestStatus.unique_ref,
+                order_by=(RmsRequestStatus.timestamp.desc(), RmsRequestStatus.status_id.desc()),
+            ).label("row_number"),
+        ).subquery()
+
+        session.execute(delete(RmsRequestCurrentStatus))
+        session.execute(
+            insert(RmsRequestCurrentStatus).from_select(
+                ["unique_ref", "status", "user_name", "timestamp"],
+                select(ranked.c.unique_ref, ranked.c.status, ranked.c.user_name, ranked.c.timestamp)
+                .where(ranked.c.row_number == 1),
+            )
+        )
+        session.commit()
+
+        projected = session.query(func.count()).select_from(RmsRequestCurrentStatus).scalar()
+        logger.info(f"Backfilled current status for {projected} requests.")
+        return projected
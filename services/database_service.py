@@ -1,18 +1,119 @@
+from datetime import date, datetime
+import json
 from typing import Any, Dict, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 from sqlalchemy.inspection import inspect
-from sqlalchemy.ext.declarative import DeclarativeMeta
 import logging
-from sqlalchemy import select,func, or_
-from sqlalchemy.orm import aliased
-from database import Base
+import threading
+import time
+from sqlalchemy import and_, func, or_, tuple_
+from core.keyset import decode_cursor, encode_cursor, sort_key
+from core.model_registry import ModelRegistry
 from list_values import REQUEST_EXTRA_COLUMNS
 from models.request import RmsRequest
-from models.request_status import RmsRequestStatus
-from typing import Optional, Dict, Any, List, Tuple
+from models.request_current_status import RmsRequestCurrentStatus
+from services.search_service import SearchService
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+COUNT_STRATEGIES = ("exact", "estimated", "has_more")
+EXACT_COUNT_CACHE_TTL = 60  # seconds
+ESTIMATED_COUNT_THRESHOLD = 1000
+EXPORT_BATCH_SIZE = 2000  # Rows fetched per round trip while streaming an export
+
+# Unfiltered exact counts per table name: (cached_at, count)
+_exact_count_cache: Dict[str, Tuple[float, int]] = {}
+
+# Model metadata per (model, form_name, max_depth); it only changes when the code does.
+_model_metadata_cache: Dict[Tuple[Any, Optional[str], int], "FrozenDict"] = {}
+_model_metadata_lock = threading.Lock()
+
+# Forms whose metadata is built at startup; None is the plain table view.
+METADATA_FORM_NAMES = (None, "create-new", "view-existing", "check-list")
+
+
+class FrozenDict(dict):
+    """A dict that rejects mutation, so cached metadata can be shared between requests."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Cached model metadata is read-only.")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        return id(self)
+
+
+def _freeze(value):
+    """Recursively turn dicts into FrozenDicts and lists/sets into tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _encode_cursor(direction: str, sort_name: Optional[str], sort_order: str, sort_value, key_value) -> str:
+    """Pack a table keyset position into an opaque cursor string."""
+    return encode_cursor({"d": direction, "s": sort_name, "o": sort_order.lower(), "v": sort_value, "k": key_value})
+
+
+def _decode_cursor(cursor: str, sort_column, sort_order: str, key_column, raw_sort_value: bool = False) -> Tuple[str, Any, Any]:
+    """
+    Unpack a cursor into (direction, sort_value, key_value), checking it matches the current sort.
+    With `raw_sort_value` the sort value is kept as stored in the cursor (see `keyset.sort_key`).
+    """
+    try:
+        payload = decode_cursor(cursor)
+        direction, sort_name, order = payload["d"], payload["s"], payload["o"]
+        sort_value, key_value = payload["v"], payload["k"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+
+    if direction not in ("next", "prev"):
+        raise ValueError("Invalid pagination cursor.")
+    if sort_name != (sort_column.name if sort_column is not None else None) or order != sort_order.lower():
+        raise ValueError("Pagination cursor does not match the current sort order.")
+
+    # JSON has no datetime type, so restore it from the column type.
+    if sort_column is not None and sort_value is not None and not raw_sort_value:
+        python_type = sort_column.type.python_type
+        if python_type in (datetime, date):
+            sort_value = python_type.fromisoformat(sort_value)
+    return direction, sort_value, key_value
+
+
+def _keyset_order(sort_column, key_column, descending: bool, reverse: bool = False):
+    """ORDER BY for keyset pages: sort column with NULLs last, then the key; `reverse` walks backwards."""
+    if reverse:
+        descending = not descending
+    key_order = key_column.desc() if descending else key_column.asc()
+    if sort_column is None:
+        return [key_order]
+    sort_order = sort_column.desc() if descending else sort_column.asc()
+    sort_order = sort_order.nulls_first() if reverse else sort_order.nulls_last()
+    return [sort_order, key_order]
+
+
+def _keyset_filter(sort_column, key_column, sort_value, key_value, descending: bool, reverse: bool = False):
+    """WHERE clause selecting rows after (or, with `reverse`, before) the given keyset position."""
+    def beyond(left, right):
+        return left < right if descending != reverse else left > right
+
+    if sort_column is None:
+        return beyond(key_column, key_value)
+
+    if not reverse:
+        # NULL sort values come last, after every non-NULL value.
+        if sort_value is None:
+            return and_(sort_column.is_(None), beyond(key_column, key_value))
+        return or_(beyond(tuple_(sort_column, key_column), tuple_(sort_value, key_value)), sort_column.is_(None))
+
+    if sort_value is None:
+        return or_(sort_column.isnot(None), beyond(key_column, key_value))
+    return beyond(tuple_(sort_column, key_column), tuple_(sort_value, key_value))
+
 class DatabaseService:
     @staticmethod
     def get_model_by_request_type(request_type: str):
@@ -25,45 +126,33 @@ class DatabaseService:
         Returns:
             str: The __tablename__ of the matching model, or None if not found.
         """
-        for mapper in Base.registry.mappers:
-            cls = mapper.class_
-            
-            # Skip the RmsRequest model
-            if cls.__name__ == "RmsRequest":
-                continue  
-
-            if isinstance(cls, DeclarativeMeta):
-                # Check if the model has a 'request_type' column with predefined options
-                request_type_col = getattr(cls, 'request_type', None)
-                if request_type_col is not None:
-                    column_info = request_type_col.info if hasattr(request_type_col, 'info') else {}
-                    options = column_info.get("options", [])
-
-                    # If request_type exists in the model's options, return its tablename
-                    if request_type in options:
-                        return cls.__tablename__
-
-        return None  # Return None if no matching model is found
+        model = ModelRegistry.get_model_by_request_type(request_type)
+        return model.__tablename__ if model else None  # Return None if no matching model is found
 
     
     @staticmethod
-    def fetch_model_rows(
-        model_name: str,
+    def build_rows_query(
         session: Session,
         model,
         filters: Dict[str, Any] = None,  # Column-specific filters
         search_value: str = "",          # Full-table search value
-        sort_column_index: Optional[int] = None,
-        sort_order: str = "asc",
-        start: int = 0,
-        length: int = 10
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        scope: Optional[Dict[str, Iterable[str]]] = None,  # RmsRequest column -> allowed values
+    ) -> Tuple[Query, List[str], List[str]]:
         """
-        Fetch rows for the model with filtering, full-table search, ordering, and pagination.
+        Build the filtered rows query shared by the table endpoints.
         For models that are request models (i.e. either model.is_request == True or the model is RmsRequest),
-        join the latest Request Status (RmsRequestStatus). Additionally, if model.is_request is True,
+        join the current Request Status (RmsRequestCurrentStatus). Additionally, if model.is_request is True,
         join extra Request data (RmsRequest) to fetch fields like organization and sub_organization.
         Only selected columns (as defined by arrays) are fetched.
+
+        `scope` (e.g. UserContext.scope) limits request models to rows whose RmsRequest
+        organization, team, etc. are among the given values, as IN predicates served by the
+        requests scope index; an empty value list matches nothing. Rows whose requester is among
+        scope["requester"] are kept as well. Other models ignore it.
+
+        Returns:
+            tuple: The unsorted, unpaginated query, the base column names and the extra column names,
+            in the order they are selected.
         """
         # --- Base setup ---
         base_columns = list(model.__table__.columns)
@@ -104,34 +193,45 @@ class DatabaseService:
                 request_model = model
 
 
-            # --- Always join the latest status in this case ---
-            latest_status = aliased(RmsRequestStatus)
-            correlated_subq = (
-                select(func.max(RmsRequestStatus.timestamp))
-                .filter(RmsRequestStatus.unique_ref == request_model.__table__.c.unique_ref)
-                .scalar_subquery()
-            )
-            rs_cols = [func.coalesce(getattr(latest_status, col), "").label(col)
+            # --- Always join the current status projection in this case ---
+            rs_cols = [func.coalesce(getattr(RmsRequestCurrentStatus, col), "").label(col)
                     for col in request_status_columns]
             extra_col_names.extend(request_status_columns)
             entities.extend(rs_cols)
-            extra_filters["status"] = getattr(latest_status, "status", None)
+            # Sent back with status transitions so they only apply to the version the user saw
+            extra_col_names.append("status_version")
+            entities.append(RmsRequestCurrentStatus.version.label("status_version"))
+            extra_filters["status"] = getattr(RmsRequestCurrentStatus, "status", None)
 
             # Build the query: select the entities and apply the necessary joins.
             query = session.query(*entities)
             if getattr(model, "is_request", False) and hasattr(model, "rms_request"):
                 query = query.join(model.rms_request)
             query = query.outerjoin(
-                latest_status,
-                (latest_status.unique_ref == request_model.__table__.c.unique_ref) &
-                (latest_status.timestamp == correlated_subq)
+                RmsRequestCurrentStatus,
+                RmsRequestCurrentStatus.unique_ref == request_model.__table__.c.unique_ref,
             )
+
+            # --- "My scope": only rows the user may act on ---
+            if scope:
+                requesters = scope.get("requester")
+                in_scope = and_(*[
+                    getattr(request_model, col_name).in_(sorted(values))
+                    for col_name, values in scope.items() if col_name != "requester"
+                ])
+                if requesters:
+                    in_scope = or_(in_scope, request_model.requester.in_(sorted(requesters)))
+                query = query.filter(in_scope)
         else:
             # For models that are not request models, query the base table only.
             query = session.query(*entities)
 
         # --- Global search filtering ---
-        if search_value:
+        # Indexed models are served by the full-text index; the rest fall back to ILIKE.
+        search_filter = SearchService.build_search_filter(session, model, search_value) if search_value else None
+        if search_filter is not None:
+            query = query.filter(search_filter)
+        elif search_value:
             search_filters = [
                 getattr(model, col.name).ilike(f"%{search_value}%")
                 for col in model.__table__.columns
@@ -153,22 +253,152 @@ class DatabaseService:
                 if col_attr is not None:
                     query = query.filter(col_attr == filter_value)
 
+        return query, base_col_names, extra_col_names
+
+    @staticmethod
+    def get_sort_column(model, sort_column_index: Optional[int]):
+        """Return the model column for a DataTables sort index, or None if the index is out of range."""
+        if sort_column_index is None:
+            return None
+        model_columns = list(model.__table__.columns)
+        if 0 <= sort_column_index < len(model_columns):
+            return model_columns[sort_column_index]
+        return None
+
+    @staticmethod
+    def rows_to_dicts(rows, base_col_names: List[str], extra_col_names: List[str]) -> List[Dict[str, Any]]:
+        """Convert row tuples from `build_rows_query` into dictionaries keyed by column name."""
+        result = []
+        total_base = len(base_col_names)
+        total_extra = len(extra_col_names)
+        for row in rows:
+            row = list(row)
+            base_data = dict(zip(base_col_names, row[:total_base]))
+            extra_data = dict(zip(extra_col_names, row[total_base:])) if total_extra > 0 else {}
+            row_dict = {**base_data, **extra_data}
+            result.append(row_dict)
+        return result
+
+    @staticmethod
+    def count_rows(session: Session, query: Query, model, count_strategy: str = "exact", is_filtered: bool = True) -> Optional[int]:
+        """
+        Count the rows matched by a `build_rows_query` query using the given strategy.
+
+        - "exact": COUNT(*) over the full query. Unfiltered counts are cached per table
+          for EXACT_COUNT_CACHE_TTL seconds (see `invalidate_count_cache`).
+        - "estimated": exact up to ESTIMATED_COUNT_THRESHOLD rows; beyond that the PostgreSQL
+          planner estimate. Other databases have no estimate and get an exact count, so offset
+          paging still reaches every page.
+        - "has_more": no count query at all; returns None and the caller fetches one extra row.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+        """
+        count_strategy = (count_strategy or "exact").lower()
+        if count_strategy not in COUNT_STRATEGIES:
+            raise ValueError(f"Unknown count strategy '{count_strategy}'. Expected one of {list(COUNT_STRATEGIES)}.")
+
+        if count_strategy == "has_more":
+            return None
+
+        if count_strategy == "estimated":
+            bounded_query = query.limit(ESTIMATED_COUNT_THRESHOLD + 1).subquery()
+            bounded_count = session.query(func.count()).select_from(bounded_query).scalar()
+            if bounded_count <= ESTIMATED_COUNT_THRESHOLD:
+                return bounded_count
+            estimate = DatabaseService._planner_row_estimate(session, query)
+            if estimate is None:
+                return query.count()
+            return max(estimate, bounded_count)
+
+        if is_filtered:
+            return query.count()
+
+        cached = _exact_count_cache.get(model.__tablename__)
+        if cached and time.monotonic() - cached[0] < EXACT_COUNT_CACHE_TTL:
+            return cached[1]
+        exact_count = query.count()
+        _exact_count_cache[model.__tablename__] = (time.monotonic(), exact_count)
+        return exact_count
+
+    @staticmethod
+    def invalidate_count_cache(table_name: Optional[str] = None):
+        """Drop cached unfiltered counts for one table (or all tables) after rows are inserted or deleted."""
+        if table_name is None:
+            _exact_count_cache.clear()
+        else:
+            _exact_count_cache.pop(table_name.lower(), None)
+
+    @staticmethod
+    def invalidate_counts_after_create():
+        """
+        Drop every cached table count after records are created. A request model record also adds
+        RmsRequest, status and current-status rows, and related records go to their own tables,
+        so dropping the target table's count alone would leave stale counts behind.
+        """
+        DatabaseService.invalidate_count_cache()
+
+    @staticmethod
+    def _planner_row_estimate(session: Session, query: Query) -> Optional[int]:
+        """Return the PostgreSQL planner's row estimate for the query, or None on other databases."""
+        connection = session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+
+        compiled = query.statement.compile(dialect=connection.dialect)
+        params = compiled.params
+        if compiled.positiontup:
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def fetch_model_rows(
+        model_name: str,
+        session: Session,
+        model,
+        filters: Dict[str, Any] = None,  # Column-specific filters
+        search_value: str = "",          # Full-table search value
+        sort_column_index: Optional[int] = None,
+        sort_order: str = "asc",
+        start: int = 0,
+        length: int = 10,
+        count_strategy: str = "exact",
+        scope: Optional[Dict[str, Iterable[str]]] = None,  # See `build_rows_query`
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch rows for the model with filtering, full-table search, ordering, and pagination.
+        See `build_rows_query` for the joins applied to request models and `count_rows` for
+        the available count strategies.
+        """
+        query, base_col_names, extra_col_names = DatabaseService.build_rows_query(
+            session, model, filters=filters, search_value=search_value, scope=scope
+        )
+
         # --- Count records after filtering ---
-        filtered_count = query.count()
+        # Scoped counts differ per user, so they never go to the unfiltered count cache
+        is_filtered = bool(search_value) or bool(scope) or any(filters.values() if filters else [])
+        filtered_count = DatabaseService.count_rows(session, query, model, count_strategy, is_filtered)
 
         # --- Sorting ---
-        if sort_column_index is not None:
-            model_columns = list(model.__table__.columns)
-            if 0 <= sort_column_index < len(model_columns):
-                sort_column = model_columns[sort_column_index]
-                if sort_order.lower() == "desc":
-                    query = query.order_by(sort_column.desc())
-                else:
-                    query = query.order_by(sort_column.asc())
+        sort_column = DatabaseService.get_sort_column(model, sort_column_index)
+        if sort_column is not None:
+            if sort_order.lower() == "desc":
+                query = query.order_by(sort_column.desc())
+            else:
+                query = query.order_by(sort_column.asc())
 
         # --- Pagination ---
-        query = query.offset(start).limit(length)
-        rows = query.all()
+        if filtered_count is None:
+            # "has_more": one extra row tells DataTables whether a next page exists.
+            rows = query.offset(start).limit(length + 1).all()
+            filtered_count = start + len(rows)
+            rows = rows[:length]
+        else:
+            query = query.offset(start).limit(length)
+            rows = query.all()
 
         # Debug: Print shape of returned rows.
         for i, row in enumerate(rows):
@@ -179,18 +409,94 @@ class DatabaseService:
             print(f"Row {i} tuple length: {len(row_tuple)}; values: {row_tuple}")
 
         # --- Convert rows (tuples) to dictionaries ---
-        result = []
-        total_base = len(base_columns)
-        total_extra = len(extra_col_names)
-        for row in rows:
-            row = list(row)
-            base_data = dict(zip(base_col_names, row[:total_base]))
-            extra_data = dict(zip(extra_col_names, row[total_base:])) if total_extra > 0 else {}
-            row_dict = {**base_data, **extra_data}
-            result.append(row_dict)
+        result = DatabaseService.rows_to_dicts(rows, base_col_names, extra_col_names)
 
         return result, filtered_count
 
+    @staticmethod
+    def fetch_model_rows_keyset(
+        model_name: str,
+        session: Session,
+        model,
+        filters: Dict[str, Any] = None,  # Column-specific filters
+        search_value: str = "",          # Full-table search value
+        sort_column_index: Optional[int] = None,
+        sort_order: str = "asc",
+        cursor: Optional[str] = None,
+        length: int = 10,
+        count_strategy: str = "exact",
+        scope: Optional[Dict[str, Iterable[str]]] = None,  # See `build_rows_query`
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str], Optional[str]]:
+        """
+        Fetch a page of rows using keyset (seek) pagination instead of OFFSET.
+
+        Rows are ordered by the sort column (NULLs last) with the model's primary key
+        (unique_ref for RmsRequest) as the tiebreaker, and each page starts right after
+        the key stored in `cursor`, so page N costs the same as page 1.
+
+        Args:
+            cursor: Opaque cursor returned by a previous call, or None for the first page.
+
+        Returns:
+            tuple: (rows, filtered_count, next_cursor, prev_cursor). A cursor is None when
+            there is no page in that direction.
+
+        Raises:
+            ValueError: If the cursor is malformed or was built for a different sort.
+        """
+        query, base_col_names, extra_col_names = DatabaseService.build_rows_query(
+            session, model, filters=filters, search_value=search_value, scope=scope
+        )
+
+        # --- Count records after filtering ---
+        # Scoped counts differ per user, so they never go to the unfiltered count cache
+        is_filtered = bool(search_value) or bool(scope) or any(filters.values() if filters else [])
+        filtered_count = DatabaseService.count_rows(session, query, model, count_strategy, is_filtered)
+
+        sort_column = DatabaseService.get_sort_column(model, sort_column_index)
+        key_column = inspect(model).primary_key[0]
+        descending = sort_order.lower() == "desc"
+        sort_name = sort_column.name if sort_column is not None else None
+        # Compare and store the sort value as the database orders it (stored text for SQLite dates)
+        sort_expr = sort_key(sort_column, session.get_bind().dialect.name) if sort_column is not None else None
+        if sort_expr is not None:
+            query = query.add_columns(sort_expr.label("keyset_sort_value"))
+
+        direction = "next"
+        if cursor:
+            direction, sort_value, key_value = _decode_cursor(
+                cursor, sort_column, sort_order, key_column, raw_sort_value=sort_expr is not sort_column
+            )
+            query = query.filter(
+                _keyset_filter(sort_expr, key_column, sort_value, key_value, descending, reverse=direction == "prev")
+            )
+
+        # Walk backwards by reversing the order, then flip the page back below.
+        query = query.order_by(*_keyset_order(sort_expr, key_column, descending, reverse=direction == "prev"))
+        rows = query.limit(length + 1).all()
+
+        has_more = len(rows) > length
+        rows = rows[:length]
+        if direction == "next":
+            has_next, has_prev = has_more, bool(cursor)
+        else:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+
+        result = DatabaseService.rows_to_dicts(rows, base_col_names, extra_col_names)
+        if filtered_count is None:
+            filtered_count = len(result) + (1 if has_next else 0)
+
+        # rows_to_dicts leaves out the trailing keyset_sort_value column
+        next_cursor = prev_cursor = None
+        if result:
+            if has_next:
+                next_cursor = _encode_cursor("next", sort_name, sort_order, rows[-1][-1] if sort_name else None, result[-1][key_column.name])
+            if has_prev:
+                prev_cursor = _encode_cursor("prev", sort_name, sort_order, rows[0][-1] if sort_name else None, result[0][key_column.name])
+
+        return result, filtered_count, next_cursor, prev_cursor
+
 
 
 
@@ -200,6 +506,45 @@ class DatabaseService:
 
 
 
+    @staticmethod
+    def iter_model_rows(
+        session: Session,
+        model,
+        filters: Dict[str, Any] = None,  # Column-specific filters
+        search_value: str = "",          # Full-table search value
+        sort_column_index: Optional[int] = None,
+        sort_order: str = "asc",
+        batch_size: int = EXPORT_BATCH_SIZE,
+        scope: Optional[Dict[str, Iterable[str]]] = None,  # See `build_rows_query`
+    ) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+        """
+        Stream every row matched by the table filters and search, for exports.
+
+        Same query as `fetch_model_rows`, without pagination or count, read through a
+        server-side cursor (yield_per / stream_results) so memory stays flat however many
+        rows match. Rows are ordered like keyset pages (sort column, then primary key).
+
+        Returns:
+            tuple: The column names and a lazy iterator of row dictionaries; the query runs
+            when the iterator is first advanced.
+        """
+        query, base_col_names, extra_col_names = DatabaseService.build_rows_query(
+            session, model, filters=filters, search_value=search_value, scope=scope
+        )
+        sort_column = DatabaseService.get_sort_column(model, sort_column_index)
+        key_column = inspect(model).primary_key[0]
+        query = query.order_by(*_keyset_order(sort_column, key_column, sort_order.lower() == "desc"))
+
+        def rows():
+            result = session.execute(query.statement.execution_options(yield_per=batch_size))
+            try:
+                for batch in result.partitions():
+                    yield from DatabaseService.rows_to_dicts(batch, base_col_names, extra_col_names)
+            finally:
+                result.close()
+
+        return base_col_names + extra_col_names, rows()
+
     @staticmethod
     def get_all_models_as_dict():
         """
@@ -208,38 +553,17 @@ class DatabaseService:
         Returns:
             dict: Dictionary mapping model names to SQLAlchemy model classes.
         """
-        models_dict = {}
-        for mapper in Base.registry.mappers:  # Loop through all registered mappers
-            cls = mapper.class_
-            if isinstance(cls, DeclarativeMeta):  # Ensure it's a valid SQLAlchemy model
-                models_dict[cls.__tablename__] = cls
-        return models_dict
+        return ModelRegistry.get_all_models_as_dict()
 
     @staticmethod
     def get_all_models():
         """
-        Dynamically fetch all models with their `is_request` attribute and `request_menu_category`.
+        Fetch all models with their `is_request` attribute and `request_menu_category`.
 
         Returns:
             list: List of dictionaries with model metadata, including names, URLs, `is_request`, and `request_menu_category`.
         """
-        models_with_metadata = []
-        for mapper in Base.registry.mappers:  # Loop through all registered mappers
-            cls = mapper.class_
-            if isinstance(cls, DeclarativeMeta):  # Ensure it's a valid SQLAlchemy model
-                is_request = getattr(cls, "is_request", False)
-                request_menu_category = getattr(cls, "request_menu_category", "")
-                frontend_table_name = getattr(cls, "frontend_table_name", "")
-                
-                models_with_metadata.append({
-                    "name": cls.__tablename__.replace("_", " ").capitalize(),
-                    "url": f"/{cls.__tablename__}",
-                    "model_name": cls.__tablename__,
-                    "is_request": is_request,
-                    "request_menu_category": request_menu_category,
-                    "frontend_table_name": frontend_table_name
-                })
-        return models_with_metadata
+        return ModelRegistry.get_all_models()
 
     @staticmethod
     def gather_model_metadata(
@@ -262,14 +586,26 @@ class DatabaseService:
 
         Returns:
             dict: A dictionary containing metadata (columns, form fields, relationships, etc.).
+                Top-level calls return a cached, read-only FrozenDict (lists become tuples).
         """
-        logger.info(f"Fetching data for model: {model}")
-
         # 1) Setup / prevent loops
         if not model:
             raise ValueError("Model cannot be None.")
         if visited_models is None:
-            visited_models = set()
+            cache_key = (model, form_name, max_depth)
+            metadata = _model_metadata_cache.get(cache_key)
+            if metadata is None:
+                logger.info(f"Building metadata for model: {model.__name__} (form: {form_name}, depth: {max_depth})")
+                metadata = _freeze(DatabaseService.gather_model_metadata(
+                    model=model,
+                    session=session,
+                    form_name=form_name,
+                    visited_models=set(),
+                    max_depth=max_depth,
+                ))
+                with _model_metadata_lock:
+                    metadata = _model_metadata_cache.setdefault(cache_key, metadata)
+            return metadata
 
         # If we've visited this model class already, return a minimal marker
         if model in visited_models:
@@ -353,10 +689,29 @@ class DatabaseService:
         return metadata
 
 
+    @staticmethod
+    def warm_model_metadata(models, form_names=METADATA_FORM_NAMES) -> int:
+        """
+        Build the cached metadata of the given models for every form the UI renders.
+
+        Args:
+            models: Iterable of SQLAlchemy model classes.
+            form_names: Form names to build metadata for (None is the plain table view).
+
+        Returns:
+            int: Number of cached metadata entries.
+        """
+        for model in models:
+            for form_name in form_names:
+                DatabaseService.gather_model_metadata(model, None, form_name)
+        return len(_model_metadata_cache)
+
+    @staticmethod
+    def clear_model_metadata_cache() -> None:
+        """Drop every cached gather_model_metadata result."""
+        with _model_metadata_lock:
+            _model_metadata_cache.clear()
+
     @staticmethod
     def get_model_by_tablename(table_name: str):
-        for cls in Base.__subclasses__():
-            if cls.__tablename__ == table_name.lower():
-                logger.info(f"Model found: {cls.__name__}")
-                return cls
-        return None
+        return ModelRegistry.get_model_by_tablename(table_name)
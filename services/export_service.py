@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from database import SessionLocal
+from services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+}
+
+# Bytes buffered before a chunk is sent to the client.
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _export_value(value: Any) -> Any:
+    """Datetimes as shown in the table view; everything else as is."""
+    return value.strftime('%Y-%m-%d %H:%M:%S') if isinstance(value, datetime) else value
+
+
+class ExportService:
+    @staticmethod
+    def media_type(export_format: str, compress: bool = False) -> str:
+        return "application/gzip" if compress else EXPORT_FORMATS[export_format][0]
+
+    @staticmethod
+    def file_name(model_name: str, export_format: str, compress: bool = False) -> str:
+        return f"{model_name}-{datetime.now():%Y%m%d%H%M%S}{EXPORT_FORMATS[export_format][1]}" + (".gz" if compress else "")
+
+    @staticmethod
+    def encode_rows(rows: Iterable[Dict[str, Any]], columns: List[str], export_format: str) -> Iterator[str]:
+        """Encode rows as CSV (with a header row) or NDJSON, yielding text in chunks of about EXPORT_CHUNK_SIZE."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(columns)
+        for row in rows:
+            if export_format == "csv":
+                writer.writerow([_export_value(row.get(column)) for column in columns])
+            else:
+                buffer.write(json.dumps({column: _export_value(row.get(column)) for column in columns}, default=str))
+                buffer.write("\n")
+
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Gzip a byte stream incrementally (one gzip member, nothing held beyond the compressor window)."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def stream_export(
+        model,
+        export_format: str,
+        compress: bool = False,
+        filters: Dict[str, Any] = None,
+        search_value: str = "",
+        sort_column_index: Optional[int] = None,
+        sort_order: str = "asc",
+        scope: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Stream a filtered table export for a StreamingResponse.
+
+        Uses its own session: the request's session is closed once the response starts,
+        while this generator keeps reading until the last row has been sent.
+
+        Args:
+            model: The SQLAlchemy model to export.
+            export_format (str): "csv" or "ndjson".
+            compress (bool): Gzip the output.
+            filters, search_value, sort_column_index, sort_order, scope: As for `DatabaseService.fetch_model_rows`.
+
+        Returns:
+            Iterator[bytes]: The encoded (and optionally gzipped) export.
+        """
+        session = SessionLocal()
+        row_count = 0
+        try:
+            columns, rows = DatabaseService.iter_model_rows(
+                session,
+                model,
+                filters=filters,
+                search_value=search_value,
+                sort_column_index=sort_column_index,
+                sort_order=sort_order,
+                scope=scope,
+            )
+
+            def counted():
+                nonlocal row_count
+                for row in rows:
+                    row_count += 1
+                    yield row
+
+            chunks = (text.encode("utf-8") for text in ExportService.encode_rows(counted(), columns, export_format))
+            yield from ExportService.gzip_chunks(chunks) if compress else chunks
+            logger.info(f"Exported {row_count} rows from {model.__tablename__} as {export_format}{' (gzip)' if compress else ''}")
+        except Exception:
+            # Headers are already sent, so the client only sees a truncated file
+            logger.error(f"Export of {model.__tablename__} failed after {row_count} rows", exc_info=True)
+            raise
+        finally:
+            session.close()
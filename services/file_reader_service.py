@@ -0,0 +1,258 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import zipfile
+import zlib
+from datetime import date, datetime
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Rows read per Parquet record batch.
+PARQUET_BATCH_SIZE = 10000
+
+# Raised by the readers for a malformed upload: undecodable text (UnicodeDecodeError) or Parquet
+# data (ArrowInvalid) are ValueErrors, a bad or truncated gzip stream is an OSError, EOFError or
+# zlib.error, and a broken XLSX archive is a BadZipFile, KeyError (missing part) or XML SyntaxError.
+# The readers only read the upload itself, so these are reported as a bad file rather than a server error.
+READ_ERRORS = (ValueError, OSError, EOFError, zlib.error, zipfile.BadZipFile, KeyError, SyntaxError, csv.Error)
+
+
+class RowReader:
+    """
+    Rows of an uploaded file as dicts of strings keyed by header, like csv.DictReader
+    (`fieldnames` plus iteration), whatever the file format.
+    """
+
+    def __init__(self, fieldnames: Optional[List[str]], rows: Iterable[dict], close: Optional[Callable[[], None]] = None):
+        self.fieldnames = fieldnames
+        self._rows = rows
+        self._close = close
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._rows)
+
+    def close(self) -> None:
+        """Release the reader without closing the underlying upload."""
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+def _to_text(value) -> str:
+    """Cell values from typed formats as the strings a CSV file would contain."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "Y" if value else "N"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # Spreadsheets store whole numbers as floats
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _read_error(file_format: str, error: Exception) -> HTTPException:
+    if isinstance(error, UnicodeDecodeError):
+        reason = "it is not UTF-8 encoded text"
+    else:
+        reason = str(error) or type(error).__name__
+    return HTTPException(status_code=400, detail=f"Could not read the {file_format} file: {reason}")
+
+
+def _checked_rows(rows: Iterable[dict], file_format: str) -> Iterator[dict]:
+    """The rows of a reader, with errors from a file corrupted past its header reported as a 400."""
+    try:
+        yield from rows
+    except READ_ERRORS as e:
+        raise _read_error(file_format, e) from e
+
+
+def _text_rows(text: io.TextIOWrapper) -> RowReader:
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames  # Reads the header line
+    except Exception:
+        text.detach()
+        raise
+    # Detach so releasing the reader does not close the upload
+    return RowReader(fieldnames, reader, lambda: text.detach())
+
+
+def _read_csv(file: BinaryIO) -> RowReader:
+    return _text_rows(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+
+
+def _read_csv_gz(file: BinaryIO) -> RowReader:
+    # GzipFile does not close a file object it was given
+    return _text_rows(io.TextIOWrapper(gzip.GzipFile(fileobj=file, mode="rb"), encoding="utf-8-sig", newline=""))
+
+
+def _parse_record(line: str, line_number: int) -> dict:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid NDJSON record {line_number}: {e}")
+    if not isinstance(record, dict):
+        raise HTTPException(status_code=400, detail=f"NDJSON record {line_number} is not an object")
+    return record
+
+
+def _read_ndjson(file: BinaryIO) -> RowReader:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig")
+    lines = (line for line in text if line.strip())
+    try:
+        first = next(lines, None)
+    except Exception:
+        text.detach()
+        raise
+    if first is None:
+        return RowReader(None, [], lambda: text.detach())
+    try:
+        first = _parse_record(first, 1)
+    except Exception:
+        text.detach()
+        raise
+
+    def rows():
+        yield {key: _to_text(value) for key, value in first.items()}
+        for line_number, line in enumerate(lines, start=2):
+            yield {key: _to_text(value) for key, value in _parse_record(line, line_number).items()}
+
+    # Headers are the keys of the first record
+    return RowReader(list(first), rows(), lambda: text.detach())
+
+
+def _read_xlsx(file: BinaryIO) -> RowReader:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise HTTPException(status_code=400, detail="XLSX uploads require the openpyxl package on the server.")
+
+    # read_only streams the sheet XML instead of building the whole workbook in memory
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    values = workbook.active.iter_rows(values_only=True)
+    header = next(values, None)
+    if header is None:
+        return RowReader(None, [], workbook.close)
+    fieldnames = [_to_text(name) for name in header]
+
+    def rows():
+        for record in values:
+            if all(value is None for value in record):
+                continue  # Formatted but empty rows
+            yield {name: _to_text(value) for name, value in zip(fieldnames, record)}
+
+    return RowReader(fieldnames, rows(), workbook.close)
+
+
+def _read_parquet(file: BinaryIO) -> RowReader:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise HTTPException(status_code=400, detail="Parquet uploads require the pyarrow package on the server.")
+
+    parquet_file = pq.ParquetFile(file)
+
+    def rows():
+        for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+            for record in batch.to_pylist():
+                yield {key: _to_text(value) for key, value in record.items()}
+
+    return RowReader(parquet_file.schema_arrow.names, rows(), parquet_file.close)
+
+
+# File suffix -> reader; add an entry to support another format. The longest matching suffix wins.
+FILE_READERS: Dict[str, Callable[[BinaryIO], RowReader]] = {
+    ".csv": _read_csv,
+    ".csv.gz": _read_csv_gz,
+    ".ndjson": _read_ndjson,
+    ".jsonl": _read_ndjson,
+    ".xlsx": _read_xlsx,
+    ".parquet": _read_parquet,
+}
+
+
+class FileReaderService:
+    @staticmethod
+    def detect_format(filename: Optional[str]) -> str:
+        """
+        Return the FILE_READERS suffix matching a file name.
+
+        Raises:
+            HTTPException: 400 if no reader handles the file type.
+        """
+        name = (filename or "").lower()
+        for suffix in sorted(FILE_READERS, key=len, reverse=True):
+            if name.endswith(suffix):
+                return suffix
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Supported types: {', '.join(FILE_READERS)}",
+        )
+
+    @staticmethod
+    def open(file: BinaryIO, file_format: str) -> RowReader:
+        """
+        Read a seekable binary file as rows of strings without loading it into memory.
+
+        Args:
+            file (BinaryIO): The upload (or a temp file copy of it).
+            file_format (str): A FILE_READERS suffix, see detect_format.
+
+        Returns:
+            RowReader: fieldnames plus the rows; close() it to read the file again after a seek(0).
+
+        Raises:
+            HTTPException: 400 if the file cannot be read as `file_format` (raised while iterating
+                if the damage comes after the header).
+        """
+        try:
+            reader = FILE_READERS[file_format](file)
+        except READ_ERRORS as e:
+            logger.info(f"Unreadable {file_format} upload: {e}")
+            raise _read_error(file_format, e) from e
+        return RowReader(reader.fieldnames, _checked_rows(reader, file_format), reader.close)
+
+    @staticmethod
+    def estimate_row_count(path: str, file_format: str) -> Optional[int]:
+        """
+        Rows in a saved upload, without parsing it, for progress reporting.
+        Text formats count line breaks (quoted multi-line CSV values are over-counted);
+        gzip CSV is decompressed once for the count, without being parsed.
+
+        Returns:
+            int: Estimated number of data rows, or None if it cannot be told cheaply (or the file
+                is damaged; reading it reports that).
+        """
+        try:
+            if file_format in (".csv", ".csv.gz", ".ndjson", ".jsonl"):
+                lines = 0
+                last = b"\n"
+                with (gzip.open if file_format == ".csv.gz" else open)(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        lines += block.count(b"\n")
+                        last = block[-1:]
+                if last != b"\n":
+                    lines += 1  # No trailing line break after the last row
+                return max(lines - 1, 0) if file_format in (".csv", ".csv.gz") else lines
+            if file_format == ".parquet":
+                import pyarrow.parquet as pq
+                return pq.ParquetFile(path).metadata.num_rows
+            if file_format == ".xlsx":
+                from openpyxl import load_workbook
+                workbook = load_workbook(path, read_only=True)
+                try:
+                    return max((workbook.active.max_row or 1) - 1, 0)
+                finally:
+                    workbook.close()
+        except Exception:
+            logger.debug(f"Could not estimate the rows of {path}", exc_info=True)
+        return None
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Optional
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.import_record import (
+    IMPORT_STATUS_COMPLETED,
+    IMPORT_STATUS_FAILED,
+    IMPORT_STATUS_IN_PROGRESS,
+    IMPORT_STATUS_PARTIAL,
+    ImportRecord,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per block while hashing or copying an upload.
+HASH_BLOCK_SIZE = 1 << 20
+
+# An import still IN_PROGRESS after this long is assumed dead (e.g. the server restarted) and may be retried.
+IMPORT_CLAIM_TIMEOUT = timedelta(hours=1)
+
+
+class ImportDedupService:
+    @staticmethod
+    def hash_file(file: BinaryIO) -> str:
+        """SHA-256 of a seekable file, read block by block; the file is rewound afterwards."""
+        digest = hashlib.sha256()
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+        file.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def copy_and_hash(source: BinaryIO, target: BinaryIO) -> str:
+        """Copy `source` into `target` and return the SHA-256 of the bytes copied, in one pass."""
+        digest = hashlib.sha256()
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+            target.write(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def find_completed(session: Session, model, content_hash: str) -> Optional[ImportRecord]:
+        """The completed import of the same file into the same model, if there is one."""
+        return session.execute(
+            select(ImportRecord).where(
+                ImportRecord.model_name == model.__tablename__,
+                ImportRecord.content_hash == content_hash,
+                ImportRecord.status == IMPORT_STATUS_COMPLETED,
+            )
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def claim(session: Session, model, content_hash: str, user_name: str, file_name: Optional[str] = None):
+        """
+        Record that this file is being imported, so a concurrent or later re-upload does not import it again.
+        Commits at once (the unique (model_name, content_hash) constraint arbitrates between racing uploads).
+
+        Returns:
+            tuple: (record, completed). `completed` is True if the file had already been imported,
+                in which case the record holds the original group_id and row_count.
+
+        Raises:
+            HTTPException: 409 if the same file is being imported right now.
+        """
+        for _ in range(2):
+            record = session.execute(
+                select(ImportRecord).where(
+                    ImportRecord.model_name == model.__tablename__,
+                    ImportRecord.content_hash == content_hash,
+                )
+            ).scalar_one_or_none()
+
+            if record is not None:
+                if record.status == IMPORT_STATUS_COMPLETED:
+                    return record, True
+                if record.status == IMPORT_STATUS_IN_PROGRESS and datetime.now() - record.started_timestamp < IMPORT_CLAIM_TIMEOUT:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"This file is already being imported (started {record.started_timestamp:%Y-%m-%d %H:%M:%S}).",
+                    )
+                # Failed, partial or abandoned: retry it under the same record (see resume_point)
+                record.status = IMPORT_STATUS_IN_PROGRESS
+                record.user_name = user_name
+                record.file_name = file_name
+                record.started_timestamp = datetime.now()
+                record.completed_timestamp = None
+                session.commit()
+                return record, False
+
+            record = ImportRecord(
+                model_name=model.__tablename__,
+                content_hash=content_hash,
+                status=IMPORT_STATUS_IN_PROGRESS,
+                user_name=user_name,
+                file_name=file_name,
+                started_timestamp=datetime.now(),
+            )
+            session.add(record)
+            try:
+                session.commit()
+                return record, False
+            except IntegrityError:
+                # Another upload of the same file claimed it first; look again
+                session.rollback()
+        raise HTTPException(status_code=409, detail="This file is already being imported.")
+
+    @staticmethod
+    def complete(session: Session, record: ImportRecord, result: dict) -> None:
+        record.status = IMPORT_STATUS_COMPLETED
+        record.group_id = result["group_id"]
+        record.row_count = result["row_count"]
+        record.skipped_rows = result.get("skipped_rows", 0)
+        record.completed_timestamp = datetime.now()
+        session.commit()
+
+    @staticmethod
+    def checkpoint(record: ImportRecord, progress: dict) -> None:
+        """
+        Note the rows imported so far (group_id, row_count, skipped_rows) on the record. Not
+        committed here: the caller commits it with the batch, so it always matches the stored rows.
+        """
+        record.group_id = progress["group_id"]
+        record.row_count = progress["row_count"]
+        record.skipped_rows = progress["skipped_rows"]
+
+    @staticmethod
+    def resume_point(record: ImportRecord) -> Optional[Dict[str, object]]:
+        """The progress committed by an earlier partial attempt at this import, or None to start afresh."""
+        if record.group_id is None:
+            return None
+        return {"group_id": record.group_id, "row_count": record.row_count or 0, "skipped_rows": record.skipped_rows or 0}
+
+    @staticmethod
+    def fail(session: Session, record: ImportRecord) -> None:
+        """
+        Mark the import failed. If nothing was committed the claim is released, so the file can be
+        uploaded again; if batches were (see checkpoint), the record stays PARTIAL and a re-upload
+        resumes after them instead of importing them twice.
+        """
+        try:
+            record.status = IMPORT_STATUS_PARTIAL if record.group_id is not None else IMPORT_STATUS_FAILED
+            record.completed_timestamp = datetime.now()
+            session.commit()
+        except Exception:
+            session.rollback()
+            logger.error(f"Could not mark import {record.import_id} as failed", exc_info=True)
+
+    @staticmethod
+    def to_result(record: ImportRecord) -> dict:
+        """The original result of a completed import, as returned for a duplicate upload."""
+        return {
+            "group_id": record.group_id,
+            "row_count": record.row_count,
+            "skipped_rows": record.skipped_rows or 0,
+            "duplicate": True,
+        }
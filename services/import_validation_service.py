@@ -0,0 +1,175 @@
+import csv
+import io
+import logging
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import Integer, String
+from sqlalchemy.inspection import inspect
+
+from models.request import RmsRequest
+
+logger = logging.getLogger(__name__)
+
+# Rows transposed into columns at a time; keeps memory flat for large files.
+VALIDATION_BATCH_SIZE = 5000
+
+# Distinct values remembered per column; high-cardinality columns (names, ids) start over past it.
+MAX_MEMO_VALUES = 10000
+
+# Errors returned inline (the CSV report always has all of them).
+MAX_INLINE_ERRORS = 100
+
+REPORT_HEADERS = ["row", "column", "value", "error"]
+
+# Columns popped into the RmsRequest by create_rms_request and validated by its hooks.
+REQUEST_COLUMNS = ("effort", "organization", "sub_organization", "line_of_business", "team", "decision_engine")
+
+
+def _column_check(model, column) -> Callable[[str], Optional[str]]:
+    """
+    Build the check for one column: required, options (per item for multi-select), integer
+    coercion, String(n) length and finally the model's own @validates hook. Returns the
+    error message for a value, or None if it is valid.
+    """
+    info = column.info or {}
+    required = info.get("required", False)
+    options = set(info["options"]) if info.get("options") else None
+    multi_select = info.get("multi_select", False)
+    is_integer = isinstance(column.type, Integer)
+    max_length = column.type.length if isinstance(column.type, String) else None
+    has_default = column.default is not None
+    validator = inspect(model).validators.get(column.key)
+
+    def check(value: str) -> Optional[str]:
+        value = "" if value is None else value
+        if value.strip() == "":
+            if required:
+                return "is required"
+            if has_default:
+                return None  # Left to the column default by the import
+        else:
+            if is_integer:
+                try:
+                    int(value)
+                except ValueError:
+                    return f"must be an integer, got '{value}'"
+            if options is not None:
+                items = [item.strip() for item in value.split(",")] if multi_select else [value]
+                invalid = [item for item in items if item not in options]
+                if invalid:
+                    return f"must be one of {sorted(options)}, got '{', '.join(invalid)}'"
+            if max_length is not None and len(value) > max_length:
+                return f"cannot exceed {max_length} characters"
+
+        if validator is not None:
+            try:
+                # The hooks only look at (key, value), so they are called without an instance
+                validator[0](None, column.key, value)
+            except (ValueError, TypeError) as e:
+                return str(e)
+        return None
+
+    return check
+
+
+class ImportValidationService:
+    @staticmethod
+    def build_checks(model, headers: List[str], is_request: bool) -> Dict[str, Callable[[str], Optional[str]]]:
+        """
+        Checks for every file column the import will use.
+
+        Args:
+            model: Target SQLAlchemy model class.
+            headers (List[str]): Column headers of the file.
+            is_request (bool): Whether the request columns go to RmsRequest.
+
+        Returns:
+            dict: header -> check(value) returning an error message or None.
+        """
+        columns = {}
+        for column in inspect(model).columns:
+            columns[column.name] = (model, column)
+            if "field_name" in (column.info or {}):
+                columns[column.info["field_name"]] = (model, column)
+        if is_request:
+            for name in REQUEST_COLUMNS:
+                columns[name] = (RmsRequest, RmsRequest.__table__.columns[name])
+
+        return {header: _column_check(*columns[header]) for header in headers if header in columns}
+
+    @staticmethod
+    def validate_rows(
+        model,
+        rows: Iterable[dict],
+        headers: List[str],
+        is_request: bool,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+    ) -> Iterator[dict]:
+        """
+        Validate rows column by column before anything is inserted. Each distinct value is
+        checked once per column, so repeated option values cost a dictionary lookup.
+
+        Args:
+            model: Target SQLAlchemy model class.
+            rows (Iterable[dict]): Rows keyed by header; consumed lazily in batches.
+            headers (List[str]): Column headers of the file.
+            is_request (bool): Whether the request columns go to RmsRequest.
+            batch_size (int): Rows transposed into columns at a time.
+
+        Yields:
+            dict: One error per invalid cell: row (1-based data row), column, value and error.
+        """
+        checks = ImportValidationService.build_checks(model, headers, is_request)
+        results: Dict[str, Dict[str, Optional[str]]] = {header: {} for header in checks}
+        first_row = 1
+        batch: List[dict] = []
+
+        def validate_batch() -> List[Tuple[int, str, str, str]]:
+            errors = []
+            for header, check in checks.items():
+                seen = results[header]
+                for offset, value in enumerate(row.get(header) for row in batch):
+                    key = "" if value is None else value
+                    if key not in seen:
+                        if len(seen) >= MAX_MEMO_VALUES:
+                            seen.clear()
+                        seen[key] = check(key)
+                    if seen[key] is not None:
+                        errors.append((first_row + offset, header, key, seen[key]))
+            errors.sort(key=lambda error: error[0])
+            return errors
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                for row_number, header, value, message in validate_batch():
+                    yield {"row": row_number, "column": header, "value": value, "error": message}
+                first_row += len(batch)
+                batch = []
+        if batch:
+            for row_number, header, value, message in validate_batch():
+                yield {"row": row_number, "column": header, "value": value, "error": message}
+
+    @staticmethod
+    def summarize(errors: Iterable[dict], limit: int = MAX_INLINE_ERRORS) -> dict:
+        """Count all errors and keep the first `limit` of them."""
+        error_count = 0
+        first_errors = []
+        for error in errors:
+            error_count += 1
+            if len(first_errors) < limit:
+                first_errors.append(error)
+        return {"error_count": error_count, "errors": first_errors}
+
+    @staticmethod
+    def report_csv(errors: Iterable[dict]) -> Iterator[str]:
+        """Render errors as CSV text chunks (header line first)."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=REPORT_HEADERS)
+        writer.writeheader()
+        for error in errors:
+            writer.writerow(error)
+            if buffer.tell() > 65536:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
@@ -0,0 +1,314 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from core.job_errors import JobCancelled, JobFailed
+from database import SessionLocal, engine
+from models.job import (
+    JOB_ACTIVE_STATUSES,
+    JOB_STATUS_CANCELLED,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCEEDED,
+    Job,
+)
+
+logger = logging.getLogger(__name__)
+
+# Jobs executed at the same time; each one holds a database connection while it runs.
+JOB_WORKERS = 2
+
+# Minimum seconds between two progress writes of the same job.
+JOB_PROGRESS_INTERVAL = 1.0
+
+# Error messages kept per job (error_count keeps counting past it).
+JOB_MAX_ERRORS = 100
+
+# SQLite allows one writer at a time, so progress writes would wait on the job's own open
+# transaction; there (single-process local mode) live progress is only kept in memory.
+PERSIST_PROGRESS = engine.dialect.name != "sqlite"
+
+
+class JobContext:
+    """
+    Handed to a running job handler to report progress and errors.
+
+    Live progress is kept on the context (read by /jobs/{job_id} in this process) and, when
+    PERSIST_PROGRESS, written in its own short transaction so the job's work session can keep
+    one long transaction open. Each write also reads cancel_requested back, so cancellation
+    from any process takes effect at the next progress report by raising JobCancelled.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.processed_rows = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+        self.cancel_requested = False
+        self._last_write = 0.0
+
+    def add_error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < JOB_MAX_ERRORS:
+            self.errors.append(message)
+
+    def progress(self, processed_rows: int, force: bool = False) -> None:
+        """
+        Record the number of rows processed so far.
+
+        Args:
+            processed_rows (int): Rows processed since the job started.
+            force (bool): Persist even if the last write was less than JOB_PROGRESS_INTERVAL ago.
+
+        Raises:
+            JobCancelled: If a cancellation was requested for this job.
+        """
+        self.processed_rows = processed_rows
+        now = time.monotonic()
+        if PERSIST_PROGRESS and (force or now - self._last_write >= JOB_PROGRESS_INTERVAL):
+            self._last_write = now
+            self._write()
+        if self.cancel_requested:
+            raise JobCancelled(f"Job {self.job_id} was cancelled after {processed_rows} rows")
+
+    def _write(self) -> None:
+        with SessionLocal() as session:
+            cancel_requested = session.execute(
+                update(Job)
+                .where(Job.job_id == self.job_id)
+                .values(
+                    processed_rows=self.processed_rows,
+                    error_count=self.error_count,
+                    errors=json.dumps(self.errors),
+                )
+                .returning(Job.cancel_requested)
+            ).scalar()
+            session.commit()
+        self.cancel_requested = self.cancel_requested or bool(cancel_requested)
+
+
+class JobService:
+    _executor: Optional[ThreadPoolExecutor] = None
+    _running: Dict[str, JobContext] = {}  # job_id -> context of the jobs running in this process
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        with JobService._lock:
+            if JobService._executor is None:
+                JobService._executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+            return JobService._executor
+
+    @staticmethod
+    def submit(
+        session: Session,
+        job_type: str,
+        user_name: str,
+        handler: Callable,
+        *args,
+        total_rows: Optional[int] = None,
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> Job:
+        """
+        Record a new job and queue it on the worker pool.
+
+        Args:
+            session (Session): SQLAlchemy session used to insert the job row.
+            job_type (str): Short job name, e.g. "bulk_import".
+            user_name (str): Submitting user.
+            handler (Callable): Called as handler(session, context, *args) on a worker thread with
+                its own session; its (JSON-serializable) return value is stored as the job result.
+            total_rows (int, optional): Expected number of rows, used for percent done and ETA.
+            cleanup (Callable, optional): Called once the job has finished, whatever the outcome
+                (e.g. to delete the uploaded temp file).
+
+        Returns:
+            Job: The queued job.
+        """
+        job = Job(job_type=job_type, user_name=user_name, status=JOB_STATUS_QUEUED, total_rows=total_rows)
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+
+        JobService._get_executor().submit(JobService._run, job.job_id, handler, args, cleanup)
+        logger.info(f"Queued {job_type} job {job.job_id} for {user_name}")
+        return job
+
+    @staticmethod
+    def _finish(job_id: str, status: str, context: JobContext, result=None) -> None:
+        with SessionLocal() as session:
+            session.execute(
+                update(Job)
+                .where(Job.job_id == job_id)
+                .values(
+                    status=status,
+                    processed_rows=context.processed_rows,
+                    error_count=context.error_count,
+                    errors=json.dumps(context.errors),
+                    result=json.dumps(result, default=str) if result is not None else None,
+                    finished_timestamp=datetime.now(),
+                )
+            )
+            session.commit()
+
+    @staticmethod
+    def _run(job_id: str, handler: Callable, args: tuple, cleanup: Optional[Callable[[], None]]) -> None:
+        context = JobContext(job_id)
+        try:
+            # Claim the job; it may have been cancelled while it was queued.
+            with SessionLocal() as session:
+                claimed = session.execute(
+                    update(Job)
+                    .where(Job.job_id == job_id, Job.status == JOB_STATUS_QUEUED, Job.cancel_requested.is_(False))
+                    .values(status=JOB_STATUS_RUNNING, started_timestamp=datetime.now())
+                ).rowcount
+                session.commit()
+            if not claimed:
+                logger.info(f"Job {job_id} was cancelled before it started")
+                return
+
+            with JobService._lock:
+                JobService._running[job_id] = context
+            session = SessionLocal()
+            try:
+                result = handler(session, context, *args)
+            finally:
+                session.close()
+            JobService._finish(job_id, JOB_STATUS_SUCCEEDED, context, result)
+            logger.info(f"Job {job_id} finished: {context.processed_rows} rows")
+        except JobCancelled as e:
+            logger.info(str(e))
+            JobService._finish(job_id, JOB_STATUS_CANCELLED, context)
+        except JobFailed as e:
+            logger.info(f"Job {job_id} failed: {e}")
+            JobService._finish(job_id, JOB_STATUS_FAILED, context)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=not isinstance(e, HTTPException))
+            context.add_error(e.detail if isinstance(e, HTTPException) else str(e))
+            try:
+                JobService._finish(job_id, JOB_STATUS_FAILED, context)
+            except Exception:
+                logger.error(f"Could not record the failure of job {job_id}", exc_info=True)
+        finally:
+            with JobService._lock:
+                JobService._running.pop(job_id, None)
+            if cleanup is not None:
+                try:
+                    cleanup()
+                except Exception:
+                    logger.warning(f"Cleanup of job {job_id} failed", exc_info=True)
+
+    @staticmethod
+    def get_job(session: Session, job_id: str, user) -> Job:
+        """
+        Fetch a job visible to `user` (its submitter, or an Admin).
+
+        Raises:
+            HTTPException: 404 if the job does not exist or belongs to another user.
+        """
+        job = session.get(Job, job_id)
+        if job is None or (job.user_name != user.user_name and "Admin" not in user.role_set):
+            raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+        return job
+
+    @staticmethod
+    def cancel(session: Session, job_id: str, user) -> Job:
+        """
+        Request cancellation. Queued jobs are cancelled at once; running jobs stop at their next
+        progress report (what an import already committed in "chunk" mode is kept).
+
+        Raises:
+            HTTPException: 404 if the job is not visible to `user`, 409 if it has already finished.
+        """
+        job = JobService.get_job(session, job_id, user)
+        if job.status not in JOB_ACTIVE_STATUSES:
+            raise HTTPException(status_code=409, detail=f"Job '{job_id}' has already finished ({job.status})")
+
+        job.cancel_requested = True
+        with JobService._lock:
+            context = JobService._running.get(job_id)
+        if context is not None:
+            context.cancel_requested = True
+        if job.status == JOB_STATUS_QUEUED:
+            job.status = JOB_STATUS_CANCELLED
+            job.finished_timestamp = datetime.now()
+        session.commit()
+        session.refresh(job)
+        return job
+
+    @staticmethod
+    def fail_interrupted_jobs(session: Session) -> int:
+        """
+        Mark jobs left queued or running by a previous process as failed. Call at startup,
+        before any job is submitted (the worker pool lives in this process only).
+
+        Returns:
+            int: Number of jobs marked as failed.
+        """
+        count = session.execute(
+            update(Job)
+            .where(Job.status.in_(JOB_ACTIVE_STATUSES))
+            .values(
+                status=JOB_STATUS_FAILED,
+                error_count=Job.error_count + 1,
+                errors=json.dumps(["Interrupted by a server restart"]),
+                finished_timestamp=datetime.now(),
+            )
+        ).rowcount
+        session.commit()
+        if count:
+            logger.warning(f"Marked {count} interrupted jobs as failed")
+        return count
+
+    @staticmethod
+    def shutdown(wait: bool = False) -> None:
+        with JobService._lock:
+            executor, JobService._executor = JobService._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    @staticmethod
+    def to_dict(job: Job) -> Dict[str, object]:
+        """Serialize a job with its percent done and an ETA extrapolated from the rate so far."""
+        processed_rows, error_count = job.processed_rows, job.error_count
+        errors = json.loads(job.errors) if job.errors else []
+        with JobService._lock:
+            context = JobService._running.get(job.job_id)
+        if context is not None and job.status == JOB_STATUS_RUNNING:
+            # Running here: the context is fresher than the last persisted progress
+            processed_rows, error_count, errors = context.processed_rows, context.error_count, list(context.errors)
+
+        percent_done = None
+        eta_seconds = None
+        if job.total_rows:
+            percent_done = round(min(processed_rows / job.total_rows, 1.0) * 100, 1)
+            if job.status == JOB_STATUS_RUNNING and job.started_timestamp and processed_rows:
+                elapsed = (datetime.now() - job.started_timestamp).total_seconds()
+                remaining = max(job.total_rows - processed_rows, 0)
+                eta_seconds = round(elapsed / processed_rows * remaining, 1)
+
+        return {
+            "job_id": job.job_id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "user_name": job.user_name,
+            "total_rows": job.total_rows,
+            "processed_rows": processed_rows,
+            "percent_done": percent_done,
+            "eta_seconds": eta_seconds,
+            "error_count": error_count,
+            "errors": errors,
+            "result": json.loads(job.result) if job.result else None,
+            "cancel_requested": job.cancel_requested,
+            "created_timestamp": job.created_timestamp,
+            "started_timestamp": job.started_timestamp,
+            "finished_timestamp": job.finished_timestamp,
+        }
@@ -0,0 +1,72 @@
+import json
+import logging
+from typing import Callable, Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.performance_metric import PerformanceMetric
+from services.file_reader_service import FileReaderService
+
+logger = logging.getLogger(__name__)
+
+# Rows read between two progress reports.
+METRICS_PROGRESS_ROWS = 1000
+
+
+class PerformanceMetricService:
+    @staticmethod
+    def save_metrics(
+        session: Session,
+        group_id: str,
+        rows: Iterable[dict],
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Store the metric rows of a group as its JSON metrics document, replacing any previous upload.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            group_id (str): Group the metrics belong to.
+            rows (Iterable[dict]): Metric rows (e.g. a FileReaderService reader).
+            progress (Callable, optional): Called with the number of rows read every METRICS_PROGRESS_ROWS rows.
+
+        Returns:
+            int: Number of metric rows stored.
+
+        Raises:
+            HTTPException: 400 if there are no rows.
+        """
+        metrics_data = []
+        for row in rows:
+            metrics_data.append(row)
+            if progress is not None and len(metrics_data) % METRICS_PROGRESS_ROWS == 0:
+                progress(len(metrics_data))
+
+        if not metrics_data:
+            raise HTTPException(status_code=400, detail="File is empty or invalid")
+
+        # The metrics column only accepts a JSON string or a dict
+        metrics_json = json.dumps(metrics_data)
+        perf_metrics = session.query(PerformanceMetric).filter(PerformanceMetric.group_id == group_id).first()
+        if perf_metrics:
+            perf_metrics.metrics = metrics_json
+        else:
+            session.add(PerformanceMetric(group_id=group_id, metrics=metrics_json))
+        session.commit()
+        logger.debug(f"Stored {len(metrics_data)} performance metric rows for group {group_id}")
+        return len(metrics_data)
+
+    @staticmethod
+    def upload_file_job(session: Session, context, group_id: str, path: str, file_format: str) -> dict:
+        """
+        Background job handler (see JobService.submit): store the metrics file saved to `path`.
+
+        Returns:
+            dict: group_id and row_count.
+        """
+        with open(path, "rb") as f:
+            row_count = PerformanceMetricService.save_metrics(
+                session, group_id, FileReaderService.open(f, file_format), progress=context.progress
+            )
+        context.progress(row_count, force=True)
+        return {"group_id": group_id, "row_count": row_count}
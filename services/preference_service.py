@@ -0,0 +1,231 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.id_method import id_batch
+from models.user_preference import UserPreference
+
+logger = logging.getLogger(__name__)
+
+# Saves within this many seconds are written together (e.g. a burst of column toggles).
+PREFERENCE_FLUSH_DELAY = 2.0
+
+# Seconds a user's preferences are served from memory before they are read again
+# (other server processes may have changed them).
+PREFERENCE_CACHE_TTL = 300
+
+# user_name -> (expires_at on the monotonic clock, {preference_key: value})
+_preference_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Saved but not yet written, and being written: user_name -> {preference_key: value}
+_pending: Dict[str, Dict[str, Any]] = {}
+_in_flight: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _encode(value: Any) -> Tuple[str, bool]:
+    """Strings are stored as is; anything else as JSON, flagged so reads never have to guess."""
+    if isinstance(value, str):
+        return value, False
+    return json.dumps(value), True
+
+
+def _decode(value: Optional[str], is_json: Optional[bool]) -> Any:
+    if value is None or is_json is False:
+        return value
+    if is_json:
+        return json.loads(value)
+    # Saved before is_json existed: JSON was only ever written for dicts and lists
+    if value.startswith(("{", "[")):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+class PreferenceService:
+    @staticmethod
+    def get_preferences(session: Session, user_name: str) -> Dict[str, Any]:
+        """
+        All preferences of a user, decoded, including saves not yet written to the database.
+        Served from memory for PREFERENCE_CACHE_TTL seconds after the first read.
+        """
+        with _lock:
+            entry = _preference_cache.get(user_name)
+            if entry is not None and entry[0] > time.monotonic():
+                return dict(entry[1])
+
+        rows = session.execute(
+            select(UserPreference.preference_key, UserPreference.preference_value, UserPreference.is_json)
+            .where(UserPreference.user_name == user_name)
+        ).all()
+        preferences = {key: _decode(value, is_json) for key, value, is_json in rows}
+
+        with _lock:
+            # Saves made while the rows were read win over what was read
+            preferences.update(_in_flight.get(user_name, {}))
+            preferences.update(_pending.get(user_name, {}))
+            _preference_cache[user_name] = (time.monotonic() + PREFERENCE_CACHE_TTL, preferences)
+            return dict(preferences)
+
+    @staticmethod
+    def save_preferences(user_name: str, preferences: Dict[str, Any]) -> None:
+        """
+        Save preferences in memory and write them behind: every save made within
+        PREFERENCE_FLUSH_DELAY seconds goes to the database in one upsert. Reads see the new
+        values at once; a crash before the flush loses at most that window of changes.
+        """
+        global _flush_timer
+        with _lock:
+            _pending.setdefault(user_name, {}).update(preferences)
+            entry = _preference_cache.get(user_name)
+            if entry is not None:
+                entry[1].update(preferences)
+            if _flush_timer is None:
+                _flush_timer = threading.Timer(PREFERENCE_FLUSH_DELAY, PreferenceService.flush)
+                _flush_timer.daemon = True
+                _flush_timer.start()
+
+    @staticmethod
+    def flush() -> int:
+        """
+        Write every pending save with one upsert. Called by the write-behind timer and at shutdown;
+        on failure the saves are kept and retried after the next delay.
+
+        Returns:
+            int: Number of preferences written.
+        """
+        global _flush_timer
+        with _lock:
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+            if not _pending:
+                return 0
+            batch = {user_name: dict(values) for user_name, values in _pending.items()}
+            _pending.clear()
+            for user_name, values in batch.items():
+                _in_flight.setdefault(user_name, {}).update(values)
+
+        # Imported here so the preference cache does not need a database connection to be imported
+        from database import SessionLocal
+
+        session = SessionLocal()
+        try:
+            written = PreferenceService.upsert(session, batch)
+            session.commit()
+            logger.debug(f"Wrote {written} preferences for {len(batch)} users")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error writing user preferences, will retry: {e}", exc_info=True)
+            with _lock:
+                for user_name, values in batch.items():
+                    # Newer saves of the same keys are already pending and win
+                    _pending[user_name] = {**values, **_pending.get(user_name, {})}
+                    _in_flight.pop(user_name, None)
+                if _flush_timer is None:
+                    _flush_timer = threading.Timer(PREFERENCE_FLUSH_DELAY, PreferenceService.flush)
+                    _flush_timer.daemon = True
+                    _flush_timer.start()
+            return 0
+        finally:
+            session.close()
+
+        with _lock:
+            for user_name in batch:
+                _in_flight.pop(user_name, None)
+        return written
+
+    @staticmethod
+    def upsert(session: Session, preferences_by_user: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Insert or update preferences with a single INSERT ... ON CONFLICT (user_name, preference_key)
+        DO UPDATE statement (PostgreSQL and SQLite). Does not commit.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            preferences_by_user (dict): user_name -> {preference_key: value}.
+
+        Returns:
+            int: Number of preferences written.
+        """
+        rows = []
+        for user_name, preferences in preferences_by_user.items():
+            for key, value in preferences.items():
+                preference_value, is_json = _encode(value)
+                rows.append({
+                    "user_name": user_name,
+                    "preference_key": key,
+                    "preference_value": preference_value,
+                    "is_json": is_json,
+                })
+        if not rows:
+            return 0
+
+        insert = _UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            # No ON CONFLICT on this database: update, then insert what was missing
+            for row in rows:
+                updated = session.execute(
+                    update(UserPreference)
+                    .where(UserPreference.user_name == row["user_name"], UserPreference.preference_key == row["preference_key"])
+                    .values(preference_value=row["preference_value"], is_json=row["is_json"], last_updated=func.current_timestamp())
+                ).rowcount
+                if not updated:
+                    session.add(UserPreference(**row))
+            return len(rows)
+
+        for row, preference_id in zip(rows, id_batch(len(rows))):
+            row["id"] = preference_id
+        statement = insert(UserPreference).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserPreference.user_name, UserPreference.preference_key],
+            set_={
+                "preference_value": statement.excluded.preference_value,
+                "is_json": statement.excluded.is_json,
+                "last_updated": func.current_timestamp(),
+            },
+        )
+        session.execute(statement)
+        return len(rows)
+
+    @staticmethod
+    def invalidate(user_name: Optional[str] = None) -> None:
+        """Drop one user's cached preferences (or everyone's); pending saves are kept."""
+        with _lock:
+            if user_name is None:
+                _preference_cache.clear()
+            else:
+                _preference_cache.pop(user_name, None)
+
+    @staticmethod
+    def remove_duplicates(session: Session) -> int:
+        """
+        Keep only the most recently updated row per (user_name, preference_key), so the unique
+        index can be created on databases that collected duplicates before it existed.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        ranked = select(
+            UserPreference.id,
+            func.row_number().over(
+                partition_by=(UserPreference.user_name, UserPreference.preference_key),
+                order_by=(UserPreference.last_updated.desc(), UserPreference.id.desc()),
+            ).label("row_number"),
+        ).subquery()
+        deleted = session.execute(
+            delete(UserPreference).where(UserPreference.id.in_(select(ranked.c.id).where(ranked.c.row_number > 1)))
+        ).rowcount
+        session.commit()
+        PreferenceService.invalidate()
+        logger.info(f"Removed {deleted} duplicate user preferences.")
+        return deleted
@@ -3,6 +3,7 @@ from fastapi import HTTPException
 from sqlalchemy import inspect
 from core.id_method import id_method
 from models.request import RmsRequest
+from models.request_current_status import RmsRequestCurrentStatus
 from models.request_status import RmsRequestStatus
 from services.database_service import DatabaseService
 
@@ -93,9 +94,31 @@ def create_rms_request(model, data, group_id, user):
         status=initial_status,
         user_name=user.user_name,
     )
+    # Saved together with new_request through the relationship cascade
+    new_request.current_status = RmsRequestCurrentStatus(
+        status=initial_status,
+        user_name=user.user_name,
+    )
     return new_request, new_status
 
 
+def column_values(obj):
+    """ Column values explicitly set on a transient ORM object, for bulk inserts (defaults are left to the INSERT). """
+    state = inspect(obj)
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+
+def create_rms_request_rows(model, data, group_id, user):
+    """ Same as create_rms_request, as (request, status, current status) row dicts for bulk inserts. """
+    new_request, new_status = create_rms_request(model, data, group_id, user)
+    current_status_row = {
+        "unique_ref": new_request.unique_ref,
+        "status": new_status.status,
+        "user_name": new_status.user_name,
+    }
+    return column_values(new_request), column_values(new_status), current_status_row
+
+
 def create_main_object(model, data):
     """
     Creates an instance of the model, ensuring form field names are mapped to their database column names.
@@ -134,3 +157,4 @@ def handle_relationships(main_object, relationships_data, model):
                 setattr(main_object, relationship_name, new_rel_obj)
 
     return related_objects
+
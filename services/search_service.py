@@ -0,0 +1,188 @@
+import logging
+import re
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, literal_column, select, text
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import Session
+
+from core.model_registry import ModelRegistry
+from list_values import REQUEST_EXTRA_COLUMNS
+from models.request import RmsRequest
+from models.search_document import SEARCH_FTS_TABLE, SEARCH_TABLE, SearchDocument
+
+logger = logging.getLogger(__name__)
+
+# Number of rows rebuilt per statement when (re)indexing.
+INDEX_BATCH_SIZE = 1000
+
+# Text search configuration; must match the GIN index expression in models/search_document.py.
+TS_CONFIG = literal_column("'simple'::regconfig")
+
+
+class SearchService:
+    @staticmethod
+    def is_indexed(model) -> bool:
+        """Request models and RmsRequest are served from the full-text index; other tables use ILIKE."""
+        return bool(getattr(model, "is_request", False)) or model.__tablename__ == RmsRequest.__tablename__
+
+    @staticmethod
+    def get_search_columns(model) -> Tuple[List, List]:
+        """
+        Return (model_columns, request_columns) that make up a row's search document.
+
+        Columns flagged with info={"search": True} are used when the model has any,
+        otherwise every string column. The primary key and unique_ref are always included
+        so requests can be found by reference, and request models add REQUEST_EXTRA_COLUMNS
+        from the joined RmsRequest.
+        """
+        columns = list(model.__table__.columns)
+        string_columns = [col for col in columns if col.type.python_type == str]
+        flagged = [col for col in string_columns if col.info.get("search", False)]
+        search_columns = flagged or string_columns
+
+        for col in list(inspect(model).primary_key) + [model.__table__.columns.get("unique_ref")]:
+            if col is not None and col not in search_columns:
+                search_columns.append(col)
+
+        request_columns = []
+        if getattr(model, "is_request", False) and hasattr(model, "rms_request"):
+            request_columns = [
+                RmsRequest.__table__.columns[name]
+                for name in REQUEST_EXTRA_COLUMNS
+                if name in RmsRequest.__table__.columns
+            ]
+        return search_columns, request_columns
+
+    @staticmethod
+    def index_rows(session: Session, model, row_ids: Iterable) -> None:
+        """
+        Rebuild the search documents of the given rows (by primary key) in the caller's transaction.
+        Pending changes are flushed first so the documents reflect them. For RmsRequest rows, the
+        rows of request models with the same unique_ref are rebuilt too, as their documents include
+        REQUEST_EXTRA_COLUMNS.
+        """
+        if not SearchService.is_indexed(model):
+            return
+        row_ids = [row_id for row_id in row_ids if row_id is not None]
+        if not row_ids:
+            return
+
+        session.flush()
+        key_column = inspect(model).primary_key[0]
+        for start in range(0, len(row_ids), INDEX_BATCH_SIZE):
+            chunk = row_ids[start:start + INDEX_BATCH_SIZE]
+            documents = SearchService._build_documents(session, model, key_column.in_(chunk))
+            session.execute(
+                delete(SearchDocument).where(
+                    SearchDocument.model_name == model.__tablename__,
+                    SearchDocument.row_id.in_([str(row_id) for row_id in chunk]),
+                )
+            )
+            if documents:
+                session.execute(insert(SearchDocument), documents)
+
+            if model.__tablename__ == RmsRequest.__tablename__:
+                for child_model in SearchService._request_models():
+                    child_key = inspect(child_model).primary_key[0]
+                    child_ids = session.execute(
+                        select(child_key).where(child_model.__table__.c.unique_ref.in_(chunk))
+                    ).scalars().all()
+                    SearchService.index_rows(session, child_model, child_ids)
+
+    @staticmethod
+    def _request_models() -> List:
+        """Request models whose search documents include RmsRequest columns."""
+        return [
+            model for model in ModelRegistry.get_all_models_as_dict().values()
+            if getattr(model, "is_request", False) and hasattr(model, "rms_request")
+        ]
+
+    @staticmethod
+    def index_objects(session: Session, objects: Iterable) -> None:
+        """Flush and (re)index the given ORM objects, skipping models that are not indexed."""
+        session.flush()
+        row_ids_by_model = {}
+        for obj in objects:
+            model = type(obj)
+            if SearchService.is_indexed(model):
+                row_ids_by_model.setdefault(model, []).append(inspect(obj).identity[0])
+        for model, row_ids in row_ids_by_model.items():
+            SearchService.index_rows(session, model, row_ids)
+
+    @staticmethod
+    def reindex_model(session: Session, model) -> int:
+        """Drop and rebuild every search document of a model. Returns the number of indexed rows."""
+        if not SearchService.is_indexed(model):
+            return 0
+
+        session.execute(delete(SearchDocument).where(SearchDocument.model_name == model.__tablename__))
+        key_column = inspect(model).primary_key[0]
+        indexed = 0
+        last_key = None
+        while True:
+            condition = key_column > last_key if last_key is not None else None
+            documents = SearchService._build_documents(session, model, condition, limit=INDEX_BATCH_SIZE)
+            if not documents:
+                break
+            session.execute(insert(SearchDocument), documents)
+            indexed += len(documents)
+            last_key = documents[-1]["row_id"]
+        session.commit()
+        logger.info(f"Indexed {indexed} rows of {model.__tablename__} for search.")
+        return indexed
+
+    @staticmethod
+    def _build_documents(session: Session, model, condition=None, limit: Optional[int] = None) -> List[dict]:
+        """Select the search columns of matching rows and flatten each row into a SearchDocument dict."""
+        key_column = inspect(model).primary_key[0]
+        search_columns, request_columns = SearchService.get_search_columns(model)
+
+        stmt = select(key_column, *search_columns, *request_columns)
+        if request_columns:
+            stmt = stmt.join(RmsRequest, RmsRequest.unique_ref == model.__table__.c.unique_ref)
+        if condition is not None:
+            stmt = stmt.where(condition)
+        if limit is not None:
+            stmt = stmt.order_by(key_column).limit(limit)
+
+        documents = []
+        for row in session.execute(stmt):
+            values = [str(value) for value in row[1:] if value not in (None, "")]
+            documents.append({
+                "model_name": model.__tablename__,
+                "row_id": str(row[0]),
+                "document": " ".join(values),
+            })
+        return documents
+
+    @staticmethod
+    def build_search_filter(session: Session, model, search_value: str):
+        """
+        Return a filter restricting `model` to rows whose search document matches every word
+        of `search_value` (as a prefix), or None when the index cannot serve the search and the
+        caller should fall back to ILIKE.
+        """
+        if not SearchService.is_indexed(model):
+            return None
+        tokens = re.findall(r"\w+", search_value.lower())
+        if not tokens:
+            return None
+
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            ts_query = " & ".join(f"{token}:*" for token in tokens)
+            match = func.to_tsvector(TS_CONFIG, SearchDocument.document).op("@@")(func.to_tsquery(TS_CONFIG, ts_query))
+        elif dialect == "sqlite":
+            fts_query = " ".join(f'"{token}"*' for token in tokens)
+            match = text(
+                f"{SEARCH_TABLE}.rowid IN (SELECT rowid FROM {SEARCH_FTS_TABLE} WHERE {SEARCH_FTS_TABLE} MATCH :fts_query)"
+            ).bindparams(fts_query=fts_query)
+        else:
+            return None
+
+        key_column = inspect(model).primary_key[0]
+        matching_rows = select(SearchDocument.row_id).where(
+            SearchDocument.model_name == model.__tablename__,
+            match,
+        )
+        return key_column.in_(matching_rows)
@@ -0,0 +1,108 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from core.keyset import decode_cursor, encode_cursor, sort_key as keyset_sort_key
+from models.comment import Comment
+from models.request_status import RmsRequestStatus
+
+logger = logging.getLogger(__name__)
+
+# Entries per timeline page, and the most a client may ask for.
+TIMELINE_PAGE_SIZE = 50
+MAX_TIMELINE_PAGE_SIZE = 200
+
+# Entry type -> (model, id column, text column, timestamp column)
+_TIMELINE_SOURCES = {
+    "comment": (Comment, Comment.comment_id, Comment.comment, Comment.comment_timestamp),
+    "status": (RmsRequestStatus, RmsRequestStatus.status_id, RmsRequestStatus.status, RmsRequestStatus.timestamp),
+}
+
+
+def _decode_cursor(cursor: str, dialect_name: str) -> Tuple[Any, str, str]:
+    """(sort key, entry type, entry id) of a timeline cursor; the sort key as `keyset.sort_key` compares it."""
+    try:
+        payload = decode_cursor(cursor)
+        sort_key, entry_type, entry_id = payload["t"], payload["y"], payload["k"]
+        timestamp = datetime.fromisoformat(sort_key)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid timeline cursor.") from e
+    if entry_type not in _TIMELINE_SOURCES:
+        raise ValueError("Invalid timeline cursor.")
+    return (sort_key if dialect_name == "sqlite" else timestamp), entry_type, entry_id
+
+
+def _older_than(entry_type: str, id_column, sort_key, cursor: Tuple[Any, str, str]):
+    """
+    Entries of one source after the cursor in (timestamp, type, id) descending order. The type is
+    constant per source, so this is a plain range on the (unique_ref, timestamp) index.
+    """
+    timestamp, cursor_type, cursor_id = cursor
+    if entry_type < cursor_type:
+        return sort_key <= timestamp
+    if entry_type > cursor_type:
+        return sort_key < timestamp
+    return or_(sort_key < timestamp, and_(sort_key == timestamp, id_column < cursor_id))
+
+
+class TimelineService:
+    @staticmethod
+    def fetch_page(
+        session: Session,
+        unique_ref: str,
+        cursor: Optional[str] = None,
+        limit: int = TIMELINE_PAGE_SIZE,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of a request's timeline (comments and status changes), newest first, read with a
+        single UNION ALL query ordered by timestamp. Pages are keyset-paginated: pass the returned
+        cursor to load the entries older than the page.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            unique_ref (str): The request's unique_ref.
+            cursor (str, optional): Cursor from the previous page, or None for the newest entries.
+            limit (int): Entries per page, at most MAX_TIMELINE_PAGE_SIZE.
+
+        Returns:
+            tuple: The entries as {type, entry_id, text, user_name, timestamp} and the cursor for
+            the older entries, or None if this page reaches the first entry.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        limit = max(1, min(int(limit), MAX_TIMELINE_PAGE_SIZE))
+        dialect_name = session.get_bind().dialect.name
+        position = _decode_cursor(cursor, dialect_name) if cursor else None
+
+        branches = []
+        for entry_type, (model, id_column, text_column, timestamp_column) in _TIMELINE_SOURCES.items():
+            sort_key = keyset_sort_key(timestamp_column, dialect_name)
+            branch = select(
+                literal(entry_type).label("type"),
+                id_column.label("entry_id"),
+                text_column.label("text"),
+                model.user_name.label("user_name"),
+                timestamp_column.label("timestamp"),
+                sort_key.label("sort_key"),
+            ).where(model.unique_ref == unique_ref)
+            if position is not None:
+                branch = branch.where(_older_than(entry_type, id_column, sort_key, position))
+            branches.append(branch)
+
+        timeline = union_all(*branches).subquery()
+        rows = session.execute(
+            select(timeline)
+            .order_by(timeline.c.sort_key.desc(), timeline.c.type.desc(), timeline.c.entry_id.desc())
+            .limit(limit + 1)
+        ).mappings().all()
+
+        entries = [{key: value for key, value in row.items() if key != "sort_key"} for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor({"t": last["sort_key"], "y": last["type"], "k": last["entry_id"]})
+        logger.debug(f"Timeline page for {unique_ref}: {len(entries)} entries, more: {next_cursor is not None}")
+        return entries, next_cursor
@@ -1,11 +1,18 @@
 import json
 from fastapi import HTTPException
+from sqlalchemy import insert, select, update
 from sqlalchemy.sql import func
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from core.model_registry import ModelRegistry
+from core.workflow_engine import compile_workflow
 from models.request import RmsRequest
 from models.request_status import RmsRequestStatus
-from services.database_service import DatabaseService
+from services.current_status_service import CurrentStatusService
+from services.search_service import SearchService
+
+# Requests changed per UPDATE / history insert; keeps IN lists and statement sizes bounded.
+STATUS_UPDATE_CHUNK_SIZE = 500
 
 
 class WorkflowService:
@@ -13,9 +20,7 @@ class WorkflowService:
     def get_request_status_config(request_type: str) -> dict:
         """Fetch the status configuration for the given request type."""
         print("request_type", request_type)
-        model_name = DatabaseService.get_model_by_request_type(request_type)
-        print("model_name", model_name)
-        model = DatabaseService.get_model_by_tablename(model_name)
+        model = ModelRegistry.get_model_by_request_type(request_type)
         if not model or not hasattr(model, "request_status_config"):
             raise HTTPException(
                 status_code=404,
@@ -38,60 +43,35 @@ class WorkflowService:
         return statuses.pop(), request_types.pop()
 
     @staticmethod
-    def validate_user_roles(current_status: str, user_roles: List[str], request_status_config: dict, is_requester: bool = False):
+    def validate_user_roles(current_status: str, user_roles: Iterable[str], request_status_config: dict, is_requester: bool = False):
         """Ensure the user has one of the allowed roles for the current status.
         Allow self-transitions if the user is the requester and their role is permitted in the next status.
+        Answered from the compiled workflow (see core.workflow_engine); pass roles as a frozenset to hit its memo.
         """
-        allowed_roles = request_status_config.get(current_status, {}).get("Roles", [])
-
-        # Allow self-transition if the user's role is permitted in the next status
-        if is_requester:
-            valid_next_statuses = request_status_config.get(current_status, {}).get("Next", [])
-            for next_status in valid_next_statuses:
-                next_status_roles = request_status_config.get(next_status, {}).get("Roles", [])
-                if set(user_roles).intersection(next_status_roles):
-                    return  # Allow transition
-
-        # Otherwise, check normal role validation
-        if not set(user_roles).intersection(allowed_roles):
+        workflow = compile_workflow(request_status_config)
+        if not workflow.can_act(current_status, workflow.role_mask(user_roles), is_requester):
+            allowed_roles = request_status_config.get(current_status, {}).get("Roles", [])
             raise HTTPException(
                 status_code=403,
-                detail=(f"User does not have the required roles for status '{current_status}'. Has {user_roles}"
+                detail=(f"User does not have the required roles for status '{current_status}'. Has {sorted(user_roles)}"
                         f"Required roles: {allowed_roles}.")
             )
 
 
     @staticmethod
-    def get_valid_transitions(current_status: str, request_status_config: dict, user_roles: List[str], is_requester: bool = False) -> List[str]:
+    def get_valid_transitions(current_status: str, request_status_config: dict, user_roles: Iterable[str], is_requester: bool = False) -> List[str]:
         """
         Return the list of valid transitions from the current status.
         If `is_requester` is True, only include transitions that allow FS_Analyst.
-        Otherwise, ensure the user has the required role for the next status before allowing the transition.
         """
-        valid_transitions = request_status_config.get(current_status, {}).get("Next", [])
-
-        # Helper function to safely get roles as a list
-        def get_roles(status: str) -> List[str]:
-            roles = request_status_config.get(status, {}).get("Roles", [])
-            return roles if isinstance(roles, list) else []  # Ensure roles is always a list
-
-        # If the user is the requester, only allow transitions where "FS_Analyst" is a valid role
-        if is_requester:
-            valid_transitions = [
-                status for status in valid_transitions if "FS_Analyst" in get_roles(status)
-            ]
-        else:
-            # Ensure the user has at least one of the required roles for the next status
-            valid_transitions
-
-        return valid_transitions
+        return list(compile_workflow(request_status_config).allowed_transitions(current_status, is_requester))
 
 
     @staticmethod
     def validate_next_status(current_status: str, next_status: str, request_status_config: dict):
         """Ensure that the next_status is a valid transition from the current_status."""
-        valid_transitions = request_status_config.get(current_status, {}).get("Next", [])
-        if next_status not in valid_transitions:
+        if not compile_workflow(request_status_config).is_valid_next(current_status, next_status):
+            valid_transitions = request_status_config.get(current_status, {}).get("Next", [])
             raise HTTPException(
                 status_code=400,
                 detail=(f"Invalid transition from {current_status} to {next_status}. "
@@ -99,55 +79,89 @@ class WorkflowService:
             )
 
     @staticmethod
-    def update_request_status(ids: List[str], current_status: str, next_status: str, user, session, request_status_config: dict) -> int:
+    def get_status_updates(current_status: str, next_status: str, request_status_config: dict, user_name: str) -> dict:
         """
-        Perform the update of requests and their status entries.
-        Returns the number of successfully updated rows.
+        Return the RmsRequest column values set by moving from `current_status` to `next_status`,
+        based on the Status_Type of both statuses. Empty when the transition only adds history.
         """
-        updated_count = 0
-        for unique_ref in ids:
-            request = session.query(RmsRequest).filter(RmsRequest.unique_ref == unique_ref).first()
-            if not request:
+        workflow = compile_workflow(request_status_config)
+
+        values = {}
+        if workflow.has_type(current_status, "APPROVAL"):
+            values.update(approval_timestamp=func.current_timestamp(), approved="Y", approver=user_name, request_status="PENDING GOVERNANCE")
+        if workflow.has_type(next_status, "APPROVAL REJECTED"):
+            values.update(approval_timestamp=func.current_timestamp(), approved="R", approver=user_name, request_status="REJECTED")
+        if workflow.has_type(current_status, "GOVERNANCE"):
+            values.update(governed_timestamp=func.current_timestamp(), governed="Y", governed_by=user_name, request_status="DEPLOYMENT READY")
+        if workflow.has_type(next_status, "GOVERNANCE REJECTED"):
+            values.update(governed_timestamp=func.current_timestamp(), governed="R", governed_by=user_name, request_status="REJECTED")
+        if workflow.has_type(next_status, "COMPLETED"):
+            values.update(deployment_timestamp=func.current_timestamp(), deployed="Y", request_status="COMPLETED")
+        return values
+
+    @staticmethod
+    def update_request_status(
+        ids: List[str],
+        current_status: str,
+        next_status: str,
+        user,
+        session,
+        request_status_config: dict,
+        versions: Optional[Dict[str, int]] = None,
+        commit: bool = True,
+    ) -> Dict[str, str]:
+        """
+        Move requests from `current_status` to `next_status` with set-based statements, STATUS_UPDATE_CHUNK_SIZE
+        ids at a time. The transition is a compare-and-set on the current status projection (see
+        `CurrentStatusService.compare_and_set`); only the requests it moved get the RmsRequest UPDATE,
+        the status history rows and the search index refresh.
+
+        Args:
+            versions (dict, optional): unique_ref -> current status version the caller saw; those
+                requests are only moved if they are still at that version.
+            commit (bool): Commit when done; pass False to make this part of the caller's transaction.
+
+        Returns:
+            dict: unique_ref -> "updated", "stale" (no longer in `current_status` or at the given
+            version: someone else changed it first) or "not_found".
+        """
+        values = WorkflowService.get_status_updates(current_status, next_status, request_status_config, user.user_name)
+        unique_refs = list(dict.fromkeys(ids))  # Drop duplicates, keep order
+        results = {}
+
+        for start in range(0, len(unique_refs), STATUS_UPDATE_CHUNK_SIZE):
+            chunk = unique_refs[start:start + STATUS_UPDATE_CHUNK_SIZE]
+            moved = set(CurrentStatusService.compare_and_set(
+                session, chunk, current_status, next_status, user.user_name, versions
+            ))
+            updated_refs = [unique_ref for unique_ref in chunk if unique_ref in moved]
+
+            missed = [unique_ref for unique_ref in chunk if unique_ref not in moved]
+            existing = set(session.execute(
+                select(RmsRequest.unique_ref).where(RmsRequest.unique_ref.in_(missed))
+            ).scalars()) if missed else set()
+            for unique_ref in chunk:
+                if unique_ref in moved:
+                    results[unique_ref] = "updated"
+                else:
+                    results[unique_ref] = "stale" if unique_ref in existing else "not_found"
+            if not updated_refs:
                 continue
 
-            # Create new status record
-            new_status = RmsRequestStatus(
-                unique_ref=unique_ref,
-                status=next_status,
-                user_name=user.user_name
+            if values:
+                session.execute(
+                    update(RmsRequest).where(RmsRequest.unique_ref.in_(updated_refs)).values(**values),
+                    execution_options={"synchronize_session": False},
+                )
+            session.execute(
+                insert(RmsRequestStatus),
+                [
+                    {"unique_ref": unique_ref, "status": next_status, "user_name": user.user_name}
+                    for unique_ref in updated_refs
+                ],
             )
-            session.add(new_status)
-
-            # Update RmsRequest based on Status_Type configurations
-            current_status_type = request_status_config.get(current_status, {}).get("Status_Type", [])
-            next_status_type = request_status_config.get(next_status, {}).get("Status_Type", [])
-            
-            if "APPROVAL" in current_status_type:
-                request.approval_timestamp = func.current_timestamp()
-                request.approved = "Y"
-                request.approver = user.user_name
-                request.request_status = 'PENDING GOVERNANCE'
-            if "APPROVAL REJECTED" in next_status_type:
-                request.approval_timestamp = func.current_timestamp()
-                request.approved = "R"
-                request.approver = user.user_name
-                request.request_status = 'REJECTED'
-            if "GOVERNANCE" in current_status_type:
-                request.governed_timestamp = func.current_timestamp()
-                request.governed = "Y"
-                request.governed_by = user.user_name
-                request.request_status = 'DEPLOYMENT READY'
-            if "GOVERNANCE REJECTED" in next_status_type:
-                request.governed_timestamp = func.current_timestamp()
-                request.governed = "R"
-                request.governed_by = user.user_name
-                request.request_status = 'REJECTED'
-            if "COMPLETED" in next_status_type:
-                request.deployment_timestamp = func.current_timestamp()
-                request.deployed = "Y"
-                request.request_status = 'COMPLETED'
-
-            updated_count += 1
-
-        session.commit()
-        return updated_count
+            SearchService.index_rows(session, RmsRequest, updated_refs)
+
+        if commit:
+            session.commit()
+        return results
@@ -0,0 +1,91 @@
+"""
+Shared fixtures. Tests run against a fresh in-memory SQLite database per test and never import
+`database`, which connects to the configured PostgreSQL server when imported.
+"""
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+try:
+    import env  # noqa: F401
+except ImportError:
+    # env.py holds the deployment settings and is not checked in; the models only need ENVIRONMENT
+    sys.modules["env"] = types.SimpleNamespace(ENVIRONMENT="test")
+
+try:
+    os.getlogin()
+except OSError:
+    # No controlling terminal (e.g. CI); the models read the login name for column defaults at import
+    os.getlogin = lambda: "tester"
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.get_table_name import Base
+from core.model_registry import ModelRegistry
+# Every model is imported so create_all and the model registry see the full schema.
+from models.comment import Comment  # noqa: F401
+from models.import_record import ImportRecord  # noqa: F401
+from models.job import Job  # noqa: F401
+from models.performance_metric import PerformanceMetric  # noqa: F401
+from models.request import Group, RmsRequest  # noqa: F401
+from models.request_current_status import RmsRequestCurrentStatus  # noqa: F401
+from models.request_status import RmsRequestStatus  # noqa: F401
+from models.requests.person import Person  # noqa: F401
+from models.requests.rule_config_request import RuleConfigRequest  # noqa: F401
+from models.requests.rule_request import RuleRequest  # noqa: F401
+from models.search_document import SearchDocument  # noqa: F401
+from models.user import User  # noqa: F401
+from models.user_preference import UserPreference  # noqa: F401
+from services.database_service import DatabaseService
+
+ModelRegistry.build()
+
+# Valid option values for the required request columns
+REQUEST_FIELDS = dict(
+    request_type="RULE_DEPLOYMENT", effort="BAU", organization="FRM", sub_organization="FRAP",
+    line_of_business="CREDIT", team="IMPL", decision_engine="SASFM",
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def Session(engine):
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def session(Session):
+    with Session() as session:
+        yield session
+
+
+@pytest.fixture
+def add_request(session):
+    """Factory adding an RmsRequest in its own group; keyword arguments override REQUEST_FIELDS."""
+    def add(unique_ref, **fields):
+        request = RmsRequest(unique_ref=unique_ref, group=Group(group_id=f"G-{unique_ref}"), **{**REQUEST_FIELDS, **fields})
+        session.add(request)
+        return request
+    return add
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    # Cached counts and metadata outlive the per-test database
+    DatabaseService.invalidate_count_cache()
+    DatabaseService.clear_model_metadata_cache()
+    yield
@@ -0,0 +1,25 @@
+import pytest
+
+from models.requests.rule_request import RuleRequest
+from services.autocomplete_service import AutocompleteService
+
+
+@pytest.fixture(autouse=True)
+def _clear_indexes():
+    AutocompleteService._indexes.clear()
+    yield
+    AutocompleteService._indexes.clear()
+
+
+def test_values_are_recorded_only_once_committed(session):
+    assert AutocompleteService.suggest(session, RuleRequest, "rule_name", "velo") == []
+
+    AutocompleteService.record_values(session, RuleRequest, [{"rule_name": "velocity_check"}])
+    assert AutocompleteService.suggest(session, RuleRequest, "rule_name", "velo") == []
+    session.rollback()
+    session.commit()
+    assert AutocompleteService.suggest(session, RuleRequest, "rule_name", "velo") == []
+
+    AutocompleteService.record_values(session, RuleRequest, [{"rule_name": "velocity_limit"}])
+    session.commit()
+    assert AutocompleteService.suggest(session, RuleRequest, "rule_name", "velo") == ["velocity_limit"]
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import core.user_context as user_context
+import services.database_service as database_service
+import services.preference_service as preference_service
+from core.user_context import USER_CACHE_TTL, UserContext, UserContextCache
+from models.request import RmsRequest
+from models.user import User
+from models.user_preference import UserPreference
+from services.database_service import EXACT_COUNT_CACHE_TTL, DatabaseService
+from services.preference_service import PREFERENCE_CACHE_TTL, PreferenceService
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test moves by hand, in place of `time` in the cache modules."""
+    clock = Clock()
+    for module in (user_context, database_service, preference_service):
+        monkeypatch.setattr(module, "time", SimpleNamespace(monotonic=clock.monotonic, time=clock.monotonic))
+    return clock
+
+
+def _user(user_name="ALICE", expires=None):
+    expires = expires or datetime.now() + timedelta(days=1)
+    return User(
+        user_id=f"U-{user_name}", user_name=user_name, email_from="", email_to="", email_cc="",
+        user_role_expire_timestamp=expires, roles="FS_Analyst", organizations="FRM", sub_organizations="FRAP",
+        line_of_businesses="CREDIT", teams="IMPL", decision_engines="SASFM",
+    )
+
+
+@pytest.fixture
+def user_cache():
+    UserContextCache.invalidate()
+    yield
+    UserContextCache.invalidate()
+
+
+def test_user_context_expires_after_the_ttl(clock, user_cache):
+    context = UserContext.from_user(_user())
+    UserContextCache.put(context)
+    assert UserContextCache.get("ALICE") is context
+
+    clock.now += USER_CACHE_TTL - 1
+    assert UserContextCache.get("ALICE") is context
+    clock.now += 1
+    assert UserContextCache.get("ALICE") is None
+
+
+def test_user_context_expires_with_its_roles(clock, user_cache):
+    UserContextCache.put(UserContext.from_user(_user(expires=datetime.now() + timedelta(seconds=5))))
+    clock.now += 6
+    assert UserContextCache.get("ALICE") is None
+
+    UserContextCache.put(UserContext.from_user(_user(expires=datetime.now() - timedelta(seconds=1))))
+    assert UserContextCache.get("ALICE") is None
+
+
+def test_user_context_is_dropped_when_the_user_row_changes(session, clock, user_cache):
+    user = _user()
+    session.add(user)
+    session.commit()
+    UserContextCache.put(UserContext.from_user(user))
+    UserContextCache.put(UserContext.from_user(_user("BOB")))
+
+    user.roles = "FS_Manager"
+    session.commit()
+    assert UserContextCache.get("ALICE") is None
+    assert UserContextCache.get("BOB") is not None
+
+
+def test_unfiltered_counts_are_cached_until_the_ttl_or_invalidation(session, add_request, clock):
+    def count():
+        query, _, _ = DatabaseService.build_rows_query(session, RmsRequest)
+        return DatabaseService.count_rows(session, query, RmsRequest, "exact", is_filtered=False)
+
+    add_request("R1")
+    session.commit()
+    assert count() == 1
+
+    add_request("R2")
+    session.commit()
+    assert count() == 1  # Served from the cache
+    clock.now += EXACT_COUNT_CACHE_TTL
+    assert count() == 2
+
+    add_request("R3")
+    session.commit()
+    DatabaseService.invalidate_counts_after_create()
+    assert count() == 3
+
+
+@pytest.fixture
+def preferences(monkeypatch):
+    # Saves stay pending: the write-behind flush would open a session on the configured database
+    monkeypatch.setattr(PreferenceService, "flush", staticmethod(lambda: 0))
+    for store in (preference_service._preference_cache, preference_service._pending, preference_service._in_flight):
+        store.clear()
+    yield
+    timer = preference_service._flush_timer
+    if timer is not None:
+        timer.cancel()
+        preference_service._flush_timer = None
+    for store in (preference_service._preference_cache, preference_service._pending, preference_service._in_flight):
+        store.clear()
+
+
+def test_preferences_are_served_from_memory_until_the_ttl(session, clock, preferences):
+    session.add(UserPreference(user_name="ALICE", preference_key="theme", preference_value="dark", is_json=False))
+    session.commit()
+    assert PreferenceService.get_preferences(session, "ALICE") == {"theme": "dark"}
+
+    # Another process replaces the row; this one sees it once the cached copy expires
+    session.query(UserPreference).delete()
+    session.add(UserPreference(user_name="ALICE", preference_key="theme", preference_value="light", is_json=False))
+    session.commit()
+    assert PreferenceService.get_preferences(session, "ALICE") == {"theme": "dark"}
+    clock.now += PREFERENCE_CACHE_TTL
+    assert PreferenceService.get_preferences(session, "ALICE") == {"theme": "light"}
+
+
+def test_saved_preferences_are_read_back_before_they_are_written(session, clock, preferences):
+    assert PreferenceService.get_preferences(session, "ALICE") == {}
+    PreferenceService.save_preferences("ALICE", {"columns": ["a", "b"]})
+    assert PreferenceService.get_preferences(session, "ALICE") == {"columns": ["a", "b"]}
+
+    # Still pending after the cached copy expires: merged over what the database holds
+    clock.now += PREFERENCE_CACHE_TTL
+    assert PreferenceService.get_preferences(session, "ALICE") == {"columns": ["a", "b"]}
+    assert preference_service._pending == {"ALICE": {"columns": ["a", "b"]}}
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from sqlalchemy import func, select
+
+from core.workflows import RULE_WORKFLOW
+from models.request_current_status import RmsRequestCurrentStatus
+from models.request_status import RmsRequestStatus
+from services.current_status_service import CurrentStatusService
+from services.workflow_service import WorkflowService
+
+APPROVER = SimpleNamespace(user_name="APPROVER", roles="FS_Manager")
+
+
+def _seed(session, add_request, refs, status="PENDING APPROVAL"):
+    for ref in refs:
+        add_request(ref)
+        session.add(RmsRequestCurrentStatus(unique_ref=ref, status=status, user_name="TESTER"))
+    session.commit()
+
+
+def _current(session, ref):
+    session.expire_all()
+    row = session.get(RmsRequestCurrentStatus, ref)
+    return row.status, row.version
+
+
+def test_compare_and_set_moves_only_requests_still_in_the_expected_status(session, add_request):
+    _seed(session, add_request, ["R1", "R2"])
+
+    moved = CurrentStatusService.compare_and_set(session, ["R1", "R2", "MISSING"], "PENDING APPROVAL", "PENDING GOVERNANCE", "APPROVER")
+    assert sorted(moved) == ["R1", "R2"]
+    assert _current(session, "R1") == ("PENDING GOVERNANCE", 2)
+
+    # A second approver racing the first no longer matches
+    assert CurrentStatusService.compare_and_set(session, ["R1"], "PENDING APPROVAL", "APPROVAL REJECTED", "OTHER") == []
+    assert _current(session, "R1") == ("PENDING GOVERNANCE", 2)
+
+
+def test_compare_and_set_checks_the_version_the_caller_saw(session, add_request):
+    _seed(session, add_request, ["R1", "R2"])
+
+    # R1 left PENDING APPROVAL and came back, so the version seen before is stale
+    CurrentStatusService.compare_and_set(session, ["R1"], "PENDING APPROVAL", "PENDING GOVERNANCE", "X")
+    CurrentStatusService.compare_and_set(session, ["R1"], "PENDING GOVERNANCE", "PENDING APPROVAL", "X")
+    assert _current(session, "R1") == ("PENDING APPROVAL", 3)
+
+    moved = CurrentStatusService.compare_and_set(
+        session, ["R1", "R2"], "PENDING APPROVAL", "PENDING GOVERNANCE", "APPROVER", versions={"R1": 1, "R2": 1}
+    )
+    assert moved == ["R2"]
+    assert _current(session, "R1") == ("PENDING APPROVAL", 3)
+
+
+def test_update_request_status_reports_stale_and_missing_requests(session, add_request):
+    _seed(session, add_request, ["R1", "R2", "R3"])
+
+    results = WorkflowService.update_request_status(
+        ["R1", "R2", "R3", "MISSING"], "PENDING APPROVAL", "PENDING GOVERNANCE", APPROVER, session, RULE_WORKFLOW,
+        versions={"R2": 7},
+    )
+    assert results == {"R1": "updated", "R2": "stale", "R3": "updated", "MISSING": "not_found"}
+
+    history = session.execute(
+        select(RmsRequestStatus.unique_ref, func.count()).group_by(RmsRequestStatus.unique_ref)
+    ).all()
+    assert sorted(history) == [("R1", 1), ("R3", 1)]
+    assert _current(session, "R2") == ("PENDING APPROVAL", 1)
@@ -0,0 +1,95 @@
+import gzip
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+from services.file_reader_service import FileReaderService
+
+HEADERS = ["rule_id", "rule_name"]
+ROWS = [{"rule_id": f"R{i:05d}", "rule_name": f"rule {i}"} for i in range(5000)]
+
+
+def _csv_bytes():
+    return ("rule_id,rule_name\n" + "".join(f"{row['rule_id']},{row['rule_name']}\n" for row in ROWS)).encode("utf-8")
+
+
+def _ndjson_bytes():
+    return "".join(json.dumps(row) + "\n" for row in ROWS).encode("utf-8")
+
+
+def _xlsx_bytes():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADERS)
+    for row in ROWS:
+        sheet.append([row[name] for name in HEADERS])
+    data = io.BytesIO()
+    workbook.save(data)
+    return data.getvalue()
+
+
+def _parquet_bytes():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = io.BytesIO()
+    pq.write_table(pa.Table.from_pylist(ROWS), data, row_group_size=500)
+    return data.getvalue()
+
+
+def _read(data: bytes, file_format: str):
+    reader = FileReaderService.open(io.BytesIO(data), file_format)
+    try:
+        return reader.fieldnames, list(reader)
+    finally:
+        reader.close()
+
+
+def _damage_middle(data: bytes) -> bytes:
+    """Overwrite the middle half of the file, keeping its header and footer."""
+    quarter = len(data) // 4
+    return data[:quarter] + b"\xff" * (2 * quarter) + data[3 * quarter:]
+
+
+def _rewrite_xlsx_part(data: bytes, suffix: str, content: bytes) -> bytes:
+    source = zipfile.ZipFile(io.BytesIO(data))
+    target = io.BytesIO()
+    with zipfile.ZipFile(target, "w") as archive:
+        for name in source.namelist():
+            archive.writestr(name, content if name.endswith(suffix) else source.read(name))
+    return target.getvalue()
+
+
+@pytest.mark.parametrize("file_format, build", [
+    (".csv", _csv_bytes),
+    (".csv.gz", lambda: gzip.compress(_csv_bytes())),
+    (".ndjson", _ndjson_bytes),
+    (".xlsx", _xlsx_bytes),
+    (".parquet", _parquet_bytes),
+])
+def test_reads_every_format(file_format, build):
+    fieldnames, rows = _read(build(), file_format)
+    assert fieldnames == HEADERS
+    assert rows == ROWS
+
+
+@pytest.mark.parametrize("file_format, build", [
+    (".csv", lambda: b"rule_id,rule_name\nR1,caf\xe9\n"),
+    (".csv.gz", lambda: b"not gzip at all"),
+    (".csv.gz", lambda: gzip.compress(_csv_bytes())[:-200]),
+    (".csv.gz", lambda: _damage_middle(gzip.compress(_csv_bytes()))),
+    (".ndjson", lambda: b'{"rule_id": "R1"}\n{"rule_id": "caf\xe9"}\n'),
+    (".ndjson", lambda: b'{"rule_id": "R1"}\n{"rule_id":\n'),
+    (".xlsx", lambda: b"not a workbook"),
+    (".xlsx", lambda: _xlsx_bytes()[:-100]),
+    (".xlsx", lambda: _rewrite_xlsx_part(_xlsx_bytes(), "sheet1.xml", b"<worksheet><sheetData><row>")),
+    (".parquet", lambda: b"not parquet"),
+    (".parquet", lambda: _damage_middle(_parquet_bytes())),
+])
+def test_corrupt_files_are_rejected_with_400(file_format, build):
+    with pytest.raises(HTTPException) as error:
+        _read(build(), file_format)
+    assert error.value.status_code == 400
@@ -0,0 +1,114 @@
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from models.import_record import IMPORT_STATUS_COMPLETED, IMPORT_STATUS_FAILED, IMPORT_STATUS_IN_PROGRESS, IMPORT_STATUS_PARTIAL, ImportRecord
+from models.request import RmsRequest
+from models.requests.rule_request import RuleRequest
+from services.bulk_import_service import IMPORT_BATCH_SIZE, BulkImportService
+from services.import_dedup_service import IMPORT_CLAIM_TIMEOUT, ImportDedupService
+
+USER = SimpleNamespace(user_name="TESTER", roles="Admin")
+CONTENT_HASH = ImportDedupService.hash_file(BytesIO(b"rule_id,rule_version\n"))
+
+
+def _rows(count, fail_at=None):
+    for i in range(count):
+        if i == fail_at:
+            raise ValueError("unreadable row")
+        yield {
+            "request_type": "RULE_DEPLOYMENT", "rule_name": f"rule_{i}", "rule_id": f"R{i:06d}", "rule_version": "1",
+            "organization": "FRM", "sub_organization": "FRAP", "line_of_business": "CREDIT", "team": "IMPL",
+            "decision_engine": "SASFM", "effort": "BAU",
+        }
+
+
+def _import(session, rows, commit_mode="chunk"):
+    return BulkImportService.import_upload(session, RuleRequest, rows, USER, commit_mode, CONTENT_HASH, "rules.csv")
+
+
+def _record(session):
+    session.expire_all()
+    return session.execute(select(ImportRecord)).scalar_one()
+
+
+def _rule_count(session):
+    return session.execute(select(func.count()).select_from(RuleRequest)).scalar_one()
+
+
+def test_chunked_import_resumes_after_committed_batches(session):
+    total = IMPORT_BATCH_SIZE + 10
+    with pytest.raises(ValueError):
+        _import(session, _rows(total, fail_at=IMPORT_BATCH_SIZE + 5))
+
+    record = _record(session)
+    assert record.status == IMPORT_STATUS_PARTIAL
+    assert record.row_count == IMPORT_BATCH_SIZE
+    assert _rule_count(session) == IMPORT_BATCH_SIZE
+
+    result = _import(session, _rows(total))
+    assert result["group_id"] == record.group_id
+    assert result["row_count"] == total
+    assert _rule_count(session) == total
+    assert _record(session).status == IMPORT_STATUS_COMPLETED
+
+    # The completed import is returned, not repeated
+    assert _import(session, _rows(total))["duplicate"] is True
+    assert _rule_count(session) == total
+
+
+def test_failed_import_without_commits_releases_the_claim(session):
+    with pytest.raises(ValueError):
+        _import(session, _rows(20, fail_at=10), commit_mode="all")
+
+    record = _record(session)
+    assert record.status == IMPORT_STATUS_FAILED
+    assert record.group_id is None
+    assert _rule_count(session) == 0
+
+    result = _import(session, _rows(20), commit_mode="all")
+    assert result["row_count"] == 20
+    assert _rule_count(session) == 20
+
+
+def test_hash_file_rewinds_and_copy_and_hash_agree():
+    upload = BytesIO(b"x" * 3_000_000)
+    content_hash = ImportDedupService.hash_file(upload)
+    assert upload.tell() == 0
+
+    target = BytesIO()
+    assert ImportDedupService.copy_and_hash(upload, target) == content_hash
+    assert target.getvalue() == upload.getvalue()
+
+
+def test_claim_rejects_a_concurrent_import_until_it_is_stale(session):
+    record, completed = ImportDedupService.claim(session, RuleRequest, CONTENT_HASH, "FIRST")
+    assert (record.status, completed) == (IMPORT_STATUS_IN_PROGRESS, False)
+
+    with pytest.raises(HTTPException) as error:
+        ImportDedupService.claim(session, RuleRequest, CONTENT_HASH, "SECOND")
+    assert error.value.status_code == 409
+
+    # An import that never finished (e.g. the server restarted) may be taken over
+    record.started_timestamp -= IMPORT_CLAIM_TIMEOUT
+    session.commit()
+    retried, completed = ImportDedupService.claim(session, RuleRequest, CONTENT_HASH, "SECOND")
+    assert (retried.import_id, retried.user_name, completed) == (record.import_id, "SECOND", False)
+
+
+def test_claim_and_find_completed_return_the_finished_import(session):
+    record, _ = ImportDedupService.claim(session, RuleRequest, CONTENT_HASH, "FIRST")
+    assert ImportDedupService.find_completed(session, RuleRequest, CONTENT_HASH) is None
+    ImportDedupService.complete(session, record, {"group_id": "G1", "row_count": 10, "skipped_rows": 2})
+
+    assert ImportDedupService.find_completed(session, RuleRequest, CONTENT_HASH).import_id == record.import_id
+    again, completed = ImportDedupService.claim(session, RuleRequest, CONTENT_HASH, "SECOND")
+    assert completed is True
+    assert ImportDedupService.to_result(again) == {"group_id": "G1", "row_count": 10, "skipped_rows": 2, "duplicate": True}
+
+    # Claims are per model
+    other, completed = ImportDedupService.claim(session, RmsRequest, CONTENT_HASH, "SECOND")
+    assert completed is False and other.import_id != record.import_id
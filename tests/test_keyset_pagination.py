@@ -0,0 +1,94 @@
+from datetime import date, datetime
+
+import pytest
+
+from core.keyset import decode_cursor, encode_cursor
+from models.request import RmsRequest
+from services.database_service import DatabaseService
+
+
+def _column_index(model, column_name: str) -> int:
+    return [column.name for column in model.__table__.columns].index(column_name)
+
+
+def _seed_requests(session, add_request):
+    """Requests with tied server-default timestamps (no microseconds) mixed with bound datetimes."""
+    refs = []
+    for i in range(7):
+        request = add_request(f"R{i:02d}")
+        if i % 3 == 0:
+            request.request_received_timestamp = datetime(2024, 1, 1, 12, 0, i, 500000)
+        refs.append(request.unique_ref)
+    session.commit()
+    return refs
+
+
+def _fetch(session, **kwargs):
+    return DatabaseService.fetch_model_rows_keyset(
+        model_name=RmsRequest.__tablename__, session=session, model=RmsRequest,
+        sort_column_index=_column_index(RmsRequest, "request_received_timestamp"),
+        length=2, **kwargs,
+    )
+
+
+def _walk(session, sort_order):
+    pages = []
+    cursor = None
+    while True:
+        rows, _, next_cursor, prev_cursor = _fetch(session, sort_order=sort_order, cursor=cursor)
+        pages.append(([row["unique_ref"] for row in rows], prev_cursor))
+        if next_cursor is None:
+            return pages
+        cursor = next_cursor
+
+
+def test_keyset_pages_through_a_datetime_sort(session, add_request):
+    refs = _seed_requests(session, add_request)
+
+    for sort_order in ("asc", "desc"):
+        pages = _walk(session, sort_order)
+        seen = [ref for page, _ in pages for ref in page]
+        assert sorted(seen) == refs
+        assert len(seen) == len(set(seen))
+
+        # Each page's prev cursor leads back to the page before it
+        for (previous_page, _), (_, prev_cursor) in zip(pages, pages[1:]):
+            rows, _, _, _ = _fetch(session, sort_order=sort_order, cursor=prev_cursor)
+            assert [row["unique_ref"] for row in rows] == previous_page
+
+
+def test_cursor_round_trip_keeps_dates_as_iso_text():
+    cursor = encode_cursor({"t": datetime(2024, 1, 2, 3, 4, 5, 6), "d": date(2024, 1, 2), "k": "R01", "n": None})
+    assert decode_cursor(cursor) == {"t": "2024-01-02T03:04:05.000006", "d": "2024-01-02", "k": "R01", "n": None}
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor({})[:-4] + "!!!!", "WzEsIDJd"])  # The last is a JSON list
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_of_another_sort_is_rejected(session, add_request):
+    _seed_requests(session, add_request)
+    _, _, next_cursor, _ = _fetch(session, sort_order="desc")
+
+    with pytest.raises(ValueError):
+        _fetch(session, sort_order="asc", cursor=next_cursor)
+    with pytest.raises(ValueError):
+        DatabaseService.fetch_model_rows_keyset(
+            model_name=RmsRequest.__tablename__, session=session, model=RmsRequest,
+            sort_column_index=_column_index(RmsRequest, "team"), sort_order="desc", cursor=next_cursor, length=2,
+        )
+
+
+def test_keyset_pages_by_primary_key_without_a_sort_column(session, add_request):
+    refs = _seed_requests(session, add_request)
+    seen, cursor = [], None
+    while True:
+        rows, _, cursor, _ = DatabaseService.fetch_model_rows_keyset(
+            model_name=RmsRequest.__tablename__, session=session, model=RmsRequest, cursor=cursor, length=3,
+        )
+        seen.extend(row["unique_ref"] for row in rows)
+        if cursor is None:
+            break
+    assert seen == refs
@@ -0,0 +1,41 @@
+from models.request import RmsRequest
+from models.requests.rule_request import RuleRequest
+from services.database_service import DatabaseService
+
+SCOPE = {
+    "organization": {"FRM"},
+    "sub_organization": {"FRAP"},
+    "line_of_business": {"CREDIT", "DEBIT"},
+    "team": {"IMPL"},
+    "decision_engine": {"SASFM"},
+    "requester": {"ME"},
+}
+
+
+def _scoped_refs(session, model, scope):
+    query, _, _ = DatabaseService.build_rows_query(session, model, scope=scope)
+    return sorted(row.unique_ref for row in query.all())
+
+
+def _seed(session, add_request):
+    add_request("IN-SCOPE", requester="SOMEONE")
+    add_request("OTHER-TEAM", team="CPT", requester="SOMEONE")
+    add_request("OWN-OTHER-TEAM", team="CPT", requester="ME")
+    for ref in ("IN-SCOPE", "OTHER-TEAM", "OWN-OTHER-TEAM"):
+        session.add(RuleRequest(unique_ref=ref, request_type="RULE_DEPLOYMENT", rule_name=f"rule_{ref}", rule_id=ref, rule_version=1))
+    session.commit()
+
+
+def test_scope_keeps_in_scope_rows_and_the_users_own_requests(session, add_request):
+    _seed(session, add_request)
+
+    assert _scoped_refs(session, RmsRequest, SCOPE) == ["IN-SCOPE", "OWN-OTHER-TEAM"]
+    assert _scoped_refs(session, RuleRequest, SCOPE) == ["IN-SCOPE", "OWN-OTHER-TEAM"]
+
+
+def test_scope_without_requester_only_keeps_in_scope_rows(session, add_request):
+    _seed(session, add_request)
+    scope = {column: values for column, values in SCOPE.items() if column != "requester"}
+
+    assert _scoped_refs(session, RmsRequest, scope) == ["IN-SCOPE"]
+    assert _scoped_refs(session, RmsRequest, {**scope, "team": set()}) == []
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+
+from core.keyset import encode_cursor
+from models.comment import Comment
+from models.request_status import RmsRequestStatus
+from services.timeline_service import TimelineService
+
+
+def _seed(session, add_request):
+    """Comments and status changes of one request, with ties on the timestamp within and across types."""
+    add_request("R1")
+    add_request("R2")
+    for i in range(5):
+        session.add(Comment(comment_id=f"C{i}", unique_ref="R1", comment=f"comment {i}", user_name="TESTER"))
+        session.add(RmsRequestStatus(status_id=f"S{i}", unique_ref="R1", status="PENDING APPROVAL", user_name="TESTER"))
+    for i in range(5, 8):
+        session.add(Comment(
+            comment_id=f"C{i}", unique_ref="R1", comment=f"comment {i}", user_name="TESTER",
+            comment_timestamp=datetime(2020, 1, 1, 0, 0, i, 250000),
+        ))
+    session.add(Comment(comment_id="OTHER", unique_ref="R2", comment="other request", user_name="TESTER"))
+    session.commit()
+
+
+def test_timeline_pages_through_every_entry_newest_first(session, add_request):
+    _seed(session, add_request)
+
+    entries, cursor = [], None
+    while True:
+        page, cursor = TimelineService.fetch_page(session, "R1", cursor, limit=3)
+        assert len(page) <= 3
+        entries.extend(page)
+        if cursor is None:
+            break
+
+    keys = [(entry["type"], entry["entry_id"]) for entry in entries]
+    assert len(keys) == len(set(keys)) == 13
+    assert ("comment", "OTHER") not in keys
+    timestamps = [entry["timestamp"] for entry in entries]
+    assert timestamps == sorted(timestamps, reverse=True)
+    assert keys[-3:] == [("comment", "C7"), ("comment", "C6"), ("comment", "C5")]
+
+    # One page with everything matches the pages put together
+    everything, cursor = TimelineService.fetch_page(session, "R1", limit=100)
+    assert cursor is None
+    assert [(entry["type"], entry["entry_id"]) for entry in everything] == keys
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    encode_cursor({"t": "yesterday", "y": "comment", "k": "C1"}),
+    encode_cursor({"t": datetime(2024, 1, 1), "y": "unknown", "k": "C1"}),
+    encode_cursor({"t": datetime(2024, 1, 1), "y": "comment"}),
+])
+def test_timeline_rejects_malformed_cursors(session, cursor):
+    with pytest.raises(ValueError):
+        TimelineService.fetch_page(session, "R1", cursor)
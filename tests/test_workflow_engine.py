@@ -0,0 +1,57 @@
+import gc
+import weakref
+
+import pytest
+
+from core.workflow_engine import CompiledWorkflow, compile_workflow
+from core.workflows import RULE_WORKFLOW
+
+
+def test_compile_workflow_compiles_each_config_once():
+    assert compile_workflow(RULE_WORKFLOW) is compile_workflow(RULE_WORKFLOW)
+    assert compile_workflow(dict(RULE_WORKFLOW)) is not compile_workflow(RULE_WORKFLOW)
+
+
+def test_role_mask_memo_is_per_workflow():
+    first, second = CompiledWorkflow(RULE_WORKFLOW), CompiledWorkflow(RULE_WORKFLOW)
+    roles = frozenset({"FS_Manager", "UNKNOWN_ROLE"})
+
+    assert first.role_mask(roles) == first.role_bits["FS_Manager"]
+    assert first.role_mask(roles) == first.role_mask(["FS_Manager"])
+    assert first._frozen_role_mask.cache_info().hits == 1
+    assert first._frozen_role_mask.cache_info().misses == 1
+    assert second._frozen_role_mask.cache_info().currsize == 0
+
+
+def test_compiled_workflow_is_freed_with_its_memo():
+    workflow = CompiledWorkflow(RULE_WORKFLOW)
+    workflow.role_mask(frozenset({"FS_Manager"}))
+    ref = weakref.ref(workflow)
+
+    del workflow
+    gc.collect()
+    assert ref() is None
+
+
+@pytest.mark.parametrize("status", list(RULE_WORKFLOW))
+def test_transitions_follow_the_config(status):
+    workflow = compile_workflow(RULE_WORKFLOW)
+    configured = RULE_WORKFLOW[status]["Next"]
+
+    assert workflow.allowed_transitions(status) == tuple(configured)
+    assert workflow.allowed_transitions(status, is_requester=True) == tuple(
+        name for name in configured if "FS_Analyst" in RULE_WORKFLOW[name]["Roles"]
+    )
+    assert all(workflow.is_valid_next(status, name) for name in configured)
+    assert not workflow.is_valid_next(status, status)
+
+
+def test_requesters_act_through_the_roles_of_a_next_status():
+    workflow = compile_workflow(RULE_WORKFLOW)
+    analyst = workflow.role_mask(frozenset({"FS_Analyst"}))
+
+    assert workflow.allowed_transitions("PENDING APPROVAL", is_requester=True) == ("USER REJECTED",)
+    assert not workflow.can_act("PENDING APPROVAL", analyst)
+    assert workflow.can_act("PENDING APPROVAL", analyst, is_requester=True)
+    assert workflow.can_act("PENDING APPROVAL", workflow.role_mask(frozenset({"FS_Manager"})))
+    assert workflow.allowed_transitions("UNKNOWN") == ()